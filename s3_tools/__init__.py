@@ -1,59 +1,190 @@
-"""AWS S3 Tools."""
-from s3_tools.buckets.check import (
-    bucket_exists,
-)
-from s3_tools.buckets.create import (
-    create_bucket,
-)
-from s3_tools.buckets.delete import (
-    delete_bucket,
-)
-from s3_tools.buckets.list import (
-    list_buckets,
-)
-from s3_tools.objects.check import (
-    object_exists,
-    object_metadata,
-)
-from s3_tools.objects.copy import (
-    copy_keys,
-    copy_object,
-    copy_prefix,
-)
-from s3_tools.objects.delete import (
-    delete_keys,
-    delete_object,
-    delete_prefix,
-)
-from s3_tools.objects.download import (
-    download_key_to_file,
-    download_keys_to_files,
-    download_prefix_to_folder,
-)
-from s3_tools.objects.list import (
-    list_objects,
-)
-from s3_tools.objects.move import (
-    move_keys,
-    move_object,
-)
-from s3_tools.objects.presigned_url import (
-    get_presigned_download_url,
-    get_presigned_upload_url,
-    get_presigned_url,
-)
-from s3_tools.objects.read import (
-    read_object_to_bytes,
-    read_object_to_dict,
-    read_object_to_text,
-)
-from s3_tools.objects.upload import (
-    upload_file_to_key,
-    upload_files_to_keys,
-    upload_folder_to_prefix,
-)
-from s3_tools.objects.write import (
-    write_object_from_bytes,
-    write_object_from_dict,
-    write_object_from_text,
-)
+"""AWS S3 Tools.
+
+Public functions are imported lazily on first access (PEP 562),
+so importing the package does not load boto3 until an S3 function is used.
+"""
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from s3_tools.buckets.check import (
+        bucket_exists,
+    )
+    from s3_tools.buckets.create import (
+        create_bucket,
+    )
+    from s3_tools.buckets.delete import (
+        delete_bucket,
+    )
+    from s3_tools.buckets.list import (
+        list_buckets,
+    )
+    from s3_tools.client import (
+        S3Context,
+        clear_client_cache,
+        get_client,
+    )
+    from s3_tools.objects.cache import (
+        ListingCache,
+    )
+    from s3_tools.objects.check import (
+        object_exists,
+        object_metadata,
+    )
+    from s3_tools.objects.concat import (
+        compact_prefix,
+        concat_objects,
+    )
+    from s3_tools.objects.copy import (
+        copy_keys,
+        copy_object,
+        copy_prefix,
+        iter_copy_prefix,
+    )
+    from s3_tools.objects.delete import (
+        delete_keys,
+        delete_object,
+        delete_prefix,
+        purge_prefix,
+    )
+    from s3_tools.objects.diff import (
+        diff_prefixes,
+    )
+    from s3_tools.objects.download import (
+        download_key_to_file,
+        download_keys_to_files,
+        download_prefix_to_folder,
+    )
+    from s3_tools.objects.fanout import (
+        fanout_copy_keys,
+    )
+    from s3_tools.objects.list import (
+        ObjectListing,
+        iter_objects,
+        iter_objects_resumable,
+        list_objects,
+        list_objects_columnar,
+        list_objects_parallel,
+    )
+    from s3_tools.objects.move import (
+        move_keys,
+        move_object,
+        move_prefix,
+    )
+    from s3_tools.objects.presigned_url import (
+        get_presigned_download_url,
+        get_presigned_upload_url,
+        get_presigned_url,
+    )
+    from s3_tools.objects.read import (
+        read_object_to_bytes,
+        read_object_to_dict,
+        read_object_to_text,
+    )
+    from s3_tools.objects.stream_copy import (
+        stream_copy_keys,
+        stream_copy_object,
+        stream_copy_prefix,
+    )
+    from s3_tools.objects.sync import (
+        sync_prefix,
+        sync_prefix_to_folder,
+    )
+    from s3_tools.objects.upload import (
+        upload_file_to_key,
+        upload_files_to_keys,
+        upload_folder_to_prefix,
+    )
+    from s3_tools.objects.write import (
+        write_object_from_bytes,
+        write_object_from_dict,
+        write_object_from_text,
+    )
+    from s3_tools.progress import (
+        TransferProgress,
+        format_progress,
+    )
+    from s3_tools.transfer import (
+        TransferScheduler,
+        auto_transfer_config,
+        set_default_transfer_config,
+        set_default_transfer_scheduler,
+    )
+
+_LAZY_IMPORTS = {
+    "bucket_exists": "s3_tools.buckets.check",
+    "create_bucket": "s3_tools.buckets.create",
+    "delete_bucket": "s3_tools.buckets.delete",
+    "list_buckets": "s3_tools.buckets.list",
+    "S3Context": "s3_tools.client",
+    "clear_client_cache": "s3_tools.client",
+    "get_client": "s3_tools.client",
+    "ListingCache": "s3_tools.objects.cache",
+    "object_exists": "s3_tools.objects.check",
+    "object_metadata": "s3_tools.objects.check",
+    "compact_prefix": "s3_tools.objects.concat",
+    "concat_objects": "s3_tools.objects.concat",
+    "copy_keys": "s3_tools.objects.copy",
+    "copy_object": "s3_tools.objects.copy",
+    "copy_prefix": "s3_tools.objects.copy",
+    "iter_copy_prefix": "s3_tools.objects.copy",
+    "delete_keys": "s3_tools.objects.delete",
+    "delete_object": "s3_tools.objects.delete",
+    "delete_prefix": "s3_tools.objects.delete",
+    "purge_prefix": "s3_tools.objects.delete",
+    "diff_prefixes": "s3_tools.objects.diff",
+    "download_key_to_file": "s3_tools.objects.download",
+    "download_keys_to_files": "s3_tools.objects.download",
+    "download_prefix_to_folder": "s3_tools.objects.download",
+    "fanout_copy_keys": "s3_tools.objects.fanout",
+    "ObjectListing": "s3_tools.objects.list",
+    "iter_objects": "s3_tools.objects.list",
+    "iter_objects_resumable": "s3_tools.objects.list",
+    "list_objects": "s3_tools.objects.list",
+    "list_objects_columnar": "s3_tools.objects.list",
+    "list_objects_parallel": "s3_tools.objects.list",
+    "move_keys": "s3_tools.objects.move",
+    "move_object": "s3_tools.objects.move",
+    "move_prefix": "s3_tools.objects.move",
+    "get_presigned_download_url": "s3_tools.objects.presigned_url",
+    "get_presigned_upload_url": "s3_tools.objects.presigned_url",
+    "get_presigned_url": "s3_tools.objects.presigned_url",
+    "read_object_to_bytes": "s3_tools.objects.read",
+    "read_object_to_dict": "s3_tools.objects.read",
+    "read_object_to_text": "s3_tools.objects.read",
+    "stream_copy_keys": "s3_tools.objects.stream_copy",
+    "stream_copy_object": "s3_tools.objects.stream_copy",
+    "stream_copy_prefix": "s3_tools.objects.stream_copy",
+    "sync_prefix": "s3_tools.objects.sync",
+    "sync_prefix_to_folder": "s3_tools.objects.sync",
+    "upload_file_to_key": "s3_tools.objects.upload",
+    "upload_files_to_keys": "s3_tools.objects.upload",
+    "upload_folder_to_prefix": "s3_tools.objects.upload",
+    "write_object_from_bytes": "s3_tools.objects.write",
+    "write_object_from_dict": "s3_tools.objects.write",
+    "write_object_from_text": "s3_tools.objects.write",
+    "TransferProgress": "s3_tools.progress",
+    "format_progress": "s3_tools.progress",
+    "TransferScheduler": "s3_tools.transfer",
+    "auto_transfer_config": "s3_tools.transfer",
+    "set_default_transfer_config": "s3_tools.transfer",
+    "set_default_transfer_scheduler": "s3_tools.transfer",
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    """Import public functions on first access."""
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+    globals()[name] = value  # Next accesses skip __getattr__
+
+    return value
+
+
+def __dir__() -> List[str]:
+    """List the module attributes, including the lazy ones."""
+    return sorted(set(globals()) | set(__all__))
@@ -1,11 +1,10 @@
 """Check S3 bucket."""
-from typing import Dict
-
-import boto3
 from botocore.exceptions import ClientError
 
+from s3_tools.client import AwsAuth, get_client
+
 
-def bucket_exists(bucket: str, aws_auth: Dict[str, str] = {}) -> bool:
+def bucket_exists(bucket: str, aws_auth: AwsAuth = {}) -> bool:
     """Check if a bucket exists.
 
     Parameters
@@ -13,8 +12,8 @@ def bucket_exists(bucket: str, aws_auth: Dict[str, str] = {}) -> bool:
     bucket : str
         Bucket name to be checked.
 
-    aws_auth: Dict[str, str]
-        Contains AWS credentials, by default is empty.
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context, by default is empty.
 
     Returns
     -------
@@ -31,8 +30,7 @@ def bucket_exists(bucket: str, aws_auth: Dict[str, str] = {}) -> bool:
     >>> bucket_exists("myBucket")
     True
     """
-    session = boto3.session.Session(**aws_auth)
-    s3 = session.client("s3")
+    s3 = get_client(aws_auth)
 
     try:
         s3.head_bucket(Bucket=bucket)
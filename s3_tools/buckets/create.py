@@ -1,10 +1,10 @@
 """Create S3 Bucket."""
 from typing import Dict
 
-import boto3
+from s3_tools.client import AwsAuth, get_client
 
 
-def create_bucket(name: str, configs: Dict[str, str] = {}, aws_auth: Dict[str, str] = {}) -> bool:
+def create_bucket(name: str, configs: Dict[str, str] = {}, aws_auth: AwsAuth = {}) -> bool:
     """Create an S3 bucket.
 
     Parameters
@@ -16,8 +16,8 @@ def create_bucket(name: str, configs: Dict[str, str] = {}, aws_auth: Dict[str, s
         Bucket configurations, by default is empty.
         To know more about it check boto3 documentation.
 
-    aws_auth : Dict[str, str]
-        Contains AWS credentials, by default is empty.
+    aws_auth : AwsAuth
+        Contains AWS credentials or an S3Context, by default is empty.
 
     Returns
     -------
@@ -30,8 +30,7 @@ def create_bucket(name: str, configs: Dict[str, str] = {}, aws_auth: Dict[str, s
     True
 
     """
-    session = boto3.session.Session(**aws_auth)
-    s3 = session.client("s3")
+    s3 = get_client(aws_auth)
 
     response = s3.create_bucket(Bucket=name, **configs)
 
@@ -1,11 +1,130 @@
 """Delete S3 bucket."""
-from typing import Dict
+import time
+from concurrent import futures
+from typing import (
+    Iterator,
+    Optional,
+    Tuple,
+)
 
-import boto3
 from botocore.exceptions import ClientError
 
+from s3_tools.client import AwsAuth, _get_threads, get_client
+from s3_tools.objects.delete import _delete_objects_batched
+from s3_tools.objects.list import _iter_versions
+from s3_tools.utils import _create_progress_bar, _submit_bounded
 
-def delete_bucket(name: str, aws_auth: Dict[str, str] = {}) -> bool:
+
+def _iter_multipart_uploads(name: str, aws_auth: AwsAuth) -> Iterator[Tuple[str, str]]:
+    """Iterate over the in-progress multipart uploads of a bucket.
+
+    Parameters
+    ----------
+    name : str
+        Name of the bucket.
+
+    aws_auth : AwsAuth
+        Contains AWS credentials or an S3Context.
+
+    Yields
+    ------
+    Tuple[str, str]
+        Key and UploadId of each multipart upload.
+    """
+    s3 = get_client(aws_auth)
+    list_kwargs = {"Bucket": name}
+
+    while True:
+        response = s3.list_multipart_uploads(**list_kwargs)
+
+        for upload in response.get("Uploads", []):
+            yield upload["Key"], upload["UploadId"]
+
+        if not response.get("IsTruncated"):
+            break
+
+        list_kwargs["KeyMarker"] = response["NextKeyMarker"]
+        list_kwargs["UploadIdMarker"] = response["NextUploadIdMarker"]
+
+
+def _abort_multipart_upload(name: str, key: str, upload_id: str, aws_auth: AwsAuth) -> None:
+    """Abort a multipart upload, removing its uploaded parts."""
+    s3 = get_client(aws_auth)
+    s3.abort_multipart_upload(Bucket=name, Key=key, UploadId=upload_id)
+
+
+def _empty_bucket(name: str, threads: Optional[int], show_progress: bool, aws_auth: AwsAuth) -> None:
+    """Remove all objects, versions, delete markers and in-progress multipart uploads of a bucket.
+
+    Parameters
+    ----------
+    name : str
+        Name of the bucket.
+
+    threads : Optional[int]
+        Number of parallel requests.
+
+    show_progress : bool
+        Show progress bar with the number of deleted objects and the deletion rate on console.
+
+    aws_auth : AwsAuth
+        Contains AWS credentials or an S3Context.
+
+    Raises
+    ------
+    ClientError
+        When objects could not be deleted, with the code of the first error
+        and all of them on the response "Errors" (Key, VersionId, Code and Message).
+    """
+    threads = _get_threads(threads, aws_auth)
+    get_client(aws_auth, max_pool_connections=threads)  # Pool large enough for all workers
+
+    with futures.ThreadPoolExecutor(max_workers=threads) as executor:
+        calls = ((key, (name, key, upload_id, aws_auth)) for key, upload_id in _iter_multipart_uploads(name, aws_auth))
+        for future, _ in _submit_bounded(executor, _abort_multipart_upload, calls, 2 * threads):
+            future.result()
+
+    if show_progress:
+        progress, task_id = _create_progress_bar(f"Emptying {name}", None)
+        progress.start()
+        progress.start_task(task_id)
+    else:
+        progress, task_id = None, -1
+
+    start, deleted = time.monotonic(), 0
+
+    def on_batch(count: int) -> None:
+        nonlocal deleted
+        deleted += count
+        if progress:
+            rate = deleted / max(time.monotonic() - start, 1e-6)
+            progress.update(
+                task_id, advance=count, total=deleted, description=f"Emptying {name} ({rate:,.0f} objects/s)"
+            )
+
+    # Unversioned buckets list their objects as versions with VersionId "null"
+    objects = (
+        {"Key": version["Key"], "VersionId": version["VersionId"]} for version in _iter_versions(name, "", aws_auth)
+    )
+    try:
+        errors = _delete_objects_batched(name, objects, threads, aws_auth, on_batch)
+    finally:
+        if progress:
+            progress.stop()
+
+    if errors:
+        first = errors[0]
+        message = f"{len(errors)} objects not deleted, first {first['Key']}: {first['Message']}"
+        raise ClientError({"Error": {"Code": first["Code"], "Message": message}, "Errors": errors}, "DeleteObjects")
+
+
+def delete_bucket(
+    name: str,
+    aws_auth: AwsAuth = {},
+    force: bool = False,
+    threads: Optional[int] = None,
+    show_progress: bool = False,
+) -> bool:
     """Delete an S3 bucket.
 
     Parameters
@@ -13,8 +132,20 @@ def delete_bucket(name: str, aws_auth: Dict[str, str] = {}) -> bool:
     name : str
         Name of the bucket to delete.
 
-    aws_auth : Dict[str, str], optional
-        Contains AWS credentials, by default {}
+    aws_auth : AwsAuth, optional
+        Contains AWS credentials or an S3Context, by default {}
+
+    force : bool, optional
+        If True, empties the bucket before deleting it, by default False.
+        All objects, versions, delete markers and in-progress multipart uploads are removed,
+        using parallel DeleteObjects batches of up to 1000 objects.
+
+    threads : Optional[int], optional
+        Number of parallel requests when force is True, by default 5 or the S3Context threads.
+
+    show_progress : bool, optional
+        Show progress bar with the number of deleted objects and the deletion rate when force is True,
+        by default False. (Need to install extra [progress] to be used)
 
     Returns
     -------
@@ -25,17 +156,23 @@ def delete_bucket(name: str, aws_auth: Dict[str, str] = {}) -> bool:
     ------
     Exception
         Any problem with the request is raised.
+        When force is True and objects could not be deleted, a ClientError is raised before deleting the bucket,
+        with all the objects not deleted on its response "Errors".
 
     Examples
     --------
     >>> delete_bucket("myBucket")
     True
 
+    >>> delete_bucket("myNonEmptyBucket", force=True, threads=20, show_progress=True)
+    True
+
     """
-    session = boto3.session.Session(**aws_auth)
-    s3 = session.client("s3")
+    s3 = get_client(aws_auth)
 
     try:
+        if force:
+            _empty_bucket(name, threads, show_progress, aws_auth)
         response = s3.delete_bucket(Bucket=name)
     except Exception as error:
         if isinstance(error, ClientError) and (error.response["Error"]["Code"] == "NoSuchBucket"):
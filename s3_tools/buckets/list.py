@@ -1,11 +1,11 @@
 """List S3 Buckets."""
 import fnmatch
-from typing import Dict, List, Optional
+from typing import List, Optional
 
-import boto3
+from s3_tools.client import AwsAuth, get_client
 
 
-def list_buckets(search_str: Optional[str] = None, aws_auth: Dict[str, str] = {}) -> List[str]:
+def list_buckets(search_str: Optional[str] = None, aws_auth: AwsAuth = {}) -> List[str]:
     """Retrieve the list of buckets from AWS S3 filtered by search string.
 
     Parameters
@@ -14,8 +14,8 @@ def list_buckets(search_str: Optional[str] = None, aws_auth: Dict[str, str] = {}
         Basic search string to filter out buckets on result (uses Unix shell-style wildcards), by default is None.
         For more about the search check "fnmatch" package.
 
-    aws_auth: Dict[str, str]
-        Contains AWS credentials, by default is empty.
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context, by default is empty.
 
     Returns
     -------
@@ -31,8 +31,7 @@ def list_buckets(search_str: Optional[str] = None, aws_auth: Dict[str, str] = {}
     [ "myRawData" ]
 
     """
-    session = boto3.session.Session(**aws_auth)
-    s3 = session.client("s3")
+    s3 = get_client(aws_auth)
 
     response = s3.list_buckets()
 
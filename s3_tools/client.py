@@ -0,0 +1,287 @@
+"""Shared S3 clients."""
+import threading
+from collections import OrderedDict
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Hashable,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+
+if TYPE_CHECKING:
+    from s3_tools.transfer import TransferScheduler
+
+CLIENT_CACHE_SIZE = 32
+DEFAULT_THREADS = 5
+
+_clients: "OrderedDict[Tuple[Hashable, ...], Tuple[Any, Any]]" = OrderedDict()
+_clients_lock = threading.Lock()
+
+
+class S3Context:
+    """Reusable S3 connection settings.
+
+    An S3Context owns a boto3 session and an S3 client configured with a tuned
+    connection pool, retries and TCP keep-alive. It can be passed to any function
+    of this package on the ``aws_auth`` parameter, keeping connections warm between calls.
+    When a function runs with more threads than the pool size,
+    the client is recreated with a pool large enough for the requested concurrency.
+
+    Parameters
+    ----------
+    aws_auth: Dict[str, str]
+        Contains AWS credentials, by default is empty.
+
+    endpoint_url: Optional[str]
+        Endpoint URL for the client, by default None (AWS S3 endpoint).
+
+    max_pool_connections: int
+        Minimum size of the HTTP connection pool, by default 10.
+
+    retries: Optional[Dict[str, Any]]
+        Botocore retries configuration, by default None (botocore default).
+        e.g. {"max_attempts": 10, "mode": "adaptive"}
+
+    tcp_keepalive: bool
+        Enable TCP keep-alive on the connections, by default True.
+
+    threads: int
+        Default number of threads used by bulk functions, by default 5.
+
+    transfer_config: Optional[Union[str, TransferConfig]]
+        Transfer settings of the managed uploads, downloads and copies, by default None.
+        A profile name ("auto", "default", "small" or "large") or a boto3 TransferConfig,
+        see set_default_transfer_config.
+
+    scheduler: Optional[TransferScheduler]
+        Limit of in-flight requests and bytes shared by the bulk transfers using the context, by default None
+        (see set_default_transfer_scheduler).
+
+    Examples
+    --------
+    >>> context = S3Context(aws_auth={"profile_name": "prod"}, threads=20)
+    >>> download_prefix_to_folder("myBucket", "myData", "myFiles", aws_auth=context)
+
+    """
+
+    def __init__(
+        self,
+        aws_auth: Dict[str, str] = {},
+        endpoint_url: Optional[str] = None,
+        max_pool_connections: int = 10,
+        retries: Optional[Dict[str, Any]] = None,
+        tcp_keepalive: bool = True,
+        threads: int = DEFAULT_THREADS,
+        transfer_config: Optional[Union[str, TransferConfig]] = None,
+        scheduler: Optional["TransferScheduler"] = None,
+    ):
+        self.aws_auth = aws_auth
+        self.endpoint_url = endpoint_url
+        self.max_pool_connections = max_pool_connections
+        self.retries = retries
+        self.tcp_keepalive = tcp_keepalive
+        self.threads = threads
+        self.transfer_config = transfer_config
+        self.scheduler = scheduler
+
+        self.session = boto3.session.Session(**aws_auth)
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def config(self) -> Config:
+        """Botocore configuration used by the context client."""
+        options: Dict[str, Any] = {
+            "max_pool_connections": self.max_pool_connections,
+            "tcp_keepalive": self.tcp_keepalive,
+        }
+        if self.retries is not None:
+            options["retries"] = self.retries
+
+        return Config(**options)
+
+    @property
+    def client(self):
+        """S3 client owned by the context."""
+        return self.get_client()
+
+    def get_client(self, max_pool_connections: Optional[int] = None):
+        """Get the context client with at least the given connection pool size.
+
+        Parameters
+        ----------
+        max_pool_connections: Optional[int]
+            Minimum pool size required by the caller, by default None.
+
+        Returns
+        -------
+        S3.Client
+            A boto3 S3 client.
+        """
+        with self._lock:
+            if max_pool_connections is not None and max_pool_connections > self.max_pool_connections:
+                self.max_pool_connections = max_pool_connections
+                self._client = None
+
+            if self._client is None:
+                self._client = self.session.client("s3", endpoint_url=self.endpoint_url, config=self.config)
+
+            return self._client
+
+
+AwsAuth = Union[Dict[str, str], S3Context]
+
+
+def _client_cache_key(
+    aws_auth: Dict[str, str],
+    endpoint_url: Optional[str],
+    config: Optional[Config],
+) -> Tuple[Hashable, ...]:
+    """Build the registry key for a client.
+
+    Parameters
+    ----------
+    aws_auth: Dict[str, str]
+        Contains AWS credentials.
+
+    endpoint_url: Optional[str]
+        Endpoint URL used by the client.
+
+    config: Optional[Config]
+        Botocore configuration used by the client.
+
+    Returns
+    -------
+    Tuple[Hashable, ...]
+        Hashable key identifying the client configuration.
+    """
+    auth = tuple(sorted((str(k), repr(v)) for k, v in aws_auth.items()))
+    options = () if config is None else tuple(
+        sorted((str(k), repr(v)) for k, v in config._user_provided_options.items())
+    )
+    return (auth, endpoint_url, options)
+
+
+def get_client(
+    aws_auth: AwsAuth = {},
+    endpoint_url: Optional[str] = None,
+    config: Optional[Config] = None,
+    max_pool_connections: Optional[int] = None,
+):
+    """Get a shared S3 client for the given credentials and configuration.
+
+    Clients are kept in a process-wide registry, so the session creation,
+    the botocore model loading and the HTTP connection pool are reused between calls.
+    The registry is thread-safe and keeps at most CLIENT_CACHE_SIZE clients,
+    discarding the least recently used one when full.
+
+    Parameters
+    ----------
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context, by default is empty.
+        When it is an S3Context the context client is returned.
+
+    endpoint_url: Optional[str]
+        Endpoint URL for the client, by default None (AWS S3 endpoint).
+
+    config: Optional[Config]
+        Botocore configuration for the client, by default None.
+
+    max_pool_connections: Optional[int]
+        Minimum connection pool size, by default None.
+        If the cached client has a smaller pool it is replaced by a larger one.
+
+    Returns
+    -------
+    S3.Client
+        A boto3 S3 client.
+
+    Examples
+    --------
+    >>> s3 = get_client({"region_name": "eu-west-1"})
+    >>> s3.list_buckets()
+
+    """
+    if isinstance(aws_auth, S3Context):
+        return aws_auth.get_client(max_pool_connections)
+
+    key = _client_cache_key(aws_auth, endpoint_url, config)
+
+    with _clients_lock:
+        if key in _clients:
+            _clients.move_to_end(key)
+            session, client = _clients[key]
+            if max_pool_connections is None or max_pool_connections <= client.meta.config.max_pool_connections:
+                return client
+        else:
+            session = boto3.session.Session(**aws_auth)
+
+        client_config = config
+        if max_pool_connections is not None and max_pool_connections > Config().max_pool_connections:
+            pool = Config(max_pool_connections=max_pool_connections)
+            client_config = pool if config is None else config.merge(pool)
+
+        client = session.client("s3", endpoint_url=endpoint_url, config=client_config)
+
+        _clients[key] = (session, client)
+        while len(_clients) > CLIENT_CACHE_SIZE:
+            _clients.popitem(last=False)
+
+    return client
+
+
+def clear_client_cache(aws_auth: Optional[Dict[str, str]] = None) -> None:
+    """Remove clients from the shared registry.
+
+    Use it when credentials are rotated or the clients must be recreated.
+
+    Parameters
+    ----------
+    aws_auth: Optional[Dict[str, str]]
+        If given, only clients created with these credentials are removed,
+        by default None (all clients are removed).
+
+    Examples
+    --------
+    >>> clear_client_cache()
+
+    >>> clear_client_cache({"profile_name": "old-profile"})
+
+    """
+    with _clients_lock:
+        if aws_auth is None:
+            _clients.clear()
+            return
+
+        auth = _client_cache_key(aws_auth, None, None)[0]
+        for key in [k for k in _clients if k[0] == auth]:
+            del _clients[key]
+
+
+def _get_threads(threads: Optional[int], aws_auth: AwsAuth) -> int:
+    """Resolve the number of threads for a bulk operation.
+
+    Parameters
+    ----------
+    threads: Optional[int]
+        Number of threads requested by the caller.
+
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context.
+
+    Returns
+    -------
+    int
+        The requested threads, else the S3Context threads, else DEFAULT_THREADS.
+    """
+    if threads is not None:
+        return threads
+
+    return aws_auth.threads if isinstance(aws_auth, S3Context) else DEFAULT_THREADS
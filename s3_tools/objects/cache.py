@@ -0,0 +1,392 @@
+"""Local cache for S3 listings."""
+import os
+import secrets
+import sqlite3
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from s3_tools.client import AwsAuth
+from s3_tools.objects.list import _iter_contents
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS listings (
+    bucket TEXT NOT NULL,
+    prefix TEXT NOT NULL,
+    generation INTEGER NOT NULL,
+    listed_at REAL NOT NULL,
+    PRIMARY KEY (bucket, prefix)
+);
+CREATE TABLE IF NOT EXISTS objects (
+    bucket TEXT NOT NULL,
+    prefix TEXT NOT NULL,
+    generation INTEGER NOT NULL,
+    key TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    etag TEXT NOT NULL,
+    last_modified REAL NOT NULL,
+    PRIMARY KEY (bucket, prefix, generation, key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS stats (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+def _default_cache_path() -> Path:
+    """Get the default cache file, under XDG_CACHE_HOME or ~/.cache."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home().joinpath(".cache")
+    return Path(cache_home).joinpath("s3_tools", "listings.sqlite")
+
+
+class ListingCache:
+    """On-disk cache of S3 listings, stored in a SQLite database.
+
+    The objects (key, size, ETag and last modified) are stored per bucket and prefix.
+    A listing younger than the TTL is served locally. When it expires, the prefix is listed again,
+    or, for append-only prefixes, only the keys after the last known key are listed (StartAfter).
+
+    Each listing is written page by page under a new generation and switched atomically
+    when complete, so it is safe to share the cache between threads and processes.
+
+    Parameters
+    ----------
+    path: Optional[Union[str, Path]]
+        SQLite file of the cache, by default "$XDG_CACHE_HOME/s3_tools/listings.sqlite".
+
+    ttl: float
+        Time in seconds a listing is served from the cache, by default 1 hour.
+
+    append_only: bool
+        If True, expired listings are refreshed incrementally, listing only keys after the last known key.
+        Only use it for prefixes where objects are added with increasing keys and never deleted.
+        By default False.
+
+    timeout: float
+        Seconds to wait for a lock held by another process, by default 60.
+
+    Attributes
+    ----------
+    hits: int
+        Listings served from the cache by this instance.
+
+    misses: int
+        Listings fully retrieved from S3 by this instance.
+
+    refreshes: int
+        Listings incrementally refreshed by this instance.
+
+    Examples
+    --------
+    >>> cache = ListingCache(ttl=600)
+    >>> list_objects("myBucket", "myData", cache=cache)
+    ["myData/myFile.data"]
+    >>> list_objects("myBucket", "myData", cache=cache)  # Served locally
+    ["myData/myFile.data"]
+    >>> cache.hits, cache.misses
+    (1, 1)
+
+    """
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        ttl: float = 3600,
+        append_only: bool = False,
+        timeout: float = 60,
+    ):
+        self.path = Path(path) if path is not None else _default_cache_path()
+        self.ttl = ttl
+        self.append_only = append_only
+        self.timeout = timeout
+
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.executescript(_SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection to the cache database."""
+        conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def contents(
+        self,
+        bucket: str,
+        prefix: str,
+        max_keys: int = 1000,
+        aws_auth: AwsAuth = {},
+    ) -> Iterator[Dict[str, Any]]:
+        """Iterate over the objects of a prefix, listing S3 only when the cached listing expired.
+
+        Parameters
+        ----------
+        bucket: str
+            AWS S3 bucket where the objects are stored.
+
+        prefix: str
+            Exact S3 prefix where the objects are under.
+
+        max_keys: int
+            Max number of keys to have pagination when listing S3.
+
+        aws_auth: AwsAuth
+            Contains AWS credentials or an S3Context, by default is empty.
+
+        Yields
+        ------
+        Dict[str, Any]
+            Object dictionaries (Key, Size, ETag, LastModified) in lexicographic order of keys.
+        """
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN")  # The objects are read from the same snapshot as their generation
+            row = self._listing(conn, bucket, prefix)
+
+            if row is not None and time.time() - row[1] < self.ttl:
+                yield from self._read_snapshot(conn, bucket, prefix, row[0], "hits")
+                return
+            conn.execute("COMMIT")
+
+            if row is not None and self.append_only:
+                self._refresh(conn, bucket, prefix, row[0], max_keys, aws_auth)
+
+                conn.execute("BEGIN")
+                row = self._listing(conn, bucket, prefix)  # Switched if another process listed it meanwhile
+                if row is not None:
+                    yield from self._read_snapshot(conn, bucket, prefix, row[0], "refreshes")
+                    return
+                conn.execute("COMMIT")
+
+            self._count(conn, "misses")
+            yield from self._list(conn, bucket, prefix, max_keys, aws_auth)
+        finally:
+            conn.close()
+
+    def _listing(self, conn: sqlite3.Connection, bucket: str, prefix: str) -> Optional[Tuple[int, float]]:
+        """Get the current generation of a listing and when it was listed, None if not cached."""
+        return conn.execute(
+            "SELECT generation, listed_at FROM listings WHERE bucket = ? AND prefix = ?", (bucket, prefix)
+        ).fetchone()
+
+    def _read_snapshot(
+        self,
+        conn: sqlite3.Connection,
+        bucket: str,
+        prefix: str,
+        generation: int,
+        counter: str,
+    ) -> Iterator[Dict[str, Any]]:
+        """Read a listing generation inside the open read transaction, then end it and count the read."""
+        try:
+            yield from self._read(conn, bucket, prefix, generation)
+        finally:
+            conn.execute("COMMIT")
+            self._count(conn, counter)
+
+    @contextmanager
+    def _transaction(self, conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+        """Run statements in a write transaction, taking the database lock upfront."""
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _count(self, conn: sqlite3.Connection, name: str) -> None:
+        """Increment a counter on the instance and on the shared stats table."""
+        setattr(self, name, getattr(self, name) + 1)
+        conn.execute(
+            "INSERT INTO stats (name, value) VALUES (?, 1) ON CONFLICT(name) DO UPDATE SET value = value + 1",
+            (name,),
+        )
+
+    def _read(self, conn: sqlite3.Connection, bucket: str, prefix: str, generation: int) -> Iterator[Dict[str, Any]]:
+        """Read the cached objects of a listing generation."""
+        cursor = conn.execute(
+            "SELECT key, size, etag, last_modified FROM objects"
+            " WHERE bucket = ? AND prefix = ? AND generation = ? ORDER BY key",
+            (bucket, prefix, generation),
+        )
+        for key, size, etag, last_modified in cursor:
+            yield {
+                "Key": key,
+                "Size": size,
+                "ETag": etag,
+                "LastModified": datetime.fromtimestamp(last_modified, tz=timezone.utc),
+            }
+
+    def _store(
+        self,
+        conn: sqlite3.Connection,
+        bucket: str,
+        prefix: str,
+        generation: int,
+        contents: List[Dict[str, Any]],
+        current: bool = False,
+    ) -> bool:
+        """Store a page of object dictionaries under a listing generation.
+
+        With current, the page is only stored if the generation is still the listing of the prefix,
+        checked in the same transaction, and False is returned otherwise.
+        """
+        with self._transaction(conn):
+            if current and (self._listing(conn, bucket, prefix) or [None])[0] != generation:
+                return False
+
+            conn.executemany(
+                "INSERT OR REPLACE INTO objects VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (bucket, prefix, generation, obj["Key"], obj["Size"], obj["ETag"], obj["LastModified"].timestamp())
+                    for obj in contents
+                ],
+            )
+
+        return True
+
+    def _list(
+        self,
+        conn: sqlite3.Connection,
+        bucket: str,
+        prefix: str,
+        max_keys: int,
+        aws_auth: AwsAuth,
+    ) -> Iterator[Dict[str, Any]]:
+        """List the prefix on S3 into a new generation, yielding objects as pages are stored.
+
+        When the listing does not complete (an error or the consumer stopping early),
+        the pages already stored under the new generation are removed.
+        """
+        generation = secrets.randbits(62)
+        listed_at = time.time()
+        page: List[Dict[str, Any]] = []
+
+        try:
+            for obj in _iter_contents(bucket, prefix, None, max_keys, aws_auth):
+                page.append(obj)
+                if len(page) >= max_keys:
+                    self._store(conn, bucket, prefix, generation, page)
+                    yield from page
+                    page = []
+
+            self._store(conn, bucket, prefix, generation, page)
+            yield from page
+        except BaseException:
+            with self._transaction(conn):
+                conn.execute(
+                    "DELETE FROM objects WHERE bucket = ? AND prefix = ? AND generation = ?",
+                    (bucket, prefix, generation),
+                )
+            raise
+
+        # Switch to the new generation and drop the previous one atomically
+        with self._transaction(conn):
+            old = conn.execute(
+                "SELECT generation FROM listings WHERE bucket = ? AND prefix = ?", (bucket, prefix)
+            ).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO listings VALUES (?, ?, ?, ?)", (bucket, prefix, generation, listed_at)
+            )
+            if old is not None:
+                conn.execute(
+                    "DELETE FROM objects WHERE bucket = ? AND prefix = ? AND generation = ?", (bucket, prefix, old[0])
+                )
+
+    def _refresh(
+        self,
+        conn: sqlite3.Connection,
+        bucket: str,
+        prefix: str,
+        generation: int,
+        max_keys: int,
+        aws_auth: AwsAuth,
+    ) -> None:
+        """Add the keys after the last cached key to a listing generation.
+
+        The refresh stops if another process switches the listing to a new generation meanwhile,
+        so no page is added to a generation already dropped.
+        """
+        listed_at = time.time()
+        last_key = conn.execute(
+            "SELECT MAX(key) FROM objects WHERE bucket = ? AND prefix = ? AND generation = ?",
+            (bucket, prefix, generation),
+        ).fetchone()[0]
+
+        page: List[Dict[str, Any]] = []
+        for obj in _iter_contents(bucket, prefix, None, max_keys, aws_auth, start_after=last_key):
+            page.append(obj)
+            if len(page) >= max_keys:
+                if not self._store(conn, bucket, prefix, generation, page, current=True):
+                    return
+                page = []
+
+        if not self._store(conn, bucket, prefix, generation, page, current=True):
+            return
+
+        with self._transaction(conn):
+            conn.execute(
+                "UPDATE listings SET listed_at = ? WHERE bucket = ? AND prefix = ? AND generation = ?",
+                (listed_at, bucket, prefix, generation),
+            )
+
+    def stats(self) -> Dict[str, int]:
+        """Get the hits, misses and refreshes counters of all processes sharing the cache.
+
+        Returns
+        -------
+        Dict[str, int]
+            Counters by name.
+        """
+        conn = self._connect()
+        try:
+            counters = dict(conn.execute("SELECT name, value FROM stats").fetchall())
+        finally:
+            conn.close()
+
+        return {name: counters.get(name, 0) for name in ("hits", "misses", "refreshes")}
+
+    def invalidate(self, bucket: Optional[str] = None, prefix: Optional[str] = None) -> None:
+        """Remove cached listings.
+
+        Parameters
+        ----------
+        bucket: Optional[str]
+            Bucket to be removed, by default None (all buckets).
+
+        prefix: Optional[str]
+            Prefix to be removed from the bucket, by default None (all prefixes).
+        """
+        where, params = "", ()
+        if bucket is not None:
+            where, params = " WHERE bucket = ?", (bucket,)
+            if prefix is not None:
+                where, params = " WHERE bucket = ? AND prefix = ?", (bucket, prefix)
+
+        conn = self._connect()
+        try:
+            with self._transaction(conn):
+                conn.execute("DELETE FROM listings" + where, params)
+                conn.execute("DELETE FROM objects" + where, params)
+        finally:
+            conn.close()
@@ -6,11 +6,12 @@ from typing import (
     Union,
 )
 
-import boto3
 from botocore.exceptions import ClientError
 
+from s3_tools.client import AwsAuth, get_client
 
-def object_exists(bucket: str, key: Union[str, Path], aws_auth: Dict[str, str] = {}) -> bool:
+
+def object_exists(bucket: str, key: Union[str, Path], aws_auth: AwsAuth = {}) -> bool:
     """Check if an object exists for a given bucket and key.
 
     Parameters
@@ -21,8 +22,8 @@ def object_exists(bucket: str, key: Union[str, Path], aws_auth: Dict[str, str] =
     key : Union[str, Path]
         Full key for the object.
 
-    aws_auth: Dict[str, str]
-        Contains AWS credentials, by default is empty.
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context, by default is empty.
 
     Returns
     -------
@@ -39,8 +40,7 @@ def object_exists(bucket: str, key: Union[str, Path], aws_auth: Dict[str, str] =
     >>> object_exists("myBucket", "myFiles/music.mp3")
     True
     """
-    session = boto3.session.Session(**aws_auth)
-    s3 = session.client("s3")
+    s3 = get_client(aws_auth)
 
     try:
         s3.head_object(Bucket=bucket, Key=Path(key).as_posix())
@@ -53,7 +53,7 @@ def object_exists(bucket: str, key: Union[str, Path], aws_auth: Dict[str, str] =
     return True
 
 
-def object_metadata(bucket: str, key: Union[str, Path], aws_auth: Dict[str, str] = {}) -> Dict[str, Any]:
+def object_metadata(bucket: str, key: Union[str, Path], aws_auth: AwsAuth = {}) -> Dict[str, Any]:
     """Get metadata from an S3 object.
 
     Parameters
@@ -64,8 +64,8 @@ def object_metadata(bucket: str, key: Union[str, Path], aws_auth: Dict[str, str]
     key : Union[str, Path]
         Full key for the object.
 
-    aws_auth: Dict[str, str]
-        Contains AWS credentials, by default is empty.
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context, by default is empty.
 
     Returns
     -------
@@ -90,8 +90,7 @@ def object_metadata(bucket: str, key: Union[str, Path], aws_auth: Dict[str, str]
         'Metadata': {}
     }
     """
-    session = boto3.session.Session(**aws_auth)
-    s3 = session.client("s3")
+    s3 = get_client(aws_auth)
 
     try:
         return s3.head_object(Bucket=bucket, Key=Path(key).as_posix())
@@ -0,0 +1,358 @@
+"""Concatenate S3 objects."""
+from concurrent import futures
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from s3_tools.client import AwsAuth, _get_threads, get_client
+from s3_tools.objects.copy import COPY_PART_SIZE, MAX_PARTS, MIN_PART_SIZE, _copy_part, _known_sizes
+from s3_tools.objects.list import list_objects_columnar
+from s3_tools.utils import _MemoryBudget
+
+COMPACT_TARGET_SIZE = 128 * 1024 ** 2
+
+Segment = Tuple[str, int, int]  # Key, first and last byte
+Part = Tuple[str, List[Segment]]  # "copy" (UploadPartCopy of one segment) or "upload" (segments read and uploaded)
+
+
+def _copy_ranges(key: str, start: int, end: int, part_size: int) -> List[Part]:
+    """Split a byte range of an object into copy parts of at least part_size bytes (or one part if smaller)."""
+    length = end - start + 1
+    count = max(1, length // part_size)
+    bounds = [start + length * i // count for i in range(count + 1)]
+    return [("copy", [(key, low, high - 1)]) for low, high in zip(bounds, bounds[1:])]
+
+
+def _plan_parts(objects: Iterable[Tuple[str, int]], part_size: int) -> List[Part]:
+    """Plan the multipart upload parts concatenating the objects in order.
+
+    Objects of at least 5 MiB are copied on the server (UploadPartCopy). Smaller objects are buffered
+    into parts of part_size bytes. When a large object follows buffered data below 5 MiB,
+    the buffer is topped up with the first bytes of the large object, so every part except the last
+    is at least 5 MiB, as S3 requires.
+
+    Parameters
+    ----------
+    objects : Iterable[Tuple[str, int]]
+        Keys and sizes in concatenation order.
+
+    part_size : int
+        Size in bytes of the buffered parts, and minimum size of the copy parts (at least 5 MiB).
+
+    Returns
+    -------
+    List[Part]
+        Parts in order, with their kind and segments.
+
+    Raises
+    ------
+    ValueError
+        When the objects need more than 10,000 parts.
+    """
+    parts: List[Part] = []
+    buffer: List[Segment] = []
+    buffered = 0
+
+    for key, size in objects:
+        if size == 0:
+            continue
+
+        offset = 0
+        top_up = max(MIN_PART_SIZE - buffered, 0)
+        if size >= MIN_PART_SIZE and buffered and size - top_up >= MIN_PART_SIZE:
+            if top_up:
+                buffer.append((key, 0, top_up - 1))
+            parts.append(("upload", buffer))
+            buffer, buffered, offset = [], 0, top_up
+
+        if size >= MIN_PART_SIZE and not buffered:
+            parts.extend(_copy_ranges(key, offset, size - 1, part_size))
+            continue
+
+        buffer.append((key, 0, size - 1))
+        buffered += size
+        if buffered >= part_size:
+            parts.append(("upload", buffer))
+            buffer, buffered = [], 0
+
+    if buffer:
+        parts.append(("upload", buffer))
+
+    if len(parts) > MAX_PARTS:
+        raise ValueError(f"The concatenation needs {len(parts)} parts (max {MAX_PARTS}), use a larger part_size")
+
+    return parts
+
+
+def _read_segments(s3, bucket: str, segments: List[Segment], readers: futures.Executor) -> bytes:
+    """Read byte ranges of objects in parallel and join them in order."""
+    return b"".join(readers.map(
+        lambda segment: s3.get_object(
+            Bucket=bucket, Key=segment[0], Range=f"bytes={segment[1]}-{segment[2]}"
+        )["Body"].read(),
+        segments,
+    ))
+
+
+def _concat_part(
+    s3,
+    bucket: str,
+    destination_bucket: str,
+    destination_key: str,
+    upload_id: str,
+    part_number: int,
+    part: Part,
+    readers: futures.Executor,
+    budget: _MemoryBudget,
+) -> Dict[str, Any]:
+    """Copy or upload a planned part of the concatenation."""
+    kind, segments = part
+    if kind == "copy":
+        key, start, end = segments[0]
+        return _copy_part(
+            s3, {"Bucket": bucket, "Key": key}, destination_bucket, destination_key,
+            upload_id, part_number, f"bytes={start}-{end}",
+        )
+
+    with budget.reserve(sum(end - start + 1 for _, start, end in segments)):
+        body = _read_segments(s3, bucket, segments, readers)
+        response = s3.upload_part(
+            Bucket=destination_bucket, Key=destination_key, UploadId=upload_id, PartNumber=part_number, Body=body
+        )
+
+    return {"PartNumber": part_number, "ETag": response["ETag"]}
+
+
+def _concat(
+    bucket: str,
+    parts: List[Part],
+    destination_bucket: str,
+    destination_key: str,
+    threads: int,
+    budget: _MemoryBudget,
+    aws_auth: AwsAuth,
+) -> None:
+    """Write the planned parts to the destination, aborting the multipart upload on failure.
+
+    Up to threads parts are written in parallel, and up to threads objects are read at the same time.
+    A single buffered part (or no data) is written with one PutObject.
+    """
+    s3 = get_client(aws_auth, max_pool_connections=2 * threads)
+
+    with futures.ThreadPoolExecutor(max_workers=threads) as readers:
+        if len(parts) <= 1 and all(kind == "upload" for kind, _ in parts):
+            body = _read_segments(s3, bucket, parts[0][1], readers) if parts else b""
+            s3.put_object(Bucket=destination_bucket, Key=destination_key, Body=body)
+            return
+
+        upload_id = s3.create_multipart_upload(Bucket=destination_bucket, Key=destination_key)["UploadId"]
+        try:
+            with futures.ThreadPoolExecutor(max_workers=min(threads, len(parts))) as executor:
+                parts_futures = [
+                    executor.submit(
+                        _concat_part, s3, bucket, destination_bucket, destination_key,
+                        upload_id, number, part, readers, budget,
+                    )
+                    for number, part in enumerate(parts, start=1)
+                ]
+                completed = [future.result() for future in parts_futures]
+
+            s3.complete_multipart_upload(
+                Bucket=destination_bucket,
+                Key=destination_key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": completed},
+            )
+        except BaseException:
+            s3.abort_multipart_upload(Bucket=destination_bucket, Key=destination_key, UploadId=upload_id)
+            raise
+
+
+def _objects_sizes(
+    bucket: str,
+    keys: Sequence[Union[str, Path]],
+    threads: int,
+    aws_auth: AwsAuth,
+) -> List[Tuple[str, int]]:
+    """Get the keys with their sizes, from an ObjectListing or with parallel HeadObject requests."""
+    s3 = get_client(aws_auth)
+    known = list(zip((Path(key).as_posix() for key in keys), _known_sizes(keys)))
+
+    def size(key: str, listed: Optional[int]) -> int:
+        return listed if listed is not None else s3.head_object(Bucket=bucket, Key=key)["ContentLength"]
+
+    with futures.ThreadPoolExecutor(max_workers=threads) as executor:
+        return list(zip((key for key, _ in known), executor.map(lambda item: size(*item), known)))
+
+
+def concat_objects(
+    bucket: str,
+    keys: Sequence[Union[str, Path]],
+    destination_key: Union[str, Path],
+    destination_bucket: Optional[str] = None,
+    threads: Optional[int] = None,
+    aws_auth: AwsAuth = {},
+    part_size: int = COPY_PART_SIZE,
+    max_memory: Optional[int] = None,
+) -> None:
+    """Concatenate S3 objects, in the given order, into a single object with a multipart upload.
+
+    Objects of at least 5 MiB are copied on the server (UploadPartCopy) without passing through the client.
+    Smaller objects are read and uploaded together in parts of part_size bytes, topped up with the first bytes
+    of the next large object when needed to reach the 5 MiB minimum part size.
+    The parts are written in parallel.
+
+    Parameters
+    ----------
+    bucket : str
+        S3 bucket where the objects are stored.
+
+    keys : Sequence[Union[str, Path]]
+        S3 keys of the objects, in concatenation order.
+        When it is an ObjectListing the listed sizes are used instead of a HeadObject request per key.
+
+    destination_key : Union[str, Path]
+        S3 key of the concatenated object.
+
+    destination_bucket : Optional[str]
+        S3 bucket of the concatenated object, by default None (same bucket).
+
+    threads : Optional[int]
+        Number of parallel parts, and of parallel reads of small objects, by default 5 or the S3Context threads.
+
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context, by default is empty.
+
+    part_size : int
+        Size in bytes of the parts, by default 64 MiB (at least 5 MiB).
+
+    max_memory : Optional[int]
+        Maximum bytes of small objects held in memory, by default None (two parts per thread).
+
+    Raises
+    ------
+    ValueError
+        When the keys list is empty, or the objects need more than 10,000 parts.
+
+    Examples
+    --------
+    >>> concat_objects(
+    ...     bucket='myBucket',
+    ...     keys=['logs/part-0001.json', 'logs/part-0002.json'],
+    ...     destination_key='logs/all.json',
+    ... )
+
+    """
+    if len(keys) == 0:
+        raise ValueError("Key list length must be greater than zero")
+
+    threads = _get_threads(threads, aws_auth)
+    part_size = max(part_size, MIN_PART_SIZE)
+
+    parts = _plan_parts(_objects_sizes(bucket, keys, threads, aws_auth), part_size)
+    budget = _MemoryBudget(2 * threads * part_size if max_memory is None else max_memory)
+    _concat(
+        bucket, parts, destination_bucket or bucket, Path(destination_key).as_posix(), threads, budget, aws_auth
+    )
+
+
+def compact_prefix(
+    bucket: str,
+    prefix: Union[str, Path],
+    destination_prefix: Union[str, Path],
+    target_size: int = COMPACT_TARGET_SIZE,
+    search_str: Optional[str] = None,
+    suffix: str = "",
+    threads: Optional[int] = None,
+    aws_auth: AwsAuth = {},
+    part_size: int = COPY_PART_SIZE,
+    max_memory: Optional[int] = None,
+) -> Dict[str, List[str]]:
+    """Compact the objects under a prefix into fewer objects of about target_size bytes, see concat_objects.
+
+    Objects are grouped in key order, a group is closed when it reaches the target size.
+    The source objects are kept, delete them after checking the result (e.g. with delete_keys).
+    When the destination prefix is under the prefix, filter the outputs out with search_str on later runs.
+
+    Parameters
+    ----------
+    bucket : str
+        S3 bucket where the objects are stored.
+
+    prefix : Union[str, Path]
+        S3 prefix where the objects are referenced.
+
+    destination_prefix : Union[str, Path]
+        S3 prefix of the compacted objects, named "part-00000" + suffix, "part-00001" + suffix, ...
+
+    target_size : int
+        Minimum size in bytes of each compacted object (except the last), by default 128 MiB.
+
+    search_str : Optional[str]
+        Basic search string to filter out keys on result (uses Unix shell-style wildcards), by default is None.
+
+    suffix : str
+        Suffix of the compacted object names (e.g. ".json"), by default empty.
+
+    threads : Optional[int]
+        Number of parallel parts, and of parallel reads of small objects, by default 5 or the S3Context threads.
+
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context, by default is empty.
+
+    part_size : int
+        Size in bytes of the parts, by default 64 MiB (at least 5 MiB).
+
+    max_memory : Optional[int]
+        Maximum bytes of small objects held in memory, by default None (two parts per thread).
+
+    Returns
+    -------
+    Dict[str, List[str]]
+        Keys of the compacted objects with the keys concatenated into each of them.
+
+    Raises
+    ------
+    ValueError
+        When a group of objects needs more than 10,000 parts.
+
+    Examples
+    --------
+    >>> compact_prefix(
+    ...     bucket='myBucket',
+    ...     prefix='events/2024-01-01',
+    ...     destination_prefix='compacted/2024-01-01',
+    ...     suffix='.json',
+    ... )
+    {"compacted/2024-01-01/part-00000.json": ["events/2024-01-01/0001.json", ...], ...}
+
+    """
+    threads = _get_threads(threads, aws_auth)
+    part_size = max(part_size, MIN_PART_SIZE)
+    budget = _MemoryBudget(2 * threads * part_size if max_memory is None else max_memory)
+    listing = list_objects_columnar(bucket, prefix, search_str, aws_auth=aws_auth)
+
+    groups: List[List[Tuple[str, int]]] = [[]]
+    grouped = 0
+    for key, size in zip(listing, listing.sizes):
+        if grouped >= target_size:
+            groups.append([])
+            grouped = 0
+        groups[-1].append((key, size))
+        grouped += size
+
+    compacted: Dict[str, List[str]] = {}
+    for number, group in enumerate(group for group in groups if group):
+        destination_key = Path(destination_prefix).joinpath(f"part-{number:05d}{suffix}").as_posix()
+        _concat(bucket, _plan_parts(group, part_size), bucket, destination_key, threads, budget, aws_auth)
+        compacted[destination_key] = [key for key, _ in group]
+
+    return compacted
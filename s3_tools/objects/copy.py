@@ -1,17 +1,37 @@
 """Copy S3 objects."""
+import itertools
 from concurrent import futures
+from contextlib import nullcontext
 from pathlib import Path
 from typing import (
+    Any,
     Dict,
+    Iterable,
+    Iterator,
     List,
     Optional,
+    Sequence,
     Tuple,
     Union,
 )
 
-import boto3
-
-from s3_tools.objects.list import list_objects
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import ClientError
+
+from s3_tools.client import AwsAuth, _get_threads, get_client
+from s3_tools.objects.list import ObjectListing, _iter_contents, _normalize_prefix
+from s3_tools.transfer import TransferProfile, TransferScheduler, _get_scheduler, _get_transfer_config
+from s3_tools.utils import _get_future_output, _prefetch, _submit_bounded
+
+PREFETCH_KEYS = 2000  # Keys listed ahead of the copies, two listing pages
+COPY_MULTIPART_THRESHOLD = 64 * 1024 ** 2
+COPY_PART_SIZE = 64 * 1024 ** 2
+MIN_PART_SIZE = 5 * 1024 ** 2  # S3 limits for multipart uploads
+MAX_PARTS = 10_000
+MAX_COPY_OBJECT_SIZE = 5 * 1024 ** 3  # S3 limit for a single CopyObject request
+OBJECT_ATTRIBUTES = (
+    "CacheControl", "ContentDisposition", "ContentEncoding", "ContentLanguage", "ContentType", "Metadata",
+)
 
 
 def copy_object(
@@ -19,7 +39,8 @@ def copy_object(
     source_key: Union[str, Path],
     destination_bucket: str,
     destination_key: Union[str, Path],
-    aws_auth: Dict[str, str] = {}
+    aws_auth: AwsAuth = {},
+    transfer_config: Optional[TransferProfile] = None,
 ) -> None:
     """Copy S3 object from source bucket and key to destination.
 
@@ -37,8 +58,13 @@ def copy_object(
     destination_key : Union[str, Path]
         S3 destination key.
 
-    aws_auth: Dict[str, str]
-        Contains AWS credentials, by default is empty.
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context, by default is empty.
+
+    transfer_config: Optional[Union[str, TransferConfig]]
+        Transfer settings, a profile name ("auto", "default", "small" or "large") or a boto3 TransferConfig,
+        by default None (the S3Context or the process default, see set_default_transfer_config).
+        The "auto" profile makes a HeadObject request to get the object size.
 
     Examples
     --------
@@ -50,23 +76,383 @@ def copy_object(
     ... )
 
     """
-    session = boto3.session.Session(**aws_auth)
-    s3 = session.resource("s3")
+    s3 = get_client(aws_auth)
+    copy_source = {'Bucket': source_bucket, 'Key': Path(source_key).as_posix()}
 
-    s3.meta.client.copy(
-        {'Bucket': source_bucket, 'Key': Path(source_key).as_posix()},
+    s3.copy(
+        copy_source,
         destination_bucket,
-        Path(destination_key).as_posix()
+        Path(destination_key).as_posix(),
+        Config=_get_transfer_config(transfer_config, aws_auth, lambda: s3.head_object(**copy_source)["ContentLength"]),
+    )
+
+
+def _copy_part(
+    s3,
+    copy_source: Dict[str, str],
+    destination_bucket: str,
+    destination_key: str,
+    upload_id: str,
+    part_number: int,
+    byte_range: str,
+    etag: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Copy a byte range of an object as a part of a multipart upload (UploadPartCopy).
+
+    When the ETag is given the part is only copied from that version of the object (CopySourceIfMatch).
+    """
+    response = s3.upload_part_copy(
+        Bucket=destination_bucket,
+        Key=destination_key,
+        UploadId=upload_id,
+        PartNumber=part_number,
+        CopySource=copy_source,
+        CopySourceRange=byte_range,
+        **({"CopySourceIfMatch": etag} if etag else {}),
+    )
+    return {"PartNumber": part_number, "ETag": response["CopyPartResult"]["ETag"]}
+
+
+def _copy_object_parts(
+    s3,
+    copy_source: Dict[str, str],
+    destination_bucket: str,
+    destination_key: str,
+    part_size: int,
+    threads: int,
+) -> None:
+    """Copy an object with parallel UploadPartCopy requests, aborting the upload on failure.
+
+    A HeadObject request gets the object attributes (e.g. ContentType, Metadata), which CopyObject keeps
+    but a multipart upload must be created with, and the size and ETag of the current version.
+    All parts are copied from that version (CopySourceIfMatch), so a concurrent overwrite fails the copy
+    instead of mixing parts of different versions.
+    The part size is raised to at least 5 MiB and to fit the object in 10,000 parts.
+    """
+    head = s3.head_object(**copy_source)
+    size, etag = head["ContentLength"], head["ETag"]
+    extra_args = {attribute: head[attribute] for attribute in OBJECT_ATTRIBUTES if head.get(attribute)}
+
+    part_size = max(part_size, MIN_PART_SIZE, -(-size // MAX_PARTS))
+    ranges = [
+        (number, f"bytes={start}-{min(start + part_size, size) - 1}")
+        for number, start in enumerate(range(0, size, part_size), start=1)
+    ]
+
+    upload_id = s3.create_multipart_upload(Bucket=destination_bucket, Key=destination_key, **extra_args)["UploadId"]
+    try:
+        with futures.ThreadPoolExecutor(max_workers=max(1, min(threads, len(ranges)))) as executor:
+            parts = list(executor.map(
+                lambda part: _copy_part(
+                    s3, copy_source, destination_bucket, destination_key, upload_id, part[0], part[1], etag
+                ),
+                ranges,
+            ))
+
+        s3.complete_multipart_upload(
+            Bucket=destination_bucket,
+            Key=destination_key,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": parts},
+        )
+    except BaseException:
+        s3.abort_multipart_upload(Bucket=destination_bucket, Key=destination_key, UploadId=upload_id)
+        raise
+
+
+def _copy_object_sized(
+    source_bucket: str,
+    source_key: Union[str, Path],
+    destination_bucket: str,
+    destination_key: Union[str, Path],
+    size: Optional[int],
+    multipart_threshold: int,
+    part_size: int,
+    threads: int,
+    aws_auth: AwsAuth,
+    scheduler: Optional[TransferScheduler] = None,
+) -> None:
+    """Copy an object choosing the request type from its known size.
+
+    The managed copy (copy_object) makes a HeadObject request only to get the object size.
+    When the size is already known (e.g. from a listing) that request is skipped:
+    objects smaller than the threshold are copied with a single CopyObject
+    and larger ones with parallel UploadPartCopy requests, after a HeadObject to keep their attributes.
+    Objects with unknown size (None) fall back to copy_object.
+
+    Parameters
+    ----------
+    source_bucket : str
+        S3 bucket where the object is stored.
+
+    source_key : Union[str, Path]
+        S3 key where the object is referenced.
+
+    destination_bucket : str
+        S3 destination bucket.
+
+    destination_key : Union[str, Path]
+        S3 destination key.
+
+    size : Optional[int]
+        Size of the object in bytes, None if unknown.
+
+    multipart_threshold : int
+        Size in bytes from which the object is copied in parts, at most 5 GiB (the CopyObject limit).
+
+    part_size : int
+        Size in bytes of each part.
+
+    threads : int
+        Number of parallel part copies of a multipart copy.
+
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context.
+
+    scheduler : Optional[TransferScheduler]
+        Scheduler granting the parallel part copies, by default None (threads part copies).
+        With a scheduler, objects of unknown size are copied with the multipart threshold and part size given.
+    """
+    multipart_threshold = min(multipart_threshold, MAX_COPY_OBJECT_SIZE)
+    config = TransferConfig(
+        multipart_threshold=multipart_threshold, multipart_chunksize=part_size, max_concurrency=threads
+    )
+
+    with scheduler.transfer(size, config, buffered=False) if scheduler else nullcontext(config) as scheduled:
+        if size is None:
+            copy_object(
+                source_bucket, source_key, destination_bucket, destination_key, aws_auth,
+                transfer_config=scheduled if scheduler else None,
+            )
+            return
+
+        s3 = get_client(aws_auth)
+        copy_source = {"Bucket": source_bucket, "Key": Path(source_key).as_posix()}
+        destination_key = Path(destination_key).as_posix()
+
+        if size < multipart_threshold:
+            s3.copy_object(CopySource=copy_source, Bucket=destination_bucket, Key=destination_key)
+        else:
+            _copy_object_parts(
+                s3, copy_source, destination_bucket, destination_key, part_size, scheduled.max_concurrency
+            )
+
+
+def _known_sizes(keys: Sequence[Union[str, Path]]) -> Iterable[Optional[int]]:
+    """Get the object sizes of an ObjectListing, or None for each key of other sequences."""
+    return keys.sizes if isinstance(keys, ObjectListing) else itertools.repeat(None)
+
+
+def _prefix_keys_pairs(
+    source_bucket: str,
+    source_prefix: Union[str, Path],
+    change_prefix: Optional[Tuple[Union[str, Path], Union[str, Path]]],
+    filter_keys: Optional[str],
+    aws_auth: AwsAuth,
+) -> Iterator[Tuple[str, str, int]]:
+    """Stream the source keys under a prefix with their destination keys and sizes.
+
+    Parameters
+    ----------
+    source_bucket : str
+        S3 bucket where the objects are stored.
+
+    source_prefix : Union[str, Path]
+        S3 prefix where the objects are referenced.
+
+    change_prefix : Optional[Tuple[Union[str, Path], Union[str, Path]]]
+        Text to be replaced in keys prefixes, the text to be replaced and the replacement text.
+
+    filter_keys : Optional[str]
+        Basic search string to filter out keys (uses Unix shell-style wildcards).
+
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context.
+
+    Yields
+    ------
+    Tuple[str, str, int]
+        Source key, destination key and size of each object, as the listing pages arrive.
+    """
+    for obj in _iter_contents(source_bucket, _normalize_prefix(source_prefix), filter_keys, 1000, aws_auth):
+        key = obj["Key"]
+        if change_prefix is None:
+            yield key, key, obj["Size"]
+        else:
+            yield key, key.replace(Path(change_prefix[0]).as_posix(), Path(change_prefix[1]).as_posix()), obj["Size"]
+
+
+def _lists_destinations(
+    source_bucket: str,
+    source_prefix: Union[str, Path],
+    destination_bucket: str,
+    change_prefix: Optional[Tuple[Union[str, Path], Union[str, Path]]],
+) -> bool:
+    """Check if the new destination keys can fall inside the listing of the source prefix.
+
+    The prefix is listed without its trailing slash, so "data" also lists "data_bak/",
+    and keys copied while the listing runs would be listed and copied again.
+    """
+    if source_bucket != destination_bucket or change_prefix is None:
+        return False
+
+    prefix = _normalize_prefix(source_prefix)
+    destination_prefix = prefix.replace(Path(change_prefix[0]).as_posix(), Path(change_prefix[1]).as_posix())
+
+    return destination_prefix.startswith(prefix)
+
+
+def _prefix_keys_listing(
+    source_bucket: str,
+    source_prefix: Union[str, Path],
+    destination_bucket: str,
+    change_prefix: Optional[Tuple[Union[str, Path], Union[str, Path]]],
+    filter_keys: Optional[str],
+    aws_auth: AwsAuth,
+) -> Iterable[Tuple[str, str, int]]:
+    """Get the keys pairs under a prefix, listed ahead of the copies on a background thread.
+
+    When the destination keys can fall inside the source listing,
+    the whole prefix is listed before the first copy starts, so no copied object is listed again.
+
+    Parameters
+    ----------
+    source_bucket : str
+        S3 bucket where the objects are stored.
+
+    source_prefix : Union[str, Path]
+        S3 prefix where the objects are referenced.
+
+    destination_bucket : str
+        S3 destination bucket.
+
+    change_prefix : Optional[Tuple[Union[str, Path], Union[str, Path]]]
+        Text to be replaced in keys prefixes, the text to be replaced and the replacement text.
+
+    filter_keys : Optional[str]
+        Basic search string to filter out keys (uses Unix shell-style wildcards).
+
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context.
+
+    Returns
+    -------
+    Iterable[Tuple[str, str, int]]
+        Source key, destination key and size of each object.
+    """
+    keys_pairs = _prefix_keys_pairs(source_bucket, source_prefix, change_prefix, filter_keys, aws_auth)
+
+    if _lists_destinations(source_bucket, source_prefix, destination_bucket, change_prefix):
+        return list(keys_pairs)
+
+    return _prefetch(keys_pairs, PREFETCH_KEYS)
+
+
+def _iter_copied(
+    source_bucket: str,
+    keys_pairs: Iterable[Tuple[Union[str, Path], Union[str, Path], Optional[int]]],
+    destination_bucket: str,
+    threads: Optional[int],
+    aws_auth: AwsAuth,
+    multipart_threshold: int = COPY_MULTIPART_THRESHOLD,
+    part_size: int = COPY_PART_SIZE,
+    failed: Optional[List[Dict[str, str]]] = None,
+) -> Iterator[Union[str, Path]]:
+    """Copy pairs of source and destination keys in parallel as they are produced.
+
+    Parameters
+    ----------
+    source_bucket : str
+        S3 bucket where the objects are stored.
+
+    keys_pairs : Iterable[Tuple[Union[str, Path], Union[str, Path], Optional[int]]]
+        Source key, destination key and object size (None if unknown), it can be a generator.
+
+    destination_bucket : str
+        S3 destination bucket.
+
+    threads : Optional[int]
+        Number of parallel copies.
+
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context.
+
+    multipart_threshold : int
+        Size in bytes from which objects of known size are copied in parts.
+
+    part_size : int
+        Size in bytes of each part.
+
+    failed : Optional[List[Dict[str, str]]]
+        If given, the failed copies are appended to it (source "Key", error "Code" and "Message")
+        and the other copies go on, by default None (the first copy error is raised).
+
+    Yields
+    ------
+    Union[str, Path]
+        Source key of each confirmed copy, in completion order.
+
+    Raises
+    ------
+    Exception
+        Without a failed list, the first copy error is raised and no more copies are started.
+    """
+    threads = _get_threads(threads, aws_auth)
+    scheduler = _get_scheduler(aws_auth, threads)
+    get_client(aws_auth, max_pool_connections=max(threads, scheduler.max_requests))  # Pool for all requests
+
+    with futures.ThreadPoolExecutor(max_workers=threads) as executor:
+        calls = (
+            (source, (
+                source_bucket, source, destination_bucket, destination, size,
+                multipart_threshold, part_size, threads, aws_auth, scheduler,
+            ))
+            for source, destination, size in keys_pairs
+        )
+
+        for future, source in _submit_bounded(executor, _copy_object_sized, calls, 2 * threads):
+            error = future.exception()
+            if error is None:
+                yield source
+            elif failed is None or not isinstance(error, Exception):
+                raise error
+            else:
+                code = error.response["Error"]["Code"] if isinstance(error, ClientError) else type(error).__name__
+                failed.append({"Key": Path(source).as_posix(), "Code": code, "Message": str(error)})
+
+
+def _copy_keys_pairs(
+    source_bucket: str,
+    keys_pairs: Iterable[Tuple[Union[str, Path], Union[str, Path], Optional[int]]],
+    destination_bucket: str,
+    threads: Optional[int],
+    aws_auth: AwsAuth,
+    multipart_threshold: int = COPY_MULTIPART_THRESHOLD,
+    part_size: int = COPY_PART_SIZE,
+) -> int:
+    """Copy pairs of source and destination keys in parallel, see _iter_copied.
+
+    Returns
+    -------
+    int
+        Number of copied objects.
+    """
+    copied = _iter_copied(
+        source_bucket, keys_pairs, destination_bucket, threads, aws_auth, multipart_threshold, part_size
     )
 
+    return sum(1 for _ in copied)
+
 
 def copy_keys(
     source_bucket: str,
-    source_keys: List[Union[str, Path]],
+    source_keys: Sequence[Union[str, Path]],
     destination_bucket: str,
-    destination_keys: List[Union[str, Path]],
-    threads: int = 5,
-    aws_auth: Dict[str, str] = {}
+    destination_keys: Sequence[Union[str, Path]],
+    threads: Optional[int] = None,
+    aws_auth: AwsAuth = {},
+    multipart_threshold: int = COPY_MULTIPART_THRESHOLD,
+    part_size: int = COPY_PART_SIZE,
 ) -> None:
     """Copy a list of S3 objects from source bucket to destination.
 
@@ -75,20 +461,28 @@ def copy_keys(
     source_bucket : str
         S3 bucket where the objects are stored.
 
-    source_keys : List[Union[str, Path]]
+    source_keys : Sequence[Union[str, Path]]
         S3 keys where the objects are referenced.
+        When it is an ObjectListing the listed sizes are used to copy without a HeadObject request per key.
 
     destination_bucket : str
         S3 destination bucket.
 
-    destination_keys : List[Union[str, Path]]
+    destination_keys : Sequence[Union[str, Path]]
         S3 destination keys.
 
-    threads : int, optional
-        Number of parallel uploads, by default 5.
+    threads : Optional[int]
+        Number of parallel uploads, by default 5 or the S3Context threads.
 
-    aws_auth: Dict[str, str]
-        Contains AWS credentials, by default is empty.
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context, by default is empty.
+
+    multipart_threshold : int
+        Size in bytes from which objects are copied in parts (UploadPartCopy), by default 64 MiB.
+        Only used when the object sizes are known.
+
+    part_size : int
+        Size in bytes of each part, by default 64 MiB (at least 5 MiB).
 
     Raises
     ------
@@ -120,14 +514,11 @@ def copy_keys(
     if len(source_keys) == 0:
         raise ValueError("Key list length must be greater than zero")
 
-    with futures.ThreadPoolExecutor(max_workers=threads) as executor:
-        executors = (
-            executor.submit(copy_object, source_bucket, source, destination_bucket, destination, aws_auth)
-            for source, destination in zip(source_keys, destination_keys)
-        )
+    keys_pairs = zip(source_keys, destination_keys, _known_sizes(source_keys))
 
-        for ex in executors:
-            ex.result()
+    _copy_keys_pairs(
+        source_bucket, keys_pairs, destination_bucket, threads, aws_auth, multipart_threshold, part_size
+    )
 
 
 def copy_prefix(
@@ -136,11 +527,16 @@ def copy_prefix(
     destination_bucket: str,
     change_prefix: Optional[Tuple[Union[str, Path], Union[str, Path]]] = None,
     filter_keys: Optional[str] = None,
-    threads: int = 5,
-    aws_auth: Dict[str, str] = {}
+    threads: Optional[int] = None,
+    aws_auth: AwsAuth = {},
+    multipart_threshold: int = COPY_MULTIPART_THRESHOLD,
+    part_size: int = COPY_PART_SIZE,
 ) -> None:
     """Copy S3 objects from source bucket to destination based on prefix filter.
 
+    The object sizes come from the listing, so each object is copied
+    without the HeadObject request made by copy_object.
+
     Parameters
     ----------
     source_bucket : str
@@ -160,11 +556,18 @@ def copy_prefix(
         Basic search string to filter out keys on result (uses Unix shell-style wildcards), by default is None.
         For more about the search check "fnmatch" package.
 
-    threads : int, optional
-        Number of parallel uploads, by default 5.
+    threads : Optional[int]
+        Number of parallel uploads, by default 5 or the S3Context threads.
 
-    aws_auth: Dict[str, str]
-        Contains AWS credentials, by default is empty.
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context, by default is empty.
+
+    multipart_threshold : int
+        Size in bytes from which objects are copied in parts (UploadPartCopy), by default 64 MiB.
+        Only used when the object sizes are known.
+
+    part_size : int
+        Size in bytes of each part, by default 64 MiB (at least 5 MiB).
 
     Examples
     --------
@@ -177,26 +580,104 @@ def copy_prefix(
     ... )
 
     """
-    source_keys = list_objects(
-        bucket=source_bucket,
-        prefix=source_prefix,
-        search_str=filter_keys,
-        aws_auth=aws_auth
+    keys_pairs = _prefix_keys_listing(
+        source_bucket, source_prefix, destination_bucket, change_prefix, filter_keys, aws_auth
     )
 
-    destination_keys = source_keys if change_prefix is None else [
-        Path(key).as_posix().replace(
-            Path(change_prefix[0]).as_posix(),
-            Path(change_prefix[1]).as_posix()
-        )
-        for key in source_keys
-    ]
+    copied = _copy_keys_pairs(
+        source_bucket, keys_pairs, destination_bucket, threads, aws_auth, multipart_threshold, part_size
+    )
+
+    if copied == 0:
+        raise ValueError("Key list length must be greater than zero")
 
-    copy_keys(
-        source_bucket=source_bucket,
-        source_keys=source_keys,
-        destination_bucket=destination_bucket,
-        destination_keys=destination_keys,
-        threads=threads,
-        aws_auth=aws_auth
+
+def iter_copy_prefix(
+    source_bucket: str,
+    source_prefix: Union[str, Path],
+    destination_bucket: str,
+    change_prefix: Optional[Tuple[Union[str, Path], Union[str, Path]]] = None,
+    filter_keys: Optional[str] = None,
+    threads: Optional[int] = None,
+    aws_auth: AwsAuth = {},
+    multipart_threshold: int = COPY_MULTIPART_THRESHOLD,
+    part_size: int = COPY_PART_SIZE,
+) -> Iterator[Tuple[str, str, Any]]:
+    """Copy S3 objects from source bucket to destination based on prefix filter, yielding each result as it finishes.
+
+    The listing runs on a background thread and feeds a bounded buffer consumed by the copy workers,
+    so copies start with the first listing page and the memory used does not grow with the number of keys.
+    When the destination keys can fall inside the source listing (same bucket, e.g. "data" to "data_bak"),
+    the whole prefix is listed before the first copy.
+    Unlike copy_prefix, a failed copy does not stop the others, it is reported on its result.
+
+    Parameters
+    ----------
+    source_bucket : str
+        S3 bucket where the objects are stored.
+
+    source_prefix : Union[str, Path]
+        S3 prefix where the objects are referenced.
+
+    destination_bucket : str
+        S3 destination bucket.
+
+    change_prefix : Tuple[Union[str, Path], Union[str, Path]], optional
+        Text to be replaced in keys prefixes, by default is None.
+        The first element is the text to be replaced, the second is the replacement text.
+
+    filter_keys : str, optional
+        Basic search string to filter out keys on result (uses Unix shell-style wildcards), by default is None.
+        For more about the search check "fnmatch" package.
+
+    threads : Optional[int]
+        Number of parallel copies, by default 5 or the S3Context threads.
+
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context, by default is empty.
+
+    multipart_threshold : int
+        Size in bytes from which objects are copied in parts (UploadPartCopy), by default 64 MiB.
+        Only used when the object sizes are known.
+
+    part_size : int
+        Size in bytes of each part, by default 64 MiB (at least 5 MiB).
+
+    Yields
+    ------
+    Tuple[str, str, Any]
+        The source key, the destination key and True if copied, else the error message.
+        In completion order.
+
+    Examples
+    --------
+    >>> for source, destination, result in iter_copy_prefix(
+    ...     source_bucket='MyBucket',
+    ...     source_prefix='myFiles',
+    ...     destination_bucket='OtherBucket',
+    ...     change_prefix=('myFiles', 'backup')
+    ... ):
+    ...     print(source, destination, result)
+    myFiles/song.mp3 backup/song.mp3 True
+
+    """
+    threads = _get_threads(threads, aws_auth)
+    scheduler = _get_scheduler(aws_auth, threads)
+    get_client(aws_auth, max_pool_connections=max(threads, scheduler.max_requests) + 1)  # Requests and the listing
+
+    keys_pairs = _prefix_keys_listing(
+        source_bucket, source_prefix, destination_bucket, change_prefix, filter_keys, aws_auth
     )
+
+    with futures.ThreadPoolExecutor(max_workers=threads) as executor:
+        calls = (
+            ((source, destination), (
+                source_bucket, source, destination_bucket, destination, size,
+                multipart_threshold, part_size, threads, aws_auth, scheduler,
+            ))
+            for source, destination, size in keys_pairs
+        )
+
+        for future, (source, destination) in _submit_bounded(executor, _copy_object_sized, calls, 2 * threads):
+            result = _get_future_output(future)
+            yield source, destination, True if result is None else result
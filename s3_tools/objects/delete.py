@@ -1,18 +1,26 @@
 """Delete objects from S3 bucket."""
+from concurrent import futures
 from pathlib import Path
 from typing import (
+    Callable,
     Dict,
+    Iterable,
     List,
     Optional,
+    Sequence,
     Union,
 )
 
-import boto3
+from botocore.exceptions import BotoCoreError, ClientError
 
-from s3_tools.objects.list import list_objects
+from s3_tools.client import AwsAuth, _get_threads, get_client
+from s3_tools.objects.list import _iter_contents, _iter_versions, _normalize_prefix, list_objects
+from s3_tools.utils import _chunked, _submit_bounded
 
+DELETE_BATCH_SIZE = 1000  # Max number of keys per DeleteObjects request
 
-def delete_object(bucket: str, key: Union[str, Path], aws_auth: Dict[str, str] = {}) -> None:
+
+def delete_object(bucket: str, key: Union[str, Path], aws_auth: AwsAuth = {}) -> None:
     """Delete a given object from S3 bucket.
 
     Parameters
@@ -23,27 +31,112 @@ def delete_object(bucket: str, key: Union[str, Path], aws_auth: Dict[str, str] =
     key: Union[str, Path]
         Key for the object that will be deleted.
 
-    aws_auth: Dict[str, str]
-        Contains AWS credentials, by default is empty.
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context, by default is empty.
 
     Examples
     --------
     >>> delete_object(bucket="myBucket", key="myData/myFile.data")
 
     """
-    session = boto3.session.Session(**aws_auth)
-    s3 = session.client("s3")
+    s3 = get_client(aws_auth)
     s3.delete_object(Bucket=bucket, Key=Path(key).as_posix())
 
 
+def _delete_batch(bucket: str, objects: List[Dict[str, str]], aws_auth: AwsAuth) -> List[Dict[str, str]]:
+    """Delete up to DELETE_BATCH_SIZE objects in a single DeleteObjects request.
+
+    Parameters
+    ----------
+    bucket: str
+        AWS S3 bucket where the objects are stored.
+
+    objects: List[Dict[str, str]]
+        Objects to be deleted, with the "Key" and optionally the "VersionId".
+
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context.
+
+    Returns
+    -------
+    List[Dict[str, str]]
+        Objects not deleted ("Key" and "VersionId" when given), with the error "Code" and "Message".
+        When the request itself fails, all objects of the batch are reported with its error.
+    """
+    s3 = get_client(aws_auth)
+    try:
+        response = s3.delete_objects(Bucket=bucket, Delete={"Objects": objects, "Quiet": True})
+    except (BotoCoreError, ClientError) as error:
+        code = error.response["Error"]["Code"] if isinstance(error, ClientError) else type(error).__name__
+        return [{**obj, "Code": code, "Message": str(error)} for obj in objects]
+
+    return [
+        {
+            **{k: error[k] for k in ("Key", "VersionId") if k in error},
+            "Code": error.get("Code", ""),
+            "Message": error.get("Message", ""),
+        }
+        for error in response.get("Errors", [])
+    ]
+
+
+def _delete_objects_batched(
+    bucket: str,
+    objects: Iterable[Dict[str, str]],
+    threads: Optional[int],
+    aws_auth: AwsAuth,
+    on_batch: Optional[Callable[[int], None]] = None,
+) -> List[Dict[str, str]]:
+    """Delete objects in DeleteObjects batches running in parallel, as the objects are produced.
+
+    Parameters
+    ----------
+    bucket: str
+        AWS S3 bucket where the objects are stored.
+
+    objects: Iterable[Dict[str, str]]
+        Objects to be deleted, with the "Key" and optionally the "VersionId", it can be a generator.
+
+    threads: Optional[int]
+        Number of parallel batches.
+
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context.
+
+    on_batch: Optional[Callable[[int], None]]
+        Called with the number of objects of each finished batch, by default None.
+
+    Returns
+    -------
+    List[Dict[str, str]]
+        Objects not deleted, with the error "Code" and "Message".
+    """
+    threads = _get_threads(threads, aws_auth)
+    get_client(aws_auth, max_pool_connections=threads)  # Pool large enough for all workers
+
+    errors: List[Dict[str, str]] = []
+    with futures.ThreadPoolExecutor(max_workers=threads) as executor:
+        calls = ((len(batch), (bucket, batch, aws_auth)) for batch in _chunked(objects, DELETE_BATCH_SIZE))
+
+        for future, count in _submit_bounded(executor, _delete_batch, calls, 2 * threads):
+            errors.extend(future.result())
+            if on_batch:
+                on_batch(count)
+
+    return errors
+
+
 def delete_prefix(
     bucket: str,
     prefix: Union[str, Path],
     dry_run: bool = True,
-    aws_auth: Dict[str, str] = {}
-) -> Optional[List[Union[str, Path]]]:
+    aws_auth: AwsAuth = {},
+    threads: Optional[int] = None,
+) -> Union[List[Union[str, Path]], List[Dict[str, str]]]:
     """Delete all objects under the given prefix from S3 bucket.
 
+    The keys are deleted in batches of up to 1000 keys (DeleteObjects) while the prefix is listed.
+
     Parameters
     ----------
     bucket: str
@@ -55,13 +148,17 @@ def delete_prefix(
     dry_run: bool
          If True will not delete the objects.
 
-    aws_auth: Dict[str, str]
-        Contains AWS credentials, by default is empty.
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context, by default is empty.
+
+    threads: Optional[int]
+        Number of parallel delete batches, by default 5 or the S3Context threads.
 
     Returns
     -------
-    List[Union[str, Path]]
-        List of S3 keys to be deleted if dry_run True, else None.
+    Union[List[Union[str, Path]], List[Dict[str, str]]]
+        List of S3 keys to be deleted if dry_run True,
+        else the keys not deleted with the error "Code" and "Message" (empty when all were deleted).
 
     Examples
     --------
@@ -72,35 +169,49 @@ def delete_prefix(
     ]
 
     >>> delete_prefix(bucket="myBucket", prefix=Path("myData"), dry_run=False)
+    []
 
     """
-    keys = list_objects(bucket, prefix, aws_auth=aws_auth)
-
     if dry_run:
-        return [key for key in keys]
+        return list_objects(bucket, prefix, aws_auth=aws_auth)
 
-    for key in keys:
-        delete_object(bucket, key, aws_auth)
+    objects = ({"Key": obj["Key"]} for obj in _iter_contents(bucket, _normalize_prefix(prefix), None, 1000, aws_auth))
 
-    return None
+    return _delete_objects_batched(bucket, objects, threads, aws_auth)
 
 
-def delete_keys(bucket: str, keys: List[Union[str, Path]], dry_run: bool = True, aws_auth: Dict[str, str] = {}) -> None:
+def delete_keys(
+    bucket: str,
+    keys: Sequence[Union[str, Path]],
+    dry_run: bool = True,
+    aws_auth: AwsAuth = {},
+    threads: Optional[int] = None,
+) -> List[Dict[str, str]]:
     """Delete all objects in the keys list from S3 bucket.
 
+    The keys are deleted in batches of up to 1000 keys (DeleteObjects) running in parallel.
+
     Parameters
     ----------
     bucket: str
         AWS S3 bucket where the objects are stored.
 
-    keys: List[Union[str, Path]]
+    keys: Sequence[Union[str, Path]]
         List of object keys.
 
     dry_run: bool
          If True will not delete the objects.
 
-    aws_auth: Dict[str, str]
-        Contains AWS credentials, by default is empty.
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context, by default is empty.
+
+    threads: Optional[int]
+        Number of parallel delete batches, by default 5 or the S3Context threads.
+
+    Returns
+    -------
+    List[Dict[str, str]]
+        Keys not deleted, with the error "Code" and "Message", empty when all keys were deleted or dry_run is True.
 
     Examples
     --------
@@ -112,10 +223,73 @@ def delete_keys(bucket: str, keys: List[Union[str, Path]], dry_run: bool = True,
     ...     ],
     ...     dry_run=False
     ... )
+    []
+
+    """
+    if dry_run:
+        return []
+
+    return _delete_objects_batched(bucket, ({"Key": Path(key).as_posix()} for key in keys), threads, aws_auth)
+
+
+def purge_prefix(
+    bucket: str,
+    prefix: Union[str, Path],
+    dry_run: bool = True,
+    aws_auth: AwsAuth = {},
+    threads: Optional[int] = None,
+) -> Union[Dict[str, int], List[Dict[str, str]]]:
+    """Delete all versions and delete markers under the given prefix from a versioned S3 bucket.
+
+    On versioned buckets delete_prefix only adds delete markers and the previous versions keep the storage.
+    This function permanently removes every version of the objects under the prefix.
+    The versions are deleted in batches of up to 1000 (DeleteObjects) while they are listed.
+
+    Parameters
+    ----------
+    bucket: str
+        AWS S3 bucket where the objects are stored.
+
+    prefix: Union[str, Path]
+        Prefix where the objects are under.
+
+    dry_run: bool
+         If True will not delete the versions, only count them.
+
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context, by default is empty.
+
+    threads: Optional[int]
+        Number of parallel delete batches, by default 5 or the S3Context threads.
+
+    Returns
+    -------
+    Union[Dict[str, int], List[Dict[str, str]]]
+        If dry_run True, the number of "versions", "delete_markers" and the "bytes" to be freed,
+        else the versions not deleted ("Key" and "VersionId") with the error "Code" and "Message".
+
+    Examples
+    --------
+    >>> purge_prefix(bucket="myBucket", prefix="myData")
+    {"versions": 120, "delete_markers": 4, "bytes": 98765432}
+
+    >>> purge_prefix(bucket="myBucket", prefix="myData", dry_run=False)
+    []
 
     """
+    versions = _iter_versions(bucket, _normalize_prefix(prefix), aws_auth)
+
     if dry_run:
-        return
+        counts = {"versions": 0, "delete_markers": 0, "bytes": 0}
+        for version in versions:
+            if version.get("IsDeleteMarker"):
+                counts["delete_markers"] += 1
+            else:
+                counts["versions"] += 1
+                counts["bytes"] += version.get("Size", 0)
+        return counts
+
+    objects = ({"Key": version["Key"], "VersionId": version["VersionId"]} for version in versions)
+
+    return _delete_objects_batched(bucket, objects, threads, aws_auth)
 
-    for key in keys:
-        delete_object(bucket, key, aws_auth)
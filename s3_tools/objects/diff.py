@@ -0,0 +1,153 @@
+"""Compare S3 prefixes."""
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from s3_tools.client import AwsAuth
+from s3_tools.objects.list import _iter_contents, _normalize_prefix
+
+
+def _relative_contents(bucket: str, prefix: str, aws_auth: AwsAuth) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Stream the objects under an exact prefix with their keys relative to it, in lexicographic order."""
+    for obj in _iter_contents(bucket, prefix, None, 1000, aws_auth):
+        yield obj["Key"][len(prefix):], obj
+
+
+def _merge_join(
+    source: Iterator[Tuple[str, Dict[str, Any]]],
+    destination: Iterator[Tuple[str, Dict[str, Any]]],
+) -> Iterator[Tuple[str, Optional[Dict[str, Any]], Optional[Dict[str, Any]]]]:
+    """Join two listings sorted by relative key, advancing both in lockstep.
+
+    S3 lists keys in UTF-8 binary order, the same order Python uses to compare strings,
+    so the join only keeps one object of each side in memory.
+
+    Parameters
+    ----------
+    source : Iterator[Tuple[str, Dict[str, Any]]]
+        Relative keys and objects of the source, sorted by key.
+
+    destination : Iterator[Tuple[str, Dict[str, Any]]]
+        Relative keys and objects of the destination, sorted by key.
+
+    Yields
+    ------
+    Tuple[str, Optional[Dict[str, Any]], Optional[Dict[str, Any]]]
+        Relative key with the source and destination objects, None on the side where it is missing.
+    """
+    src = next(source, None)
+    dst = next(destination, None)
+
+    while src is not None or dst is not None:
+        if src is not None and (dst is None or src[0] < dst[0]):
+            yield src[0], src[1], None
+            src = next(source, None)
+        elif dst is not None and (src is None or dst[0] < src[0]):
+            yield dst[0], None, dst[1]
+            dst = next(destination, None)
+        elif src is not None and dst is not None:
+            yield src[0], src[1], dst[1]
+            src, dst = next(source, None), next(destination, None)
+
+
+def _same_object(source: Dict[str, Any], destination: Dict[str, Any], compare_last_modified: bool = False) -> bool:
+    """Check if two listed objects have the same content, by size and ETag.
+
+    ETags are only compared when neither is a multipart ETag ("<md5>-<parts>"),
+    as those depend on the part size used to write the object and not only on its content.
+    With compare_last_modified, a source modified after the destination is also a difference.
+    """
+    if source["Size"] != destination["Size"]:
+        return False
+
+    if compare_last_modified and source["LastModified"] > destination["LastModified"]:
+        return False
+
+    if "-" in source["ETag"] or "-" in destination["ETag"]:
+        return True
+
+    return source["ETag"] == destination["ETag"]
+
+
+def diff_prefixes(
+    source_bucket: str,
+    source_prefix: Union[str, Path],
+    destination_bucket: str,
+    destination_prefix: Union[str, Path],
+    compare_last_modified: bool = False,
+    include_unchanged: bool = False,
+    aws_auth: AwsAuth = {},
+    destination_aws_auth: Optional[AwsAuth] = None,
+) -> Iterator[Tuple[str, str, Optional[Dict[str, Any]], Optional[Dict[str, Any]]]]:
+    """Stream the differences between the objects of two prefixes.
+
+    Both listings are read page by page in lockstep and merge-joined by the key relative to each prefix,
+    so the memory used is constant, whatever the number of objects.
+    The prefixes can be on different buckets and accounts.
+
+    Parameters
+    ----------
+    source_bucket : str
+        S3 bucket of the source objects.
+
+    source_prefix : Union[str, Path]
+        S3 prefix of the source objects.
+
+    destination_bucket : str
+        S3 bucket of the destination objects.
+
+    destination_prefix : Union[str, Path]
+        S3 prefix of the destination objects.
+
+    compare_last_modified : bool
+        If True, objects whose source was modified after the destination are also changed, by default False.
+
+    include_unchanged : bool
+        If True, the objects equal on both sides are also yielded, by default False.
+
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context, by default is empty.
+
+    destination_aws_auth: Optional[AwsAuth]
+        Credentials to list the destination, by default None (same as aws_auth).
+
+    Yields
+    ------
+    Tuple[str, str, Optional[Dict[str, Any]], Optional[Dict[str, Any]]]
+        The status, the key relative to the prefixes, and the source and destination objects
+        (Key, Size, ETag, LastModified), in lexicographic order of keys. The status is one of:
+        "added" (only on destination), "removed" (only on source),
+        "changed" (different size or ETag) or "unchanged".
+        Multipart ETags depend on the part size, when one of the sides has it only the size is compared.
+
+    Examples
+    --------
+    >>> for status, key, source, destination in diff_prefixes("myBucket", "myData", "myReplica", "myData"):
+    ...     print(status, key)
+    removed /new-file.csv
+    changed /myFile.data
+
+    """
+    source_prefix = _normalize_prefix(source_prefix)
+    destination_prefix = _normalize_prefix(destination_prefix)
+    destination_aws_auth = aws_auth if destination_aws_auth is None else destination_aws_auth
+
+    joined = _merge_join(
+        _relative_contents(source_bucket, source_prefix, aws_auth),
+        _relative_contents(destination_bucket, destination_prefix, destination_aws_auth),
+    )
+    for key, src, dst in joined:
+        if src is None:
+            yield "added", key, src, dst
+        elif dst is None:
+            yield "removed", key, src, dst
+        elif not _same_object(src, dst, compare_last_modified):
+            yield "changed", key, src, dst
+        elif include_unchanged:
+            yield "unchanged", key, src, dst
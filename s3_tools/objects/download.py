@@ -1,22 +1,170 @@
 """Download S3 objects to files."""
+import json
+import logging
+import os
+import threading
 from concurrent import futures
+from contextlib import nullcontext
 from pathlib import Path
 from typing import (
     Any,
+    Callable,
     Dict,
+    Iterable,
     List,
     Optional,
+    Set,
     Tuple,
     Union,
 )
 
-import boto3
-
-from s3_tools.objects.list import list_objects
-from s3_tools.utils import (
-    _create_progress_bar,
-    _get_future_output,
+from boto3.s3.transfer import TransferConfig
+
+from s3_tools.client import AwsAuth, _get_threads, get_client
+from s3_tools.objects.list import _iter_contents, _normalize_prefix
+from s3_tools.progress import ProgressCallback, TransferProgress, _create_transfer_progress
+from s3_tools.transfer import (
+    TransferProfile,
+    TransferScheduler,
+    _get_scheduler,
+    _get_transfer_config,
+    _option,
 )
+from s3_tools.utils import _get_future_output, _submit_bounded
+
+PARTIAL_SUFFIX = ".s3tools-partial"
+STATE_SUFFIX = ".s3tools-state"
+WRITE_CHUNK_SIZE = 1024 ** 2
+
+
+def _to_ranges(parts: Set[int]) -> List[List[int]]:
+    """Compress part numbers into sorted [first, last] ranges, so the state file stays small."""
+    ranges: List[List[int]] = []
+    for part in sorted(parts):
+        if ranges and ranges[-1][1] == part - 1:
+            ranges[-1][1] = part
+        else:
+            ranges.append([part, part])
+    return ranges
+
+
+def _save_state(state_path: Path, state: Dict[str, Any]) -> None:
+    """Write the state file atomically, a crash leaves the previous state."""
+    temp_path = state_path.with_name(state_path.name + ".tmp")
+    temp_path.write_text(json.dumps(state))
+    os.replace(temp_path, state_path)
+
+
+def _load_state(state_path: Path, partial_path: Path, etag: str, size: int) -> Optional[Dict[str, Any]]:
+    """Read the state of a previous download, None if missing, unreadable or for another version of the object."""
+    try:
+        state = json.loads(state_path.read_text())
+    except (OSError, ValueError):
+        return None
+
+    if (state.get("etag"), state.get("size")) != (etag, size) or not partial_path.exists():
+        return None
+
+    return state
+
+
+def _preallocate(partial_path: Path, size: int) -> None:
+    """Create the partial file with its final size, reserving the disk space where the platform supports it."""
+    with open(partial_path, "wb") as file:
+        if size and hasattr(os, "posix_fallocate"):
+            os.posix_fallocate(file.fileno(), 0, size)
+        else:
+            file.truncate(size)
+
+
+def _download_part(
+    s3,
+    bucket: str,
+    key: str,
+    etag: str,
+    partial_path: Path,
+    start: int,
+    end: int,
+    extra_args: Dict[str, str],
+    callback: Optional[Callable[[int], None]],
+) -> None:
+    """Download a byte range into its place of the partial file, flushed to disk before it is recorded as done."""
+    body = s3.get_object(Bucket=bucket, Key=key, Range=f"bytes={start}-{end}", IfMatch=etag, **extra_args)["Body"]
+    with open(partial_path, "r+b") as file:
+        file.seek(start)
+        for chunk in iter(lambda: body.read(WRITE_CHUNK_SIZE), b""):
+            file.write(chunk)
+            if callback:
+                callback(len(chunk))
+        file.flush()
+        os.fsync(file.fileno())
+
+
+def _download_resumable(
+    s3,
+    bucket: str,
+    key: str,
+    local_filename: Path,
+    extra_args: Dict[str, str],
+    config: Optional[TransferConfig],
+    callback: Optional[Callable[[int], None]],
+) -> None:
+    """Download an object in ranged parts to a partial file, resuming the parts left by a previous run.
+
+    The completed parts and the object ETag are kept in a state file next to the partial file.
+    A resume with another ETag (the object changed) starts over, and every part is requested with IfMatch,
+    so parts of different versions are never mixed. The partial file is renamed when complete,
+    with the object last modified time, and a later call finding it with the same size and time does nothing.
+    """
+    partial_path = local_filename.with_name(local_filename.name + PARTIAL_SUFFIX)
+    state_path = local_filename.with_name(local_filename.name + STATE_SUFFIX)
+
+    head = s3.head_object(Bucket=bucket, Key=key, **extra_args)
+    size, etag, mtime = head["ContentLength"], head["ETag"], head["LastModified"].timestamp()
+
+    if not state_path.exists() and local_filename.exists():
+        stat = local_filename.stat()
+        if (stat.st_size, stat.st_mtime) == (size, mtime):
+            return  # Completed by a previous run
+
+    config = config or TransferConfig()
+    state = _load_state(state_path, partial_path, etag, size)
+    if state is None:
+        state = {
+            "bucket": bucket,
+            "key": key,
+            "etag": etag,
+            "size": size,
+            "part_size": _option(config, "multipart_chunksize"),
+            "completed": [],
+        }
+        _preallocate(partial_path, size)
+        _save_state(state_path, state)
+
+    part_size = state["part_size"]
+    completed = {part for first, last in state["completed"] for part in range(first, last + 1)}
+    pending = [part for part in range(-(-size // part_size)) if part not in completed]
+    lock = threading.Lock()
+    if callback:
+        callback(size - sum(min(part_size, size - part * part_size) for part in pending))  # Done by previous runs
+
+    def download(part: int) -> None:
+        start = part * part_size
+        end = min(start + part_size, size) - 1
+        _download_part(s3, bucket, key, etag, partial_path, start, end, extra_args, callback)
+        with lock:
+            completed.add(part)
+            state["completed"] = _to_ranges(completed)
+            _save_state(state_path, state)
+
+    threads = _option(config, "max_concurrency") if _option(config, "use_threads") else 1
+    with futures.ThreadPoolExecutor(max_workers=max(1, min(threads, len(pending)))) as executor:
+        for future in [executor.submit(download, part) for part in pending]:
+            future.result()
+
+    os.replace(partial_path, local_filename)
+    os.utime(local_filename, (mtime, mtime))
+    state_path.unlink()
 
 
 def download_key_to_file(
@@ -25,8 +173,11 @@ def download_key_to_file(
     local_filename: Union[str, Path],
     progress=None,  # type: ignore # No import if extra not installed
     task_id: int = -1,
-    aws_auth: Dict[str, str] = {},
+    aws_auth: AwsAuth = {},
     extra_args: Dict[str, str] = {},
+    transfer_config: Optional[TransferProfile] = None,
+    resumable: bool = False,
+    callback: Optional[Callable[[int], None]] = None,
 ) -> bool:
     """Retrieve one object from AWS S3 bucket and store into local disk.
 
@@ -47,14 +198,31 @@ def download_key_to_file(
     task_id: int
         Task ID on the progress bar to be updated, by default -1.
 
-    aws_auth: Dict[str, str]
-        Contains AWS credentials, by default is empty.
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context, by default is empty.
 
     extra_args: Dict[str, str]
         Extra arguments to be passed to the boto3 download_file method, by default is empty.
         Allowed download arguments:
         https://boto3.amazonaws.com/v1/documentation/api/latest/reference/customizations/s3.html#boto3.s3.transfer.S3Transfer.ALLOWED_DOWNLOAD_ARGS
 
+    transfer_config: Optional[Union[str, TransferConfig]]
+        Transfer settings, a profile name ("auto", "default", "small" or "large") or a boto3 TransferConfig,
+        by default None (the S3Context or the process default, see set_default_transfer_config).
+        The "auto" profile makes a HeadObject request to get the object size.
+
+    resumable: bool
+        If True, the object is downloaded in ranged parts (of the transfer multipart_chunksize)
+        to a preallocated "<local_filename>.s3tools-partial" file, recording the completed parts and the object ETag
+        in "<local_filename>.s3tools-state". After a failure, calling it again downloads only the missing parts,
+        or starts over if the object changed. The file is renamed to local_filename when complete,
+        with the object last modified time, and is not downloaded again while its size and time match.
+        By default False.
+
+    callback: Optional[Callable[[int], None]]
+        Function called with the number of bytes downloaded, as they are downloaded, by default None.
+        On resume, it is first called with the bytes downloaded by the previous runs.
+
     Returns
     -------
     bool
@@ -70,29 +238,155 @@ def download_key_to_file(
     True
 
     """
-    session = boto3.session.Session(**aws_auth)
-    s3 = session.client("s3")
-    Path(local_filename).parent.mkdir(parents=True, exist_ok=True)
-    s3.download_file(
-        Bucket=bucket,
-        Key=Path(key).as_posix(),
-        Filename=Path(local_filename).as_posix(),
-        ExtraArgs=extra_args,
+    s3 = get_client(aws_auth)
+    config = _get_transfer_config(
+        transfer_config, aws_auth, lambda: s3.head_object(Bucket=bucket, Key=Path(key).as_posix())["ContentLength"]
     )
+    Path(local_filename).parent.mkdir(parents=True, exist_ok=True)
+    if resumable:
+        _download_resumable(s3, bucket, Path(key).as_posix(), Path(local_filename), extra_args, config, callback)
+    else:
+        s3.download_file(
+            Bucket=bucket,
+            Key=Path(key).as_posix(),
+            Filename=Path(local_filename).as_posix(),
+            ExtraArgs=extra_args,
+            Config=config,
+            Callback=callback,
+        )
     if progress:
         progress.update(task_id, advance=1)
     return Path(local_filename).exists()
 
 
+def _download_scheduled(
+    scheduler: TransferScheduler,
+    size: Optional[int],
+    bucket: str,
+    key: Union[str, Path],
+    local_filename: Union[str, Path],
+    progress: Optional[TransferProgress],
+    aws_auth: AwsAuth,
+    extra_args: Dict[str, str],
+    transfer_config: Optional[TransferProfile],
+    resumable: bool,
+) -> bool:
+    """Download an object with the part concurrency granted by the scheduler, see download_key_to_file.
+
+    The size is known when the object comes from a listing,
+    the "auto" profile and the progress get it with HeadObject otherwise.
+    """
+    sizes = [size]
+
+    def get_size() -> int:
+        if sizes[0] is None:
+            sizes[0] = get_client(aws_auth).head_object(Bucket=bucket, Key=Path(key).as_posix())["ContentLength"]
+        return sizes[0]
+
+    config = _get_transfer_config(transfer_config, aws_auth, get_size)
+    listed = size is not None
+    if progress and not listed:
+        get_size()
+
+    tracked = progress.file(Path(key).as_posix(), sizes[0], add_size=not listed) if progress else nullcontext()
+    with scheduler.transfer(sizes[0], config) as scheduled, tracked as callback:
+        return download_key_to_file(
+            bucket, key, local_filename, aws_auth=aws_auth, extra_args=extra_args,
+            transfer_config=scheduled, resumable=resumable, callback=callback,
+        )
+
+
+def _download_keys_to_files(
+    bucket: str,
+    downloads: Iterable[
+        Tuple[Union[str, Path], Union[str, Path], Dict[str, str], Optional[TransferProfile], Optional[int]]
+    ],
+    threads: Optional[int],
+    show_progress: bool,
+    aws_auth: AwsAuth,
+    as_paths: bool,
+    resumable: bool,
+    progress_callback: Optional[Union[ProgressCallback, logging.Logger]],
+) -> List[Tuple[Union[str, Path], Union[str, Path], Any]]:
+    """Download objects to local files in parallel as they are produced.
+
+    Parameters
+    ----------
+    bucket: str
+        AWS S3 bucket where the objects are stored.
+
+    downloads: Iterable[Tuple[Union[str, Path], Union[str, Path], Dict[str, str], Optional[TransferProfile], int]]
+        Tuples of S3 key, local path, extra arguments, transfer settings and object size (None if unknown),
+        it can be a generator.
+
+    threads: Optional[int]
+        Number of parallel downloads, the requests of their parts are limited by the scheduler.
+
+    show_progress: bool
+        Show the progress bars on console, the totals grow as the downloads are produced.
+
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context.
+
+    as_paths: bool
+        If True, the keys are returned as Path objects, otherwise as strings.
+
+    resumable: bool
+        If True, each object is downloaded in resumable mode, see download_key_to_file.
+
+    progress_callback: Optional[Union[ProgressCallback, logging.Logger]]
+        Function called with the progress snapshots, or a logger, see TransferProgress.
+
+    Returns
+    -------
+    List[Tuple]
+        A list with tuples formed by the "S3_Key", "Local_Path", and the result of the download.
+    """
+    threads = _get_threads(threads, aws_auth)
+    scheduler = _get_scheduler(aws_auth, threads)
+    get_client(aws_auth, max_pool_connections=max(threads, scheduler.max_requests))  # Pool for all requests
+    progress = _create_transfer_progress("Downloading", show_progress, progress_callback)
+
+    def calls():
+        for s3_key, filename, extra_args, transfer_config, size in downloads:
+            if progress:
+                progress.expect(size)
+
+            yield (s3_key, filename), (
+                scheduler, size, bucket, s3_key, filename, progress, aws_auth, extra_args, transfer_config, resumable
+            )
+
+    try:
+        with futures.ThreadPoolExecutor(max_workers=threads) as executor:
+            # Map each finished future to its (S3 key, Local filename) as they complete
+            output = [
+                (s3_key, filename, _get_future_output(future))
+                for future, (s3_key, filename) in _submit_bounded(executor, _download_scheduled, calls(), 2 * threads)
+            ]
+    finally:
+        if progress:
+            progress.close()  # Also stops the console display on errors
+
+    if as_paths:
+        output = [(Path(key), Path(fn), result) for key, fn, result in output]
+    else:
+        output = [(Path(key).as_posix(), Path(fn).as_posix(), result) for key, fn, result in output]
+
+    return output
+
+
 def download_keys_to_files(
     bucket: str,
     keys_paths: List[Tuple[Union[str, Path], Union[str, Path]]],
-    threads: int = 5,
+    threads: Optional[int] = None,
     show_progress: bool = False,
-    aws_auth: Dict[str, str] = {},
+    aws_auth: AwsAuth = {},
     as_paths: bool = False,
     default_extra_args: Dict[str, str] = {},
     extra_args_per_key: List[Dict[str, str]] = [],
+    transfer_config: Optional[TransferProfile] = None,
+    resumable: bool = False,
+    progress_callback: Optional[Union[ProgressCallback, logging.Logger]] = None,
 ) -> List[Tuple[Union[str, Path], Union[str, Path], Any]]:
     """Download list of objects to specific paths.
 
@@ -110,15 +404,17 @@ def download_keys_to_files(
             (Path("S3_Key"), Path("Local_Path")),
         ]
 
-    threads: int
-        Number of parallel downloads, by default 5.
+    threads: Optional[int]
+        Number of parallel downloads, by default 5 or the S3Context threads.
+        The requests of all downloads, including their parts, are limited by the TransferScheduler
+        of the S3Context or the process (see set_default_transfer_scheduler), by default to one per thread.
 
     show_progress: bool
-        Show progress bar on console, by default False.
-        (Need to install extra [progress] to be used)
+        Show the progress bars on console, by default False: bytes of all files with the throughput and
+        remaining time, and bytes of the largest files in flight. (Need to install extra [progress] to be used)
 
-    aws_auth: Dict[str, str]
-        Contains AWS credentials, by default is empty.
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context, by default is empty.
 
     as_paths: bool
         If True, the keys are returned as Path objects, otherwise as strings, by default is False.
@@ -131,6 +427,18 @@ def download_keys_to_files(
         Extra arguments to be passed for each S3 key to the boto3 download_file method, by default is empty.
         The default extra arguments will be merged with the extra arguments passed for each key.
 
+    transfer_config: Optional[Union[str, TransferConfig]]
+        Transfer settings of each download, see download_key_to_file, by default None.
+
+    resumable: bool
+        If True, each object is downloaded in resumable mode, see download_key_to_file, by default False.
+        Running the same call again after a crash skips the completed files and resumes the partial ones.
+
+    progress_callback: Optional[Union[Callable[[Dict[str, Any]], None], logging.Logger]]
+        Function called with the progress snapshots (see TransferProgress) at most every 0.5 seconds,
+        or a logger where they are logged at INFO level, by default None.
+        The byte totals need the size of each key, got with a HeadObject request per key.
+
     Returns
     -------
     List[Tuple]
@@ -160,44 +468,14 @@ def download_keys_to_files(
 
     extra_arguments = [{}] * len(keys_paths) if len(extra_args_per_key) == 0 else extra_args_per_key
 
-    if show_progress:
-        progress, task_id = _create_progress_bar("Downloading", len(keys_paths))
-        progress.start()
-        progress.start_task(task_id)
-    else:
-        progress, task_id = None, -1
-
-    with futures.ThreadPoolExecutor(max_workers=threads) as executor:
-        # Create a dictionary to map the future execution with the (S3 key, Local filename)
-        # dict = {future: values}
-        executions = {
-            executor.submit(
-                download_key_to_file,
-                bucket,
-                s3_key,
-                filename,
-                progress,
-                task_id,
-                aws_auth,
-                {**default_extra_args, **extra_args},
-            ): {"s3": s3_key, "fn": filename}
-            for (s3_key, filename), extra_args in zip(keys_paths, extra_arguments)
-        }
-
-        output = [
-            (executions[future]["s3"], executions[future]["fn"], _get_future_output(future))
-            for future in futures.as_completed(executions)
-        ]
-
-    if show_progress:
-        progress.stop()
-
-    if as_paths:
-        output = [(Path(key), Path(fn), result) for key, fn, result in output]
-    else:
-        output = [(Path(key).as_posix(), Path(fn).as_posix(), result) for key, fn, result in output]
+    downloads = (
+        (s3_key, filename, {**default_extra_args, **extra_args}, transfer_config, None)
+        for (s3_key, filename), extra_args in zip(keys_paths, extra_arguments)
+    )
 
-    return output
+    return _download_keys_to_files(
+        bucket, downloads, threads, show_progress, aws_auth, as_paths, resumable, progress_callback
+    )
 
 
 def download_prefix_to_folder(
@@ -206,15 +484,19 @@ def download_prefix_to_folder(
     folder: Union[str, Path],
     search_str: Optional[str] = None,
     remove_prefix: bool = True,
-    threads: int = 5,
+    threads: Optional[int] = None,
     show_progress: bool = False,
-    aws_auth: Dict[str, str] = {},
+    aws_auth: AwsAuth = {},
     as_paths: bool = False,
     default_extra_args: Dict[str, str] = {},
+    transfer_config: Optional[TransferProfile] = None,
+    resumable: bool = False,
+    progress_callback: Optional[Union[ProgressCallback, logging.Logger]] = None,
 ) -> List[Tuple[Union[str, Path], Union[str, Path], Any]]:
     """Download objects to local folder.
 
     Function to retrieve all files under a prefix on S3 and store them into local folder.
+    To download only the new or changed objects on each run, see sync_prefix_to_folder.
 
     Parameters
     ----------
@@ -235,15 +517,17 @@ def download_prefix_to_folder(
         If True will remove the the prefix when writing to local folder.
         The remaining "folders" on the key will be created on the local folder.
 
-    threads: int
-        Number of parallel downloads, by default 5.
+    threads: Optional[int]
+        Number of parallel downloads, by default 5 or the S3Context threads.
+        The requests of all downloads, including their parts, are limited by the TransferScheduler
+        of the S3Context or the process (see set_default_transfer_scheduler), by default to one per thread.
 
     show_progress: bool
-        Show progress bar on console, by default False.
-        (Need to install extra [progress] to be used)
+        Show the progress bars on console, by default False: bytes of all files with the throughput and
+        remaining time, and bytes of the largest files in flight. (Need to install extra [progress] to be used)
 
-    aws_auth: Dict[str, str]
-        Contains AWS credentials, by default is empty.
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context, by default is empty.
 
     as_paths: bool
         If True, the keys are returned as Path objects, otherwise as strings, by default is False.
@@ -252,6 +536,18 @@ def download_prefix_to_folder(
         Extra arguments to be passed to the boto3 download_file method, by default is empty.
         The extra arguments will be applied to all S3 keys.
 
+    transfer_config: Optional[Union[str, TransferConfig]]
+        Transfer settings of each download, see download_key_to_file, by default None.
+        The "auto" profile and the scheduler use the listed size of each object, without HeadObject requests.
+
+    resumable: bool
+        If True, each object is downloaded in resumable mode, see download_key_to_file, by default False.
+        Running the same call again after a crash skips the completed files and resumes the partial ones.
+
+    progress_callback: Optional[Union[Callable[[Dict[str, Any]], None], logging.Logger]]
+        Function called with the progress snapshots (see TransferProgress) at most every 0.5 seconds,
+        or a logger where they are logged at INFO level, by default None.
+
     Returns
     -------
     List[Tuple]
@@ -272,20 +568,23 @@ def download_prefix_to_folder(
     ]
 
     """
-    s3_keys = list_objects(
-        bucket=bucket,
-        prefix=prefix,
-        search_str=search_str,
-        aws_auth=aws_auth,
-        as_paths=as_paths,
+    prefix = _normalize_prefix(prefix)
+    s3_keys = (
+        (Path(obj["Key"]) if as_paths else obj["Key"], obj["Size"])
+        for obj in _iter_contents(bucket, prefix, search_str, 1000, aws_auth)
     )
 
-    keys_paths: List[Tuple[Union[str, Path], Union[str, Path]]] = [(
+    downloads = ((
         key,
         "{}/{}".format(
             Path(folder).as_posix(),
-            Path(key).as_posix().replace(Path(prefix).as_posix(), "")[1:] if remove_prefix else key
-        )
-    ) for key in s3_keys]
-
-    return download_keys_to_files(bucket, keys_paths, threads, show_progress, aws_auth, as_paths, default_extra_args)
+            Path(key).as_posix()[len(prefix):].lstrip("/") if remove_prefix else key
+        ),
+        default_extra_args,
+        transfer_config,
+        size,
+    ) for key, size in s3_keys)
+
+    return _download_keys_to_files(
+        bucket, downloads, threads, show_progress, aws_auth, as_paths, resumable, progress_callback
+    )
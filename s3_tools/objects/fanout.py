@@ -0,0 +1,154 @@
+"""Copy S3 objects to several destinations."""
+from concurrent import futures
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from s3_tools.client import AwsAuth, _get_threads, get_client
+from s3_tools.objects.copy import COPY_MULTIPART_THRESHOLD, COPY_PART_SIZE, _copy_object_sized, _known_sizes
+from s3_tools.objects.stream_copy import STREAM_PART_SIZE, _stream_object
+from s3_tools.transfer import _get_scheduler
+from s3_tools.utils import _MemoryBudget, _submit_bounded
+
+Destination = Union[str, Tuple[str, AwsAuth]]
+
+
+def _call(fn: Callable, *args: Any) -> Any:
+    """Call a function, to schedule different functions on the same executor."""
+    return fn(*args)
+
+
+def _split_destinations(
+    destinations: Sequence[Destination],
+    aws_auth: AwsAuth,
+) -> Tuple[List[str], List[Tuple[str, AwsAuth]]]:
+    """Split the destinations into buckets reachable with the source credentials and buckets with other credentials."""
+    same: List[str] = []
+    other: List[Tuple[str, AwsAuth]] = []
+    for destination in destinations:
+        bucket, destination_aws_auth = (destination, aws_auth) if isinstance(destination, str) else destination
+        if destination_aws_auth == aws_auth:
+            same.append(bucket)
+        else:
+            other.append((bucket, destination_aws_auth))
+
+    return same, other
+
+
+def fanout_copy_keys(
+    source_bucket: str,
+    source_keys: Sequence[Union[str, Path]],
+    destinations: Sequence[Destination],
+    destination_keys: Optional[Sequence[Union[str, Path]]] = None,
+    threads: Optional[int] = None,
+    aws_auth: AwsAuth = {},
+    multipart_threshold: int = COPY_MULTIPART_THRESHOLD,
+    part_size: int = COPY_PART_SIZE,
+    stream_part_size: int = STREAM_PART_SIZE,
+    max_memory: Optional[int] = None,
+) -> None:
+    """Copy a list of S3 objects to several destination buckets, scheduling all copies on one thread pool.
+
+    Destinations given as a bucket name, or with the same credentials as the source, are copied on the server
+    (CopyObject or UploadPartCopy), one copy per destination.
+    Destinations with other credentials or endpoints are streamed through the client (see stream_copy_object),
+    reading each object once and writing it to all of them.
+
+    Parameters
+    ----------
+    source_bucket : str
+        S3 bucket where the objects are stored.
+
+    source_keys : Sequence[Union[str, Path]]
+        S3 keys where the objects are referenced.
+        When it is an ObjectListing the listed sizes are used instead of a HeadObject request per key.
+
+    destinations : Sequence[Union[str, Tuple[str, AwsAuth]]]
+        Destination buckets, each one a bucket name or a pair of bucket and credentials (or S3Context).
+
+    destination_keys : Optional[Sequence[Union[str, Path]]]
+        S3 destination keys, the same on all destinations, by default None (same as the source keys).
+
+    threads : Optional[int]
+        Number of parallel copies, by default 5 or the S3Context threads.
+
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context for the source, by default is empty.
+
+    multipart_threshold : int
+        Size in bytes from which objects are copied on the server in parts (UploadPartCopy), by default 64 MiB.
+        Only used when the object sizes are known.
+
+    part_size : int
+        Size in bytes of each part copied on the server, by default 64 MiB (at least 5 MiB).
+
+    stream_part_size : int
+        Size in bytes of each part streamed through the client, by default 16 MiB (at least 5 MiB).
+
+    max_memory : Optional[int]
+        Maximum bytes of streamed object data held in memory, by default None (two parts per thread).
+
+    Raises
+    ------
+    IndexError
+        When the source_keys and destination_keys have different length.
+
+    ValueError
+        When the keys list or the destinations list is empty.
+
+    Exception
+        The first copy error is raised and no more copies are started.
+
+    Examples
+    --------
+    >>> fanout_copy_keys(
+    ...     source_bucket='myBucket',
+    ...     source_keys=list_objects_columnar('myBucket', 'myData'),
+    ...     destinations=[
+    ...         'myReplicaBucket',
+    ...         ('myBackupBucket', {'profile_name': 'backup-account'}),
+    ...         ('myOtherRegionBucket', S3Context(aws_auth={'region_name': 'eu-west-1'})),
+    ...     ],
+    ... )
+
+    """
+    destination_keys = source_keys if destination_keys is None else destination_keys
+    if len(source_keys) != len(destination_keys):
+        raise IndexError("Key lists must have the same length")
+
+    if len(source_keys) == 0 or len(destinations) == 0:
+        raise ValueError("Key and destination lists length must be greater than zero")
+
+    threads = _get_threads(threads, aws_auth)
+    same, other = _split_destinations(destinations, aws_auth)
+    budget = _MemoryBudget(2 * threads * stream_part_size if max_memory is None else max_memory)
+    scheduler = _get_scheduler(aws_auth, threads)
+
+    get_client(aws_auth, max_pool_connections=max(2 * threads, scheduler.max_requests))  # Pool for all requests
+    for _, destination_aws_auth in other:
+        get_client(destination_aws_auth, max_pool_connections=2 * threads)
+
+    def calls() -> Iterator[Tuple[Union[str, Path], Tuple]]:
+        for source, destination, size in zip(source_keys, destination_keys, _known_sizes(source_keys)):
+            for bucket in same:
+                yield source, (
+                    _copy_object_sized, source_bucket, source, bucket, destination, size,
+                    multipart_threshold, part_size, threads, aws_auth, scheduler,
+                )
+            if other:
+                yield source, (
+                    _stream_object, source_bucket, source, [(bucket, destination, auth) for bucket, auth in other],
+                    size, stream_part_size, threads, budget, aws_auth,
+                )
+
+    with futures.ThreadPoolExecutor(max_workers=threads) as executor:
+        for future, _ in _submit_bounded(executor, _call, calls(), 2 * threads):
+            future.result()
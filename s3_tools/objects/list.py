@@ -1,14 +1,578 @@
 """List S3 bucket objects."""
 import fnmatch
+import heapq
+import itertools
+import json
+import os
+import time
+from array import array
+from concurrent import futures
+from datetime import datetime
 from pathlib import Path
 from typing import (
+    TYPE_CHECKING,
+    Any,
     Dict,
+    Iterable,
+    Iterator,
     List,
     Optional,
+    Sequence,
+    Set,
+    Tuple,
     Union,
 )
 
-import boto3
+from botocore.exceptions import BotoCoreError, ClientError
+
+from s3_tools.client import AwsAuth, _get_threads, get_client
+
+if TYPE_CHECKING:
+    from s3_tools.objects.cache import ListingCache
+
+GLOB_PREFIXES_LIMIT = 100
+TRANSIENT_ERROR_CODES = {"InternalError", "RequestTimeout", "ServiceUnavailable", "SlowDown", "Throttling"}
+
+
+def _normalize_prefix(prefix: Union[str, Path]) -> str:
+    """Convert a prefix to its S3 format.
+
+    Parameters
+    ----------
+    prefix: Union[str, Path]
+        Prefix where the objects are under.
+
+    Returns
+    -------
+    str
+        The prefix as a POSIX path, an empty prefix stays empty (lists all bucket).
+    """
+    prefix = Path(prefix).as_posix()
+    return "" if prefix == "." else prefix
+
+
+def _expand_char_class(chars: str) -> Optional[List[str]]:
+    """Expand the content of a glob character class (e.g. "abc" or "0-9") into its characters.
+
+    Parameters
+    ----------
+    chars: str
+        Content between the brackets of the character class.
+
+    Returns
+    -------
+    Optional[List[str]]
+        Sorted characters matched by the class, None if it is negated or not a simple class.
+    """
+    if chars.startswith("!") or any(op in chars for op in ("[", "\\", "&&", "~~", "||", "--")):
+        return None
+
+    expanded: Set[str] = set()
+    i = 0
+    while i < len(chars):
+        if i + 2 < len(chars) and chars[i + 1] == "-":
+            expanded.update(chr(c) for c in range(ord(chars[i]), ord(chars[i + 2]) + 1))
+            i += 3
+        else:
+            expanded.add(chars[i])
+            i += 1
+
+    return sorted(expanded)
+
+
+def _glob_literals(search_str: str) -> List[str]:
+    """Get the literal beginnings of a glob search string, expanding simple character classes.
+
+    Parameters
+    ----------
+    search_str: str
+        Basic search string (uses Unix shell-style wildcards).
+
+    Returns
+    -------
+    List[str]
+        Literals that any key matching the search string starts with one of.
+    """
+    literals = [""]
+    i = 0
+    while i < len(search_str):
+        char = search_str[i]
+        if char in "*?":
+            break
+
+        if char == "[":
+            # Same bracket rules as fnmatch.translate, an unclosed "[" is a literal
+            end = i + 1
+            if search_str[end:end + 1] == "!":
+                end += 1
+            if search_str[end:end + 1] == "]":
+                end += 1
+            end = search_str.find("]", end)
+
+            if end != -1:
+                chars = _expand_char_class(search_str[i + 1:end])
+                if chars is None or len(literals) * len(chars) > GLOB_PREFIXES_LIMIT:
+                    break
+                literals = [literal + c for literal in literals for c in chars]
+                i = end + 1
+                continue
+
+        literals = [literal + char for literal in literals]
+        i += 1
+
+    return literals
+
+
+def _glob_prefixes(prefix: str, search_str: Optional[str]) -> List[str]:
+    """Derive the S3 prefixes to be listed from a prefix and a glob search string.
+
+    The literal beginning of the search string (up to the first wildcard) is merged with the prefix,
+    so S3 only returns candidate keys. Simple character classes (e.g. "[ab]" or "[0-3]")
+    are expanded into multiple narrower prefixes, up to GLOB_PREFIXES_LIMIT prefixes.
+
+    Parameters
+    ----------
+    prefix: str
+        Exact S3 prefix where the objects are under.
+
+    search_str: Optional[str]
+        Basic search string to filter out keys (uses Unix shell-style wildcards).
+
+    Returns
+    -------
+    List[str]
+        Sorted prefixes to be listed, none of them being prefix of another.
+        It is empty when no key under the prefix can match the search string.
+
+    Examples
+    --------
+    >>> _glob_prefixes("", "logs/2024-05-*/part-*.gz")
+    ["logs/2024-05-"]
+
+    >>> _glob_prefixes("logs", "logs/2024-0[45]-*")
+    ["logs/2024-04-", "logs/2024-05-"]
+
+    """
+    # fnmatch is case insensitive on some systems, where the pattern literal is not the key prefix
+    if search_str is None or os.path.normcase("A/") != "A/":
+        return [prefix]
+
+    literals = _glob_literals(search_str)
+
+    prefixes: Set[str] = set()
+    for literal in literals:
+        if literal.startswith(prefix):
+            prefixes.add(literal)
+        elif prefix.startswith(literal):
+            prefixes.add(prefix)
+
+    # Remove prefixes already covered by a shorter one, so no key is listed twice
+    result: List[str] = []
+    for candidate in sorted(prefixes):
+        if not result or not candidate.startswith(result[-1]):
+            result.append(candidate)
+
+    return result
+
+
+def _filter_contents(
+    contents: Iterable[Dict[str, Any]],
+    search_str: Optional[str],
+    start_after: Optional[str],
+) -> Iterator[Dict[str, Any]]:
+    """Filter object dictionaries by search string and start key.
+
+    Parameters
+    ----------
+    contents: Iterable[Dict[str, Any]]
+        Object dictionaries with at least the "Key".
+
+    search_str: Optional[str]
+        Basic search string to filter out keys (uses Unix shell-style wildcards).
+
+    start_after: Optional[str]
+        Only keys after this one (lexicographically) are kept.
+
+    Yields
+    ------
+    Dict[str, Any]
+        Object dictionaries matching the filters.
+    """
+    for obj in contents:
+        if start_after is not None and obj["Key"] <= start_after:
+            continue
+        if search_str is None or fnmatch.fnmatch(obj["Key"], search_str):
+            yield obj
+
+
+def _iter_contents(
+    bucket: str,
+    prefix: str,
+    search_str: Optional[str],
+    max_keys: int,
+    aws_auth: AwsAuth,
+    start_after: Optional[str] = None,
+    cache: Optional["ListingCache"] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Iterate over the object dictionaries of a listing, page by page.
+
+    When a search string is given, only the prefixes that can match it are listed (see _glob_prefixes).
+
+    Parameters
+    ----------
+    bucket: str
+        AWS S3 bucket where the objects are stored.
+
+    prefix: str
+        Exact S3 prefix where the objects are under.
+
+    search_str: Optional[str]
+        Basic search string to filter out keys on each page (uses Unix shell-style wildcards).
+
+    max_keys: int
+        Max number of keys to have pagination.
+
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context.
+
+    start_after: Optional[str]
+        Only keys after this one (lexicographically) are listed, by default None.
+
+    cache: Optional[ListingCache]
+        Local listing cache used to serve the listing of the prefix, by default None.
+
+    Yields
+    ------
+    Dict[str, Any]
+        Object dictionaries from the "Contents" of each list_objects_v2 page.
+    """
+    if cache is not None:
+        yield from _filter_contents(cache.contents(bucket, prefix, max_keys, aws_auth), search_str, start_after)
+        return
+
+    for page in _iter_pages(bucket, prefix, search_str, max_keys, aws_auth, start_after):
+        yield from _filter_contents(page, search_str, None)
+
+
+def _iter_pages(
+    bucket: str,
+    prefix: str,
+    search_str: Optional[str],
+    max_keys: int,
+    aws_auth: AwsAuth,
+    start_after: Optional[str] = None,
+) -> Iterator[List[Dict[str, Any]]]:
+    """Iterate over the unfiltered "Contents" of each list_objects_v2 page.
+
+    Parameters
+    ----------
+    bucket: str
+        AWS S3 bucket where the objects are stored.
+
+    prefix: str
+        Exact S3 prefix where the objects are under.
+
+    search_str: Optional[str]
+        Basic search string used to narrow the listed prefixes (see _glob_prefixes).
+
+    max_keys: int
+        Max number of keys to have pagination.
+
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context.
+
+    start_after: Optional[str]
+        Only keys after this one (lexicographically) are listed, by default None.
+
+    Yields
+    ------
+    List[Dict[str, Any]]
+        Object dictionaries of a page, possibly empty.
+    """
+    s3 = get_client(aws_auth)
+
+    for list_prefix in _glob_prefixes(prefix, search_str):
+        continuation_token: Optional[str] = None
+
+        while True:
+            list_kwargs = {
+                "Bucket": bucket,
+                "Prefix": list_prefix,
+                "MaxKeys": max_keys
+            }
+            if continuation_token:
+                list_kwargs["ContinuationToken"] = continuation_token
+            elif start_after:
+                list_kwargs["StartAfter"] = start_after
+
+            response = s3.list_objects_v2(**list_kwargs)
+            yield response.get("Contents", [])
+
+            if not response.get("NextContinuationToken"):
+                break
+
+            continuation_token = response.get("NextContinuationToken")
+
+
+def iter_objects(
+    bucket: str,
+    prefix: Union[str, Path] = "",
+    search_str: Optional[str] = None,
+    max_keys: int = 1000,
+    aws_auth: AwsAuth = {},
+    as_paths: bool = False,
+    with_metadata: bool = False,
+    cache: Optional["ListingCache"] = None,
+) -> Iterator[Any]:
+    """Iterate over the objects from AWS S3 bucket under a given prefix and search string.
+
+    Keys are yielded page by page while the listing is running,
+    so the memory used is bounded by the page size and not by the number of objects.
+
+    Parameters
+    ----------
+    bucket: str
+        AWS S3 bucket where the objects are stored.
+
+    prefix: Union[str, Path]
+        Prefix where the objects are under.
+
+    search_str: str
+        Basic search string to filter out keys on result (uses Unix shell-style wildcards), by default is None.
+        For more about the search check "fnmatch" package.
+
+    max_keys: int
+        Max number of keys to have pagination.
+
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context, by default is empty.
+
+    as_paths: bool
+        If True, the keys are returned as Path objects, otherwise as strings, by default is False.
+
+    with_metadata: bool
+        If True, yields the object dictionary returned by S3 (Key, Size, ETag, LastModified, StorageClass)
+        instead of only the key, by default is False.
+
+    cache: Optional[ListingCache]
+        Local listing cache, by default None (always lists S3).
+        When given, the listing is served from the cache until its TTL expires.
+
+    Yields
+    ------
+    Union[str, Path, Dict[str, Any]]
+        Keys inside the bucket, under the path, and filtered, in lexicographic order.
+
+    Examples
+    --------
+    >>> for key in iter_objects(bucket="myBucket", prefix="myData"):
+    ...     print(key)
+    myData/myFile.data
+    myData/myMusic/awesome.mp3
+    myData/myDocs/paper.doc
+
+    >>> next(iter_objects(bucket="myBucket", prefix="myData", with_metadata=True))
+    {
+        'Key': 'myData/myFile.data',
+        'LastModified': datetime.datetime(2020, 10, 31, 20, 46, 13, tzinfo=tzutc()),
+        'ETag': '"1234567890abcdef1234567890abcdef"',
+        'Size': 123456,
+        'StorageClass': 'STANDARD'
+    }
+
+    """
+    for obj in _iter_contents(bucket, _normalize_prefix(prefix), search_str, max_keys, aws_auth, cache=cache):
+        key = Path(obj["Key"]) if as_paths else obj["Key"]
+        yield {**obj, "Key": key} if with_metadata else key
+
+
+def _iter_versions(bucket: str, prefix: str, aws_auth: AwsAuth) -> Iterator[Dict[str, Any]]:
+    """Iterate over all object versions and delete markers under an exact prefix, page by page.
+
+    Parameters
+    ----------
+    bucket: str
+        AWS S3 bucket where the objects are stored.
+
+    prefix: str
+        Exact S3 prefix where the objects are under.
+
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context.
+
+    Yields
+    ------
+    Dict[str, Any]
+        Version dictionaries from list_object_versions ("Key", "VersionId", ...),
+        delete markers have "IsDeleteMarker" set to True and no "Size".
+    """
+    s3 = get_client(aws_auth)
+    list_kwargs = {"Bucket": bucket, "Prefix": prefix}
+
+    while True:
+        response = s3.list_object_versions(**list_kwargs)
+
+        yield from response.get("Versions", [])
+        for marker in response.get("DeleteMarkers", []):
+            yield {**marker, "IsDeleteMarker": True}
+
+        if not response.get("IsTruncated"):
+            break
+
+        list_kwargs["KeyMarker"] = response["NextKeyMarker"]
+        list_kwargs["VersionIdMarker"] = response["NextVersionIdMarker"]
+
+
+def _is_transient_error(error: Exception) -> bool:
+    """Check if an S3 error is worth retrying (connection errors, throttling and server errors)."""
+    if isinstance(error, ClientError):
+        code = error.response.get("Error", {}).get("Code")
+        status = error.response.get("ResponseMetadata", {}).get("HTTPStatusCode", 0)
+        return code in TRANSIENT_ERROR_CODES or status >= 500
+
+    return isinstance(error, BotoCoreError)
+
+
+def _iter_pages_retrying(
+    bucket: str,
+    prefix: str,
+    search_str: Optional[str],
+    max_keys: int,
+    aws_auth: AwsAuth,
+    start_after: Optional[str],
+    retries: int,
+    backoff: float,
+) -> Iterator[List[Dict[str, Any]]]:
+    """Iterate over listing pages, retrying a failed page from the last listed key.
+
+    The retries counter is reset after each successful page, so it limits
+    the consecutive failures of a page and not the failures of the whole listing.
+    """
+    attempt = 0
+    while True:
+        try:
+            for page in _iter_pages(bucket, prefix, search_str, max_keys, aws_auth, start_after):
+                attempt = 0
+                if page:
+                    start_after = page[-1]["Key"]
+                yield page
+            return
+        except (BotoCoreError, ClientError) as error:
+            if attempt >= retries or not _is_transient_error(error):
+                raise
+            time.sleep(backoff * 2 ** attempt)
+            attempt += 1
+
+
+def _read_checkpoint(checkpoint: Path, state: Dict[str, Any]) -> Optional[str]:
+    """Read the last listed key from a checkpoint, checking it belongs to the same listing."""
+    if not checkpoint.exists():
+        return None
+
+    saved = json.loads(checkpoint.read_text())
+    if {k: saved.get(k) for k in ("bucket", "prefix", "search_str")} != {
+        k: state[k] for k in ("bucket", "prefix", "search_str")
+    }:
+        raise ValueError(f"Checkpoint {checkpoint} belongs to another listing: {saved}")
+
+    return saved.get("start_after")
+
+
+def _write_checkpoint(checkpoint: Path, state: Dict[str, Any]) -> None:
+    """Write a checkpoint atomically, so a crash never leaves a partial file."""
+    temporary = checkpoint.with_name(checkpoint.name + ".tmp")
+    temporary.write_text(json.dumps(state))
+    os.replace(temporary, checkpoint)
+
+
+def iter_objects_resumable(
+    bucket: str,
+    checkpoint: Union[str, Path],
+    prefix: Union[str, Path] = "",
+    search_str: Optional[str] = None,
+    max_keys: int = 1000,
+    retries: int = 5,
+    backoff: float = 1.0,
+    aws_auth: AwsAuth = {},
+    as_paths: bool = False,
+    with_metadata: bool = False,
+) -> Iterator[Any]:
+    """Iterate over the objects under a given prefix and search string, saving the progress to a checkpoint file.
+
+    After the keys of a page are consumed, the last listed key is saved on the checkpoint.
+    If the listing is interrupted, calling it again with the same checkpoint resumes
+    after that key (StartAfter) instead of listing from the beginning.
+    The keys of the page being consumed when interrupted are yielded again.
+    Pages failing with transient errors (throttling, timeouts, server errors)
+    are retried with exponential backoff. The checkpoint is removed when the listing completes.
+
+    Parameters
+    ----------
+    bucket: str
+        AWS S3 bucket where the objects are stored.
+
+    checkpoint: Union[str, Path]
+        File where the listing progress is saved.
+
+    prefix: Union[str, Path]
+        Prefix where the objects are under.
+
+    search_str: str
+        Basic search string to filter out keys on result (uses Unix shell-style wildcards), by default is None.
+        For more about the search check "fnmatch" package.
+
+    max_keys: int
+        Max number of keys to have pagination.
+
+    retries: int
+        Max consecutive retries of a failing page, by default 5.
+
+    backoff: float
+        Seconds to wait before the first retry, doubled on each new attempt, by default 1.
+
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context, by default is empty.
+
+    as_paths: bool
+        If True, the keys are returned as Path objects, otherwise as strings, by default is False.
+
+    with_metadata: bool
+        If True, yields the object dictionary returned by S3 instead of only the key, by default is False.
+
+    Yields
+    ------
+    Union[str, Path, Dict[str, Any]]
+        Keys inside the bucket, under the path, and filtered, in lexicographic order.
+
+    Raises
+    ------
+    ValueError
+        If the checkpoint was saved by a listing of another bucket, prefix or search string.
+
+    Examples
+    --------
+    >>> for key in iter_objects_resumable("myBucket", "listing.checkpoint", prefix="myData"):
+    ...     process(key)
+
+    """
+    checkpoint = Path(checkpoint)
+    state: Dict[str, Any] = {"bucket": bucket, "prefix": _normalize_prefix(prefix), "search_str": search_str}
+    state["start_after"] = _read_checkpoint(checkpoint, state)
+
+    pages = _iter_pages_retrying(
+        bucket, state["prefix"], search_str, max_keys, aws_auth, state["start_after"], retries, backoff
+    )
+    for page in pages:
+        for obj in _filter_contents(page, search_str, None):
+            key = Path(obj["Key"]) if as_paths else obj["Key"]
+            yield {**obj, "Key": key} if with_metadata else key
+
+        if page:
+            state["start_after"] = page[-1]["Key"]
+            _write_checkpoint(checkpoint, state)
+
+    if checkpoint.exists():
+        checkpoint.unlink()
 
 
 def list_objects(
@@ -16,8 +580,9 @@ def list_objects(
     prefix: Union[str, Path] = "",
     search_str: Optional[str] = None,
     max_keys: int = 1000,
-    aws_auth: Dict[str, str] = {},
+    aws_auth: AwsAuth = {},
     as_paths: bool = False,
+    cache: Optional["ListingCache"] = None,
 ) -> List[Union[str, Path]]:
     """Retrieve the list of objects from AWS S3 bucket under a given prefix and search string.
 
@@ -36,12 +601,16 @@ def list_objects(
     max_keys: int
         Max number of keys to have pagination.
 
-    aws_auth: Dict[str, str]
-        Contains AWS credentials, by default is empty.
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context, by default is empty.
 
     as_paths: bool
         If True, the keys are returned as Path objects, otherwise as strings, by default is False.
 
+    cache: Optional[ListingCache]
+        Local listing cache, by default None (always lists S3).
+        When given, the listing is served from the cache until its TTL expires.
+
     Returns
     -------
     List[Union[str, Path]]
@@ -61,25 +630,99 @@ def list_objects(
         Path("myData/myDocs/paper.doc")
     ]
 
+    """
+    keys = _list_keys(bucket, _normalize_prefix(prefix), search_str, max_keys, aws_auth, cache)
+
+    return [Path(key) if as_paths else key for key in keys]
+
+
+def _list_keys(
+    bucket: str,
+    prefix: str,
+    search_str: Optional[str],
+    max_keys: int,
+    aws_auth: AwsAuth,
+    cache: Optional["ListingCache"] = None,
+) -> List[str]:
+    """List all keys under an exact S3 prefix.
+
+    Parameters
+    ----------
+    bucket: str
+        AWS S3 bucket where the objects are stored.
+
+    prefix: str
+        Exact S3 prefix where the objects are under.
+
+    search_str: Optional[str]
+        Basic search string to filter out keys (uses Unix shell-style wildcards).
+
+    max_keys: int
+        Max number of keys to have pagination.
+
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context.
+
+    cache: Optional[ListingCache]
+        Local listing cache, by default None.
+
+    Returns
+    -------
+    List[str]
+        Keys under the prefix, sorted.
+    """
+    return [obj["Key"] for obj in _iter_contents(bucket, prefix, search_str, max_keys, aws_auth, cache=cache)]
+
+
+def _list_level(
+    bucket: str,
+    prefix: str,
+    delimiter: str,
+    search_str: Optional[str],
+    aws_auth: AwsAuth,
+) -> Tuple[List[str], List[str]]:
+    """List one level of a prefix using a delimiter.
+
+    Parameters
+    ----------
+    bucket: str
+        AWS S3 bucket where the objects are stored.
+
+    prefix: str
+        Exact S3 prefix to be listed.
+
+    delimiter: str
+        Character used to group keys into sub-prefixes.
+
+    search_str: Optional[str]
+        Basic search string to filter out keys (uses Unix shell-style wildcards).
+
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context.
+
+    Returns
+    -------
+    Tuple[List[str], List[str]]
+        The keys directly under the prefix and the sub-prefixes found, both sorted.
     """
     continuation_token: Optional[str] = None
-    keys = []
+    keys: List[str] = []
+    sub_prefixes: List[str] = []
 
-    session = boto3.session.Session(**aws_auth)
-    s3 = session.client("s3")
+    s3 = get_client(aws_auth)
 
     while True:
         list_kwargs = {
             "Bucket": bucket,
-            "Prefix": Path(prefix).as_posix(),
-            "MaxKeys": max_keys
+            "Prefix": prefix,
+            "Delimiter": delimiter,
         }
         if continuation_token:
             list_kwargs["ContinuationToken"] = continuation_token
 
         response = s3.list_objects_v2(**list_kwargs)
-        if "Contents" in response:
-            keys.extend([obj["Key"] for obj in response["Contents"]])
+        keys.extend(obj["Key"] for obj in response.get("Contents", []))
+        sub_prefixes.extend(common["Prefix"] for common in response.get("CommonPrefixes", []))
 
         if not response.get("NextContinuationToken"):
             break
@@ -89,4 +732,279 @@ def list_objects(
     if isinstance(search_str, str):
         keys = fnmatch.filter(keys, search_str)
 
-    return keys if not as_paths else [Path(key) for key in keys]
+    return keys, sub_prefixes
+
+
+def list_objects_parallel(
+    bucket: str,
+    prefix: Union[str, Path] = "",
+    search_str: Optional[str] = None,
+    max_keys: int = 1000,
+    delimiter: str = "/",
+    depth: int = 1,
+    sort: bool = True,
+    threads: Optional[int] = None,
+    aws_auth: AwsAuth = {},
+    as_paths: bool = False,
+) -> List[Union[str, Path]]:
+    """Retrieve the list of objects under a prefix, listing its sub-prefixes in parallel.
+
+    The sub-prefixes are discovered with a delimiter (e.g. "folders" for "/"),
+    then each sub-prefix is listed concurrently on a thread pool.
+    It is faster than list_objects for large prefixes partitioned into sub-prefixes,
+    for example date-partitioned data.
+
+    Parameters
+    ----------
+    bucket: str
+        AWS S3 bucket where the objects are stored.
+
+    prefix: Union[str, Path]
+        Prefix where the objects are under.
+
+    search_str: str
+        Basic search string to filter out keys on result (uses Unix shell-style wildcards), by default is None.
+        For more about the search check "fnmatch" package.
+
+    max_keys: int
+        Max number of keys to have pagination.
+
+    delimiter: str
+        Character used to discover the sub-prefixes, by default "/".
+
+    depth: int
+        Number of sub-prefix levels to discover before listing in parallel, by default 1.
+        The levels are counted under the prefix, e.g. for "logs" the first level is "logs/2024-05-01/".
+
+    sort: bool
+        If True, the keys are returned in lexicographic order like list_objects,
+        otherwise they are grouped by sub-prefix, by default True.
+
+    threads: Optional[int]
+        Number of parallel listings, by default 5 or the S3Context threads.
+
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context, by default is empty.
+
+    as_paths: bool
+        If True, the keys are returned as Path objects, otherwise as strings, by default is False.
+
+    Returns
+    -------
+    List[Union[str, Path]]
+        List of keys inside the bucket, under the path, and filtered.
+
+    Examples
+    --------
+    >>> list_objects_parallel(bucket="myBucket", prefix="logs", threads=20)
+    [
+        "logs/2024-05-01/part-0.gz",
+        "logs/2024-05-01/part-1.gz",
+        "logs/2024-05-02/part-0.gz"
+    ]
+
+    """
+    threads = _get_threads(threads, aws_auth)
+    get_client(aws_auth, max_pool_connections=threads)  # Pool large enough for all workers
+
+    groups: List[List[str]] = []
+    prefixes = _glob_prefixes(_normalize_prefix(prefix), search_str)
+
+    # A prefix not ending with the delimiter (e.g. "logs") only groups into "logs/" and its siblings,
+    # so one more level is listed to discover the sub-prefixes under it
+    partial = any(sub_prefix and not sub_prefix.endswith(delimiter) for sub_prefix in prefixes)
+
+    with futures.ThreadPoolExecutor(max_workers=threads) as executor:
+        for _ in range(depth + partial):
+            levels = [
+                executor.submit(_list_level, bucket, sub_prefix, delimiter, search_str, aws_auth)
+                for sub_prefix in prefixes
+            ]
+
+            prefixes = []
+            for level in levels:
+                keys, sub_prefixes = level.result()
+                groups.append(keys)
+                prefixes.extend(sub_prefixes)
+
+        listings = [
+            executor.submit(_list_keys, bucket, sub_prefix, search_str, max_keys, aws_auth)
+            for sub_prefix in prefixes
+        ]
+        groups.extend(listing.result() for listing in listings)
+
+    keys = list(heapq.merge(*groups)) if sort else list(itertools.chain.from_iterable(groups))
+
+    return [Path(key) if as_paths else key for key in keys]
+
+
+class ObjectListing(Sequence):
+    """Compact columnar listing of S3 objects.
+
+    Keys and ETags are stored as UTF-8 in contiguous buffers with offsets,
+    sizes and last modified timestamps in typed arrays, so millions of entries
+    use a fraction of the memory of a list of dictionaries.
+    It behaves as a sequence of keys, so it can be passed directly where a list of keys is expected.
+    The arrays support the buffer protocol, e.g. numpy.frombuffer(listing.sizes, dtype="int64").
+
+    Attributes
+    ----------
+    sizes: array.array
+        Object sizes in bytes (typecode "q").
+
+    last_modified: array.array
+        Object last modified as POSIX timestamps (typecode "d").
+
+    Examples
+    --------
+    >>> listing = list_objects_columnar(bucket="myBucket", prefix="myData")
+    >>> listing[0], listing.sizes[0], listing.etag(0)
+    ("myData/myFile.data", 123456, '"1234567890abcdef1234567890abcdef"')
+    >>> listing.total_size
+    987654321
+
+    """
+
+    def __init__(self) -> None:
+        self._keys = bytearray()
+        self._key_offsets = array("Q", [0])
+        self._etags = bytearray()
+        self._etag_offsets = array("Q", [0])
+        self.sizes = array("q")
+        self.last_modified = array("d")
+
+    def append(self, key: str, size: int, etag: str, last_modified: Union[datetime, float]) -> None:
+        """Add an object to the listing.
+
+        Parameters
+        ----------
+        key: str
+            Object key.
+
+        size: int
+            Object size in bytes.
+
+        etag: str
+            Object ETag as returned by S3.
+
+        last_modified: Union[datetime, float]
+            Object last modified datetime or POSIX timestamp.
+        """
+        self._keys += key.encode("utf-8")
+        self._key_offsets.append(len(self._keys))
+        self._etags += etag.encode("utf-8")
+        self._etag_offsets.append(len(self._etags))
+        self.sizes.append(size)
+        self.last_modified.append(last_modified.timestamp() if isinstance(last_modified, datetime) else last_modified)
+
+    def extend(self, contents: Iterable[Dict[str, Any]]) -> None:
+        """Add the object dictionaries returned by S3 (Key, Size, ETag, LastModified) to the listing.
+
+        Parameters
+        ----------
+        contents: Iterable[Dict[str, Any]]
+            Object dictionaries, e.g. the "Contents" of a list_objects_v2 page.
+        """
+        for obj in contents:
+            self.append(obj["Key"], obj["Size"], obj["ETag"], obj["LastModified"])
+
+    def __len__(self) -> int:
+        """Get the number of objects."""
+        return len(self.sizes)
+
+    def __getitem__(self, index):
+        """Get the key (or list of keys for a slice) at the index."""
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        index = range(len(self))[index]  # Handles negative and out of range indexes
+        return self._keys[self._key_offsets[index]:self._key_offsets[index + 1]].decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the keys."""
+        for index in range(len(self)):
+            yield self._keys[self._key_offsets[index]:self._key_offsets[index + 1]].decode("utf-8")
+
+    def etag(self, index: int) -> str:
+        """Get the ETag of the object at the index."""
+        index = range(len(self))[index]
+        return self._etags[self._etag_offsets[index]:self._etag_offsets[index + 1]].decode("utf-8")
+
+    def items(self) -> Iterator[Tuple[str, int, str, float]]:
+        """Iterate over the objects as (key, size, etag, last_modified) tuples."""
+        for index in range(len(self)):
+            yield self[index], self.sizes[index], self.etag(index), self.last_modified[index]
+
+    @property
+    def total_size(self) -> int:
+        """Sum of the object sizes in bytes."""
+        return sum(self.sizes)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory used by the listing buffers in bytes."""
+        return sum(
+            len(buffer) if isinstance(buffer, bytearray) else buffer.itemsize * len(buffer)
+            for buffer in (
+                self._keys, self._key_offsets, self._etags, self._etag_offsets, self.sizes, self.last_modified
+            )
+        )
+
+
+def list_objects_columnar(
+    bucket: str,
+    prefix: Union[str, Path] = "",
+    search_str: Optional[str] = None,
+    max_keys: int = 1000,
+    aws_auth: AwsAuth = {},
+    cache: Optional["ListingCache"] = None,
+) -> ObjectListing:
+    """Retrieve the objects under a given prefix and search string with their size, ETag and last modified.
+
+    The result is a compact ObjectListing instead of a list of dictionaries,
+    it avoids one head_object request per key when sizes or ETags are needed.
+
+    Parameters
+    ----------
+    bucket: str
+        AWS S3 bucket where the objects are stored.
+
+    prefix: Union[str, Path]
+        Prefix where the objects are under.
+
+    search_str: str
+        Basic search string to filter out keys on result (uses Unix shell-style wildcards), by default is None.
+        For more about the search check "fnmatch" package.
+
+    max_keys: int
+        Max number of keys to have pagination.
+
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context, by default is empty.
+
+    cache: Optional[ListingCache]
+        Local listing cache, by default None (always lists S3).
+        When given, the listing is served from the cache until its TTL expires.
+
+    Returns
+    -------
+    ObjectListing
+        Columnar listing of the objects, in lexicographic order of keys.
+
+    Examples
+    --------
+    >>> listing = list_objects_columnar(bucket="myBucket", prefix="myData")
+    >>> list(listing)
+    [
+        "myData/myFile.data",
+        "myData/myMusic/awesome.mp3",
+        "myData/myDocs/paper.doc"
+    ]
+    >>> listing.total_size
+    987654321
+
+    """
+    listing = ObjectListing()
+    listing.extend(_iter_contents(bucket, _normalize_prefix(prefix), search_str, max_keys, aws_auth, cache=cache))
+
+    return listing
@@ -1,15 +1,18 @@
 """Move S3 objects."""
-from concurrent import futures
 from pathlib import Path
 from typing import (
     Dict,
+    Iterable,
     List,
+    Optional,
+    Sequence,
+    Tuple,
     Union,
 )
 
-import boto3
-
-from s3_tools.objects.delete import delete_object
+from s3_tools.client import AwsAuth, _get_threads, get_client
+from s3_tools.objects.copy import _iter_copied, _known_sizes, _prefix_keys_listing
+from s3_tools.objects.delete import _delete_objects_batched, delete_object
 
 
 def move_object(
@@ -17,7 +20,7 @@ def move_object(
     source_key: Union[str, Path],
     destination_bucket: str,
     destination_key: Union[str, Path],
-    aws_auth: Dict[str, str] = {},
+    aws_auth: AwsAuth = {},
 ) -> None:
     """Move S3 object from source bucket and key to destination.
 
@@ -35,8 +38,8 @@ def move_object(
     destination_key : Union[str, Path]
         S3 destination key.
 
-    aws_auth: Dict[str, str]
-        Contains AWS credentials, by default is empty.
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context, by default is empty.
 
     Examples
     --------
@@ -48,10 +51,9 @@ def move_object(
     ... )
 
     """
-    session = boto3.session.Session(**aws_auth)
-    s3 = session.resource("s3")
+    s3 = get_client(aws_auth)
 
-    s3.meta.client.copy(
+    s3.copy(
         {'Bucket': source_bucket, 'Key': Path(source_key).as_posix()},
         destination_bucket,
         Path(destination_key).as_posix(),
@@ -60,35 +62,93 @@ def move_object(
     delete_object(source_bucket, source_key, aws_auth)
 
 
+def _move_keys_pairs(
+    source_bucket: str,
+    keys_pairs: Iterable[Tuple[Union[str, Path], Union[str, Path], Optional[int]]],
+    destination_bucket: str,
+    threads: Optional[int],
+    aws_auth: AwsAuth,
+) -> List[Dict[str, str]]:
+    """Copy keys in parallel and delete the sources in batches once their copies are confirmed.
+
+    Parameters
+    ----------
+    source_bucket : str
+        S3 bucket where the objects are stored.
+
+    keys_pairs : Iterable[Tuple[Union[str, Path], Union[str, Path], Optional[int]]]
+        Source key, destination key and object size (None if unknown), it can be a generator.
+
+    destination_bucket : str
+        S3 destination bucket.
+
+    threads : Optional[int]
+        Number of parallel copies and of parallel delete batches.
+
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context.
+
+    Returns
+    -------
+    List[Dict[str, str]]
+        Source keys not moved, with the failed "Operation" ("Copy" or "Delete") and the error "Code" and "Message".
+    """
+    threads = _get_threads(threads, aws_auth)
+    get_client(aws_auth, max_pool_connections=2 * threads)  # Pool large enough for copies and deletes
+
+    failed_copies: List[Dict[str, str]] = []
+    copied = _iter_copied(source_bucket, keys_pairs, destination_bucket, threads, aws_auth, failed=failed_copies)
+
+    failed_deletes = _delete_objects_batched(
+        source_bucket, ({"Key": Path(key).as_posix()} for key in copied), threads, aws_auth
+    )
+
+    return (
+        [{**error, "Operation": "Copy"} for error in failed_copies]
+        + [{**error, "Operation": "Delete"} for error in failed_deletes]
+    )
+
+
 def move_keys(
     source_bucket: str,
-    source_keys: List[Union[str, Path]],
+    source_keys: Sequence[Union[str, Path]],
     destination_bucket: str,
-    destination_keys: List[Union[str, Path]],
-    threads: int = 5,
-    aws_auth: Dict[str, str] = {},
-) -> None:
+    destination_keys: Sequence[Union[str, Path]],
+    threads: Optional[int] = None,
+    aws_auth: AwsAuth = {},
+) -> List[Dict[str, str]]:
     """Move a list of S3 objects from source bucket to destination.
 
+    The objects are copied in parallel and the sources are deleted in batches of up to 1000 keys (DeleteObjects),
+    only after their copies are confirmed. A failed copy does not stop the others, it is reported on the result.
+
     Parameters
     ----------
     source_bucket : str
         S3 bucket where the objects are stored.
 
-    source_keys : List[Union[str, Path]]
+    source_keys : Sequence[Union[str, Path]]
         S3 keys where the objects are referenced.
+        When it is an ObjectListing the listed sizes are used to copy without a HeadObject request per key.
 
     destination_bucket : str
         S3 destination bucket.
 
-    destination_keys : List[Union[str, Path]]
+    destination_keys : Sequence[Union[str, Path]]
         S3 destination keys.
 
-    threads : int, optional
-        Number of parallel uploads, by default 5.
+    threads : Optional[int]
+        Number of parallel copies and delete batches, by default 5 or the S3Context threads.
+
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context, by default is empty.
 
-    aws_auth: Dict[str, str]
-        Contains AWS credentials, by default is empty.
+    Returns
+    -------
+    List[Dict[str, str]]
+        Source keys not moved, with the failed "Operation" and the error "Code" and "Message",
+        empty when all objects were moved. A failed "Copy" keeps the source,
+        a failed "Delete" keeps both the source and its copy.
 
     Raises
     ------
@@ -112,6 +172,7 @@ def move_keys(
     ...         'myPhotos/photo.jpg',
     ...     ],
     ... )
+    []
 
     """
     if len(source_keys) != len(destination_keys):
@@ -120,11 +181,72 @@ def move_keys(
     if len(source_keys) == 0:
         raise ValueError("Key list length must be greater than zero")
 
-    with futures.ThreadPoolExecutor(max_workers=threads) as executor:
-        executors = (
-            executor.submit(move_object, source_bucket, source, destination_bucket, destination, aws_auth)
-            for source, destination in zip(source_keys, destination_keys)
-        )
+    keys_pairs = zip(source_keys, destination_keys, _known_sizes(source_keys))
+
+    return _move_keys_pairs(source_bucket, keys_pairs, destination_bucket, threads, aws_auth)
+
+
+def move_prefix(
+    source_bucket: str,
+    source_prefix: Union[str, Path],
+    destination_bucket: str,
+    change_prefix: Optional[Tuple[Union[str, Path], Union[str, Path]]] = None,
+    filter_keys: Optional[str] = None,
+    threads: Optional[int] = None,
+    aws_auth: AwsAuth = {},
+) -> List[Dict[str, str]]:
+    """Move S3 objects from source bucket to destination based on prefix filter.
+
+    The copies start with the first listing page, using the listed sizes instead of a HeadObject request per key,
+    unless the destination keys can fall inside the source listing, then the whole prefix is listed first.
+    The sources are deleted in batches of up to 1000 keys (DeleteObjects), only after their copies are confirmed.
+    A failed copy does not stop the others, it is reported on the result.
+
+    Parameters
+    ----------
+    source_bucket : str
+        S3 bucket where the objects are stored.
+
+    source_prefix : Union[str, Path]
+        S3 prefix where the objects are referenced.
+
+    destination_bucket : str
+        S3 destination bucket.
+
+    change_prefix : Tuple[Union[str, Path], Union[str, Path]], optional
+        Text to be replaced in keys prefixes, by default is None.
+        The first element is the text to be replaced, the second is the replacement text.
+
+    filter_keys : str, optional
+        Basic search string to filter out keys on result (uses Unix shell-style wildcards), by default is None.
+        For more about the search check "fnmatch" package.
+
+    threads : Optional[int]
+        Number of parallel copies and delete batches, by default 5 or the S3Context threads.
+
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context, by default is empty.
+
+    Returns
+    -------
+    List[Dict[str, str]]
+        Source keys not moved, with the failed "Operation" and the error "Code" and "Message",
+        empty when all objects were moved. A failed "Copy" keeps the source,
+        a failed "Delete" keeps both the source and its copy.
+
+    Examples
+    --------
+    >>> move_prefix(
+    ...     source_bucket='MyBucket',
+    ...     source_prefix='myFiles',
+    ...     destination_bucket='MyBucket',
+    ...     change_prefix=('myFiles', 'archive/myFiles')
+    ... )
+    []
+
+    """
+    keys_pairs = _prefix_keys_listing(
+        source_bucket, source_prefix, destination_bucket, change_prefix, filter_keys, aws_auth
+    )
 
-        for ex in executors:
-            ex.result()
+    return _move_keys_pairs(source_bucket, keys_pairs, destination_bucket, threads, aws_auth)
@@ -1,12 +1,11 @@
 """Create presigned URL for S3 bucket objects."""
 from pathlib import Path
 from typing import (
-    Dict,
     Optional,
     Union,
 )
 
-import boto3
+from s3_tools.client import AwsAuth, get_client
 
 
 def get_presigned_url(
@@ -14,7 +13,7 @@ def get_presigned_url(
     method_parameters: Optional[dict] = None,
     http_method: Optional[str] = None,
     expiration: int = 300,
-    aws_auth: Dict[str, str] = {},
+    aws_auth: AwsAuth = {},
 ) -> str:
     """Generate a presigned URL to invoke an S3.Client method.
 
@@ -32,8 +31,8 @@ def get_presigned_url(
     http_method: Optional[str]
         HTTP method to use, e.g., GET, POST. If not specified, will automatically be select the appropriate method.
 
-    aws_auth: Dict[str, str]
-        Contains AWS credentials, by default is empty.
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context, by default is empty.
 
     Returns
     -------
@@ -54,8 +53,7 @@ def get_presigned_url(
     https://myBucket.s3.amazonaws.com/?encoding-type=url&AWSAccessKeyId=ASI&Signature=5JLAcSKQ%3D&x-amz-security-token=FwoGZXIvY%&Expires=1646759818
 
     """
-    session = boto3.session.Session(**aws_auth)
-    s3 = session.client("s3")
+    s3 = get_client(aws_auth)
 
     try:
         response = s3.generate_presigned_url(
@@ -74,7 +72,7 @@ def get_presigned_download_url(
     bucket: str,
     key: Union[str, Path],
     expiration: int = 300,
-    aws_auth: Dict[str, str] = {},
+    aws_auth: AwsAuth = {},
 ) -> str:
     """Generate a presigned URL to download an S3 object.
 
@@ -89,8 +87,8 @@ def get_presigned_download_url(
     expiration: int
         Time in seconds for the presigned URL to remain valid, default 5 minutes.
 
-    aws_auth: Dict[str, str]
-        Contains AWS credentials, by default is empty.
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context, by default is empty.
 
     Returns
     -------
@@ -126,7 +124,7 @@ def get_presigned_upload_url(
     fields: Optional[dict] = None,
     conditions: Optional[list] = None,
     expiration: int = 300,
-    aws_auth: Dict[str, str] = {},
+    aws_auth: AwsAuth = {},
 ) -> dict:
     """Generate a presigned URL S3 POST request to upload a file.
 
@@ -147,8 +145,8 @@ def get_presigned_upload_url(
     expiration: int
         Time in seconds for the presigned URL to remain valid, default 5 minutes.
 
-    aws_auth: Dict[str, str]
-        Contains AWS credentials, by default is empty.
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context, by default is empty.
 
     Returns
     -------
@@ -177,8 +175,7 @@ def get_presigned_upload_url(
     if key is None:
         raise AttributeError("Key is required.")
 
-    session = boto3.session.Session(**aws_auth)
-    s3 = session.client("s3")
+    s3 = get_client(aws_auth)
 
     try:
         response = s3.generate_presigned_post(
@@ -6,11 +6,12 @@ from typing import (
     Union,
 )
 
-import boto3
 import ujson
 
+from s3_tools.client import AwsAuth, get_client
 
-def read_object_to_bytes(bucket: str, key: Union[str, Path], aws_auth: Dict[str, str] = {}) -> bytes:
+
+def read_object_to_bytes(bucket: str, key: Union[str, Path], aws_auth: AwsAuth = {}) -> bytes:
     """Retrieve one object from AWS S3 bucket as a byte array.
 
     Parameters
@@ -21,8 +22,8 @@ def read_object_to_bytes(bucket: str, key: Union[str, Path], aws_auth: Dict[str,
     key: Union[str, Path]
         Key where the object is stored.
 
-    aws_auth: Dict[str, str]
-        Contains AWS credentials, by default is empty.
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context, by default is empty.
 
     Returns
     -------
@@ -38,14 +39,13 @@ def read_object_to_bytes(bucket: str, key: Union[str, Path], aws_auth: Dict[str,
     b"The file content"
 
     """
-    session = boto3.session.Session(**aws_auth)
-    s3 = session.client("s3")
+    s3 = get_client(aws_auth)
     obj = s3.get_object(Bucket=bucket, Key=Path(key).as_posix())
 
     return obj["Body"].read()
 
 
-def read_object_to_text(bucket: str, key: Union[str, Path], aws_auth: Dict[str, str] = {}) -> str:
+def read_object_to_text(bucket: str, key: Union[str, Path], aws_auth: AwsAuth = {}) -> str:
     """Retrieve one object from AWS S3 bucket as a string.
 
     Parameters
@@ -56,8 +56,8 @@ def read_object_to_text(bucket: str, key: Union[str, Path], aws_auth: Dict[str,
     key: Union[str, Path]
         Key where the object is stored.
 
-    aws_auth: Dict[str, str]
-        Contains AWS credentials, by default is empty.
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context, by default is empty.
 
     Returns
     -------
@@ -77,7 +77,7 @@ def read_object_to_text(bucket: str, key: Union[str, Path], aws_auth: Dict[str,
     return data.decode("utf-8")
 
 
-def read_object_to_dict(bucket: str, key: Union[str, Path], aws_auth: Dict[str, str] = {}) -> Dict[Any, Any]:
+def read_object_to_dict(bucket: str, key: Union[str, Path], aws_auth: AwsAuth = {}) -> Dict[Any, Any]:
     """Retrieve one object from AWS S3 bucket as a dictionary.
 
     Parameters
@@ -88,8 +88,8 @@ def read_object_to_dict(bucket: str, key: Union[str, Path], aws_auth: Dict[str,
     key: Union[str, Path]
         Key where the object is stored.
 
-    aws_auth: Dict[str, str]
-        Contains AWS credentials, by default is empty.
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context, by default is empty.
 
     Returns
     -------
@@ -0,0 +1,433 @@
+"""Copy S3 objects through the client, between different credentials or endpoints."""
+from concurrent import futures
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from s3_tools.client import AwsAuth, _get_threads, get_client
+from s3_tools.objects.copy import (
+    MAX_PARTS,
+    MIN_PART_SIZE,
+    OBJECT_ATTRIBUTES,
+    _known_sizes,
+    _prefix_keys_listing,
+)
+from s3_tools.utils import _MemoryBudget, _submit_bounded
+
+STREAM_PART_SIZE = 16 * 1024 ** 2
+
+
+def _stream_part(
+    source_s3,
+    source: Dict[str, str],
+    targets: Sequence[Tuple[Any, Dict[str, str]]],
+    upload_ids: Sequence[str],
+    part_number: int,
+    byte_range: Tuple[int, int],
+    budget: _MemoryBudget,
+) -> List[Dict[str, Any]]:
+    """Download a byte range of the source (ranged GET) and upload it as a part of each destination."""
+    start, end = byte_range
+    with budget.reserve(end - start + 1):
+        body = source_s3.get_object(**source, Range=f"bytes={start}-{end}")["Body"].read()
+        etags = [
+            s3.upload_part(**destination, UploadId=upload_id, PartNumber=part_number, Body=body)["ETag"]
+            for (s3, destination), upload_id in zip(targets, upload_ids)
+        ]
+
+    return [{"PartNumber": part_number, "ETag": etag} for etag in etags]
+
+
+def _abort_uploads(targets: Sequence[Tuple[Any, Dict[str, str]]], upload_ids: Sequence[str]) -> None:
+    """Abort the multipart uploads of the destinations."""
+    for (s3, destination), upload_id in zip(targets, upload_ids):
+        s3.abort_multipart_upload(**destination, UploadId=upload_id)
+
+
+def _start_uploads(
+    targets: Sequence[Tuple[Any, Dict[str, str]]],
+    extra_args: Dict[str, Any],
+    body: bytes,
+) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """Create a multipart upload on each destination and upload its first part, aborting them on failure."""
+    upload_ids: List[str] = []
+    try:
+        for s3, destination in targets:
+            upload_ids.append(s3.create_multipart_upload(**destination, **extra_args)["UploadId"])
+
+        etags = [
+            s3.upload_part(**destination, UploadId=upload_id, PartNumber=1, Body=body)["ETag"]
+            for (s3, destination), upload_id in zip(targets, upload_ids)
+        ]
+    except BaseException:
+        _abort_uploads(targets, upload_ids)
+        raise
+
+    return upload_ids, [{"PartNumber": 1, "ETag": etag} for etag in etags]
+
+
+def _stream_object(
+    source_bucket: str,
+    source_key: Union[str, Path],
+    destinations: Sequence[Tuple[str, Union[str, Path], AwsAuth]],
+    size: Optional[int],
+    part_size: int,
+    threads: int,
+    budget: _MemoryBudget,
+    aws_auth: AwsAuth,
+) -> None:
+    """Copy an object with ranged GETs feeding a multipart upload on each destination, see stream_copy_object.
+
+    Each part is read once and uploaded to all destinations (bucket, key and credentials).
+    The first part is read before creating the uploads, so its response gives the object attributes
+    (e.g. ContentType, Metadata), its real size (the given size may come from an older listing)
+    and its ETag, which the other GETs require (IfMatch) to avoid mixing parts of different versions of the object.
+    """
+    source_s3 = get_client(aws_auth)
+    source = {"Bucket": source_bucket, "Key": Path(source_key).as_posix()}
+    targets = [
+        (get_client(destination_aws_auth), {"Bucket": bucket, "Key": Path(key).as_posix()})
+        for bucket, key, destination_aws_auth in destinations
+    ]
+
+    if size is None:
+        size = source_s3.head_object(**source)["ContentLength"]
+    part_size = max(part_size, MIN_PART_SIZE, -(-size // MAX_PARTS))
+
+    with budget.reserve(min(size, part_size)):
+        ranged = size > part_size  # An empty object can not be read with a range
+        response = source_s3.get_object(**source, **({"Range": f"bytes=0-{part_size - 1}"} if ranged else {}))
+        body = response["Body"].read()
+        size = int(response["ContentRange"].rsplit("/", 1)[1]) if ranged else response["ContentLength"]
+        extra_args = {attribute: response[attribute] for attribute in OBJECT_ATTRIBUTES if response.get(attribute)}
+
+        if size <= len(body):
+            for s3, destination in targets:
+                s3.put_object(**destination, Body=body, **extra_args)
+            return
+
+        upload_ids, first = _start_uploads(targets, extra_args, body)
+
+    source["IfMatch"] = response["ETag"]
+    part_size = max(part_size, -(-(size - len(body)) // (MAX_PARTS - 1)))  # In case the object grew
+    ranges = [
+        (number, (start, min(start + part_size, size) - 1))
+        for number, start in enumerate(range(len(body), size, part_size), start=2)
+    ]
+
+    completed = 0
+    try:
+        with futures.ThreadPoolExecutor(max_workers=min(threads, len(ranges))) as executor:
+            parts_futures = [
+                executor.submit(_stream_part, source_s3, source, targets, upload_ids, number, byte_range, budget)
+                for number, byte_range in ranges
+            ]
+            parts = [first] + [future.result() for future in parts_futures]
+
+        for (s3, destination), upload_id, target_parts in zip(targets, upload_ids, zip(*parts)):
+            s3.complete_multipart_upload(
+                **destination, UploadId=upload_id, MultipartUpload={"Parts": list(target_parts)}
+            )
+            completed += 1
+    except BaseException:
+        _abort_uploads(targets[completed:], upload_ids[completed:])
+        raise
+
+
+def _stream_keys_pairs(
+    source_bucket: str,
+    keys_pairs: Iterable[Tuple[Union[str, Path], Union[str, Path], Optional[int]]],
+    destination_bucket: str,
+    threads: Optional[int],
+    aws_auth: AwsAuth,
+    destination_aws_auth: Optional[AwsAuth],
+    part_size: int,
+    max_memory: Optional[int],
+) -> int:
+    """Stream copy pairs of source and destination keys in parallel as they are produced.
+
+    Parameters
+    ----------
+    source_bucket : str
+        S3 bucket where the objects are stored.
+
+    keys_pairs : Iterable[Tuple[Union[str, Path], Union[str, Path], Optional[int]]]
+        Source key, destination key and object size (None if unknown), it can be a generator.
+
+    destination_bucket : str
+        S3 destination bucket.
+
+    threads : Optional[int]
+        Number of parallel objects, and of parallel parts of each object.
+
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context for the source.
+
+    destination_aws_auth: Optional[AwsAuth]
+        Contains AWS credentials or an S3Context for the destination, None to use aws_auth.
+
+    part_size : int
+        Size in bytes of each part.
+
+    max_memory : Optional[int]
+        Maximum bytes of object data held in memory, None for two parts per thread.
+
+    Returns
+    -------
+    int
+        Number of copied objects.
+
+    Raises
+    ------
+    Exception
+        The first copy error is raised and no more copies are started.
+    """
+    threads = _get_threads(threads, aws_auth)
+    destination_aws_auth = aws_auth if destination_aws_auth is None else destination_aws_auth
+    budget = _MemoryBudget(2 * threads * part_size if max_memory is None else max_memory)
+
+    get_client(aws_auth, max_pool_connections=2 * threads)  # Pool large enough for all workers
+    get_client(destination_aws_auth, max_pool_connections=2 * threads)
+
+    copied = 0
+    with futures.ThreadPoolExecutor(max_workers=threads) as executor:
+        calls = (
+            (source, (
+                source_bucket, source, [(destination_bucket, destination, destination_aws_auth)], size,
+                part_size, threads, budget, aws_auth,
+            ))
+            for source, destination, size in keys_pairs
+        )
+
+        for future, _ in _submit_bounded(executor, _stream_object, calls, 2 * threads):
+            future.result()
+            copied += 1
+
+    return copied
+
+
+def stream_copy_object(
+    source_bucket: str,
+    source_key: Union[str, Path],
+    destination_bucket: str,
+    destination_key: Union[str, Path],
+    aws_auth: AwsAuth = {},
+    destination_aws_auth: Optional[AwsAuth] = None,
+    part_size: int = STREAM_PART_SIZE,
+    threads: Optional[int] = None,
+) -> None:
+    """Copy S3 object streaming its data through the client, for copies between different credentials or endpoints.
+
+    Server-side copies (copy_object) need a single set of credentials with access to both buckets on the same
+    endpoint. This function reads the source with ranged GETs and writes the destination with a multipart upload,
+    part by part, without using the local disk. The object attributes (e.g. ContentType, Metadata) are kept.
+
+    Parameters
+    ----------
+    source_bucket : str
+        S3 bucket where the object is stored.
+
+    source_key : Union[str, Path]
+        S3 key where the object is referenced.
+
+    destination_bucket : str
+        S3 destination bucket.
+
+    destination_key : Union[str, Path]
+        S3 destination key.
+
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context for the source, by default is empty.
+
+    destination_aws_auth: Optional[AwsAuth]
+        Contains AWS credentials or an S3Context for the destination, by default None (same as aws_auth).
+        Use an S3Context to set another endpoint (e.g. MinIO, Ceph).
+
+    part_size : int
+        Size in bytes of each part, by default 16 MiB (at least 5 MiB).
+
+    threads : Optional[int]
+        Number of parallel parts, by default 5 or the S3Context threads.
+
+    Examples
+    --------
+    >>> stream_copy_object(
+    ...    source_bucket='bucket',
+    ...    source_key='myFiles/song.mp3',
+    ...    destination_bucket='bucket',
+    ...    destination_key='myMusic/song.mp3',
+    ...    aws_auth={'profile_name': 'production'},
+    ...    destination_aws_auth=S3Context(endpoint_url='https://minio.local:9000'),
+    ... )
+
+    """
+    _stream_keys_pairs(
+        source_bucket, [(source_key, destination_key, None)], destination_bucket,
+        threads, aws_auth, destination_aws_auth, part_size, None,
+    )
+
+
+def stream_copy_keys(
+    source_bucket: str,
+    source_keys: Sequence[Union[str, Path]],
+    destination_bucket: str,
+    destination_keys: Sequence[Union[str, Path]],
+    threads: Optional[int] = None,
+    aws_auth: AwsAuth = {},
+    destination_aws_auth: Optional[AwsAuth] = None,
+    part_size: int = STREAM_PART_SIZE,
+    max_memory: Optional[int] = None,
+) -> None:
+    """Copy a list of S3 objects streaming their data through the client, see stream_copy_object.
+
+    Objects and the parts of each object are copied in parallel,
+    the object data held in memory at the same time is limited by max_memory.
+
+    Parameters
+    ----------
+    source_bucket : str
+        S3 bucket where the objects are stored.
+
+    source_keys : Sequence[Union[str, Path]]
+        S3 keys where the objects are referenced.
+        When it is an ObjectListing the listed sizes are used instead of a HeadObject request per key.
+
+    destination_bucket : str
+        S3 destination bucket.
+
+    destination_keys : Sequence[Union[str, Path]]
+        S3 destination keys.
+
+    threads : Optional[int]
+        Number of parallel objects, and of parallel parts of each object, by default 5 or the S3Context threads.
+
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context for the source, by default is empty.
+
+    destination_aws_auth: Optional[AwsAuth]
+        Contains AWS credentials or an S3Context for the destination, by default None (same as aws_auth).
+
+    part_size : int
+        Size in bytes of each part, by default 16 MiB (at least 5 MiB).
+
+    max_memory : Optional[int]
+        Maximum bytes of object data held in memory, by default None (two parts per thread).
+
+    Raises
+    ------
+    IndexError
+        When the source_keys and destination_keys have different length.
+
+    ValueError
+        When the keys list is empty.
+
+    Examples
+    --------
+    >>> stream_copy_keys(
+    ...     source_bucket='bucket',
+    ...     source_keys=['myFiles/song.mp3', 'myFiles/photo.jpg'],
+    ...     destination_bucket='backup',
+    ...     destination_keys=['myMusic/song.mp3', 'myPhotos/photo.jpg'],
+    ...     destination_aws_auth={'profile_name': 'backup-account'},
+    ... )
+
+    """
+    if len(source_keys) != len(destination_keys):
+        raise IndexError("Key lists must have the same length")
+
+    if len(source_keys) == 0:
+        raise ValueError("Key list length must be greater than zero")
+
+    keys_pairs = zip(source_keys, destination_keys, _known_sizes(source_keys))
+
+    _stream_keys_pairs(
+        source_bucket, keys_pairs, destination_bucket, threads, aws_auth, destination_aws_auth, part_size, max_memory
+    )
+
+
+def stream_copy_prefix(
+    source_bucket: str,
+    source_prefix: Union[str, Path],
+    destination_bucket: str,
+    change_prefix: Optional[Tuple[Union[str, Path], Union[str, Path]]] = None,
+    filter_keys: Optional[str] = None,
+    threads: Optional[int] = None,
+    aws_auth: AwsAuth = {},
+    destination_aws_auth: Optional[AwsAuth] = None,
+    part_size: int = STREAM_PART_SIZE,
+    max_memory: Optional[int] = None,
+) -> None:
+    """Copy S3 objects based on prefix filter streaming their data through the client, see stream_copy_object.
+
+    The copies start with the first listing page, using the listed sizes,
+    unless the destination keys can fall inside the source listing, then the whole prefix is listed first.
+    Objects and the parts of each object are copied in parallel,
+    the object data held in memory at the same time is limited by max_memory.
+
+    Parameters
+    ----------
+    source_bucket : str
+        S3 bucket where the objects are stored.
+
+    source_prefix : Union[str, Path]
+        S3 prefix where the objects are referenced.
+
+    destination_bucket : str
+        S3 destination bucket.
+
+    change_prefix : Tuple[Union[str, Path], Union[str, Path]], optional
+        Text to be replaced in keys prefixes, by default is None.
+        The first element is the text to be replaced, the second is the replacement text.
+
+    filter_keys : str, optional
+        Basic search string to filter out keys on result (uses Unix shell-style wildcards), by default is None.
+        For more about the search check "fnmatch" package.
+
+    threads : Optional[int]
+        Number of parallel objects, and of parallel parts of each object, by default 5 or the S3Context threads.
+
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context for the source, by default is empty.
+
+    destination_aws_auth: Optional[AwsAuth]
+        Contains AWS credentials or an S3Context for the destination, by default None (same as aws_auth).
+
+    part_size : int
+        Size in bytes of each part, by default 16 MiB (at least 5 MiB).
+
+    max_memory : Optional[int]
+        Maximum bytes of object data held in memory, by default None (two parts per thread).
+
+    Raises
+    ------
+    ValueError
+        When there are no objects to copy.
+
+    Examples
+    --------
+    >>> stream_copy_prefix(
+    ...     source_bucket='MyBucket',
+    ...     source_prefix='myFiles',
+    ...     destination_bucket='OnPremisesBucket',
+    ...     destination_aws_auth=S3Context(endpoint_url='https://ceph.local'),
+    ... )
+
+    """
+    keys_pairs = _prefix_keys_listing(
+        source_bucket, source_prefix, destination_bucket, change_prefix, filter_keys, aws_auth
+    )
+
+    copied = _stream_keys_pairs(
+        source_bucket, keys_pairs, destination_bucket, threads, aws_auth, destination_aws_auth, part_size, max_memory
+    )
+
+    if copied == 0:
+        raise ValueError("Key list length must be greater than zero")
@@ -0,0 +1,390 @@
+"""Synchronize S3 prefixes and local folders."""
+import fnmatch
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from s3_tools.client import AwsAuth
+from s3_tools.objects.copy import _copy_keys_pairs
+from s3_tools.objects.delete import _delete_objects_batched
+from s3_tools.objects.diff import diff_prefixes
+from s3_tools.objects.download import PARTIAL_SUFFIX, STATE_SUFFIX, _download_keys_to_files
+from s3_tools.objects.list import _iter_contents, _normalize_prefix
+from s3_tools.progress import ProgressCallback
+from s3_tools.transfer import TransferProfile
+
+HASH_CHUNK_SIZE = 1024 ** 2
+
+
+def sync_prefix(
+    source_bucket: str,
+    source_prefix: Union[str, Path],
+    destination_bucket: str,
+    destination_prefix: Union[str, Path],
+    delete: bool = False,
+    dry_run: bool = False,
+    threads: Optional[int] = None,
+    aws_auth: AwsAuth = {},
+) -> Dict[str, Any]:
+    """Copy only the new or changed objects of a prefix to another prefix.
+
+    Both prefixes are compared with diff_prefixes, so the memory used does not grow with the number of objects.
+    Objects missing on the destination, or with a different size or ETag, are copied.
+    In the same bucket, the objects of a prefix nested in the other one (e.g. "data" and "data_bak")
+    are not compared, so the destination is never copied into itself.
+    Multipart ETags depend on the part size, when one of the sides has it only the size is compared.
+
+    Parameters
+    ----------
+    source_bucket : str
+        S3 bucket where the objects are stored.
+
+    source_prefix : Union[str, Path]
+        S3 prefix where the objects are referenced.
+
+    destination_bucket : str
+        S3 destination bucket.
+
+    destination_prefix : Union[str, Path]
+        S3 destination prefix, the source prefix is replaced by it on the keys.
+
+    delete : bool
+        If True, objects under the destination prefix missing on the source are deleted, by default False.
+        They are deleted after the copies, the keys to be deleted are kept in memory until then.
+
+    dry_run : bool
+        If True, only counts the objects to be copied and deleted, by default False.
+
+    threads : Optional[int]
+        Number of parallel copies and delete batches, by default 5 or the S3Context threads.
+
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context, by default is empty.
+
+    Returns
+    -------
+    Dict[str, Any]
+        Number of objects "copied", "deleted" and "unchanged",
+        and the destination keys not deleted with the error "Code" and "Message" on "errors".
+
+    Raises
+    ------
+    Exception
+        The first copy error is raised and no more copies are started.
+
+    Examples
+    --------
+    >>> sync_prefix(
+    ...     source_bucket='MyBucket',
+    ...     source_prefix='myFiles',
+    ...     destination_bucket='ReplicaBucket',
+    ...     destination_prefix='myFiles',
+    ...     delete=True,
+    ... )
+    {"copied": 12, "deleted": 1, "unchanged": 123456, "errors": []}
+
+    """
+    source_prefix = _normalize_prefix(source_prefix)
+    destination_prefix = _normalize_prefix(destination_prefix)
+    source_nested = _nested_prefix(source_bucket, source_prefix, destination_bucket, destination_prefix)
+    destination_nested = _nested_prefix(destination_bucket, destination_prefix, source_bucket, source_prefix)
+
+    counts = {"copied": 0, "deleted": 0, "unchanged": 0}
+    extras: List[Dict[str, str]] = []
+
+    def keys_pairs() -> Iterator[Tuple[str, str, int]]:
+        differences = diff_prefixes(
+            source_bucket, source_prefix, destination_bucket, destination_prefix,
+            include_unchanged=True, aws_auth=aws_auth,
+        )
+        for status, key, src, dst in differences:
+            src = None if _under(src, source_nested) else src
+            dst = None if _under(dst, destination_nested) else dst
+
+            if src is None and dst is None:
+                continue
+            elif status == "unchanged" and src is not None and dst is not None:
+                counts["unchanged"] += 1
+            elif src is not None:  # Removed from or changed on the destination
+                yield src["Key"], destination_prefix + key, src["Size"]
+            elif delete:
+                extras.append({"Key": destination_prefix + key})
+
+    if dry_run:
+        counts["copied"] = sum(1 for _ in keys_pairs())
+    else:
+        counts["copied"] = _copy_keys_pairs(source_bucket, keys_pairs(), destination_bucket, threads, aws_auth)
+
+    errors: List[Dict[str, str]] = []
+    if extras and not dry_run:
+        errors = _delete_objects_batched(destination_bucket, extras, threads, aws_auth)
+    counts["deleted"] = len(extras) - len(errors)
+
+    return {**counts, "errors": errors}
+
+
+def _nested_prefix(bucket: str, prefix: str, other_bucket: str, other_prefix: str) -> Optional[str]:
+    """Get the other prefix when its objects are listed with the prefix, None otherwise.
+
+    Prefixes are listed without their trailing slash, so in the same bucket "data" also lists "data_bak/".
+    """
+    if bucket == other_bucket and other_prefix != prefix and other_prefix.startswith(prefix):
+        return other_prefix
+    return None
+
+
+def _under(obj: Optional[Dict[str, Any]], prefix: Optional[str]) -> bool:
+    """Check if a listed object is under a prefix."""
+    return obj is not None and prefix is not None and obj["Key"].startswith(prefix)
+
+
+def _load_manifest(manifest: Optional[Path]) -> Dict[str, List[Any]]:
+    """Read the manifest of a folder, relative paths with their ETag, size and modified time."""
+    if manifest is None:
+        return {}
+
+    try:
+        return json.loads(manifest.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_manifest(manifest: Path, entries: Dict[str, List[Any]]) -> None:
+    """Write the manifest atomically, a crash leaves the previous one."""
+    manifest.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = manifest.with_name(manifest.name + ".tmp")
+    temp_path.write_text(json.dumps(entries, separators=(",", ":")))
+    os.replace(temp_path, manifest)
+
+
+def _md5(path: Path) -> str:
+    """Get the MD5 of a file, as in a single part ETag."""
+    digest = hashlib.md5()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return f'"{digest.hexdigest()}"'
+
+
+def _local_unchanged(obj: Dict[str, Any], path: Path, entry: Optional[List[Any]]) -> bool:
+    """Check if a local file has the content of a listed object, reading the file only as a last resort.
+
+    Files with another size are changed. A manifest entry decides when the file was not modified since it was
+    written. Otherwise files with the object last modified time (set when they are downloaded) are unchanged,
+    and the MD5 of the file is compared with the ETag when it is not a multipart ETag ("<md5>-<parts>").
+    """
+    try:
+        stat = path.stat()
+    except OSError:
+        return False
+
+    if stat.st_size != obj["Size"]:
+        return False
+
+    if entry is not None and entry[1:] == [stat.st_size, stat.st_mtime]:
+        return entry[0] == obj["ETag"]
+
+    if stat.st_mtime == obj["LastModified"].timestamp():
+        return True
+
+    return "-" not in obj["ETag"] and _md5(path) == obj["ETag"]
+
+
+def _unchanged_entry(obj: Dict[str, Any], path: Path, dry_run: bool) -> List[Any]:
+    """Get the manifest entry of an unchanged file, giving it the object last modified time if checked by MD5."""
+    modified = obj["LastModified"].timestamp()
+    if not dry_run and "-" not in obj["ETag"] and path.stat().st_mtime != modified:
+        os.utime(path, (modified, modified))  # The next runs only compare the time
+
+    return [obj["ETag"], obj["Size"], path.stat().st_mtime]
+
+
+def _matches(key: str, search_str: Optional[str]) -> bool:
+    """Check if a key matches the search string, all keys match without one."""
+    return search_str is None or fnmatch.fnmatch(key, search_str)
+
+
+def _relative_key(prefix: str, relative: str) -> str:
+    """Get the S3 key of a path relative to the folder."""
+    return f"{prefix}/{relative}" if prefix else relative
+
+
+def _local_extras(
+    folder: Path,
+    prefix: str,
+    search_str: Optional[str],
+    listed: Set[str],
+    manifest: Optional[Path],
+) -> Iterator[Path]:
+    """Find the local files of the folder without a listed object, skipping the manifest and partial downloads."""
+    skipped = set() if manifest is None else {manifest.resolve(), manifest.resolve().with_name(manifest.name + ".tmp")}
+    for path in folder.rglob("*"):
+        relative = path.relative_to(folder).as_posix()
+        if not path.is_file() or relative in listed or path.resolve() in skipped:
+            continue
+        if path.name.endswith((PARTIAL_SUFFIX, STATE_SUFFIX, STATE_SUFFIX + ".tmp")):
+            continue
+        if _matches(_relative_key(prefix, relative), search_str):
+            yield path
+
+
+def _delete_files(paths: List[Path], dry_run: bool) -> List[Dict[str, str]]:
+    """Delete local files, returning the paths not deleted with the error instead of raising it."""
+    errors: List[Dict[str, str]] = []
+    for path in paths:
+        try:
+            if not dry_run:
+                path.unlink()
+        except OSError as error:
+            errors.append({"Path": path.as_posix(), "Message": str(error)})
+    return errors
+
+
+def sync_prefix_to_folder(
+    bucket: str,
+    prefix: Union[str, Path],
+    folder: Union[str, Path],
+    search_str: Optional[str] = None,
+    delete: bool = False,
+    dry_run: bool = False,
+    manifest: Optional[Union[str, Path]] = None,
+    threads: Optional[int] = None,
+    show_progress: bool = False,
+    aws_auth: AwsAuth = {},
+    transfer_config: Optional[TransferProfile] = None,
+    progress_callback: Optional[Union[ProgressCallback, logging.Logger]] = None,
+) -> Dict[str, Any]:
+    """Download only the new or changed objects of a prefix to a local folder.
+
+    The listing is compared with the local files as it is produced, and the changed objects are downloaded
+    while the listing goes on. A file is unchanged when it has the object size and either:
+    the object ETag on the manifest (when given, and the file was not modified since), or the object last
+    modified time, or, for single part uploads, an MD5 equal to the ETag.
+    Synced files get the object last modified time, so the next runs only compare sizes and times.
+    Multipart ETags are not an MD5 of the content, use a manifest so those files are not downloaded again
+    when their modified time is changed by something else.
+
+    Parameters
+    ----------
+    bucket: str
+        AWS S3 bucket where the objects are stored.
+
+    prefix: Union[str, Path]
+        Prefix where the objects are under, it is removed from the local paths.
+
+    folder: Union[str, Path]
+        Local folder path where files will be stored.
+
+    search_str: Optional[str]
+        Basic search string to filter out keys on result (uses Unix shell-style wildcards), by default is None.
+        Local files not matching it are neither compared nor deleted.
+
+    delete: bool
+        If True, local files under the folder without an object are deleted, by default False.
+
+    dry_run: bool
+        If True, only counts the files to be downloaded and deleted, by default False.
+
+    manifest: Optional[Union[str, Path]]
+        JSON file with the ETag, size and modified time of each synced file, written after each run,
+        by default None (no manifest).
+
+    threads: Optional[int]
+        Number of parallel downloads, by default 5 or the S3Context threads.
+
+    show_progress: bool
+        Show the progress bars of the downloads on console, by default False.
+        (Need to install extra [progress] to be used)
+
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context, by default is empty.
+
+    transfer_config: Optional[Union[str, TransferConfig]]
+        Transfer settings of each download, see download_key_to_file, by default None.
+
+    progress_callback: Optional[Union[Callable[[Dict[str, Any]], None], logging.Logger]]
+        Function called with the progress snapshots of the downloads (see TransferProgress),
+        or a logger where they are logged at INFO level, by default None.
+
+    Returns
+    -------
+    Dict[str, Any]
+        Number of files "downloaded", "deleted" and "unchanged",
+        and the keys not downloaded or local paths not deleted with the error "Message" on "errors".
+
+    Examples
+    --------
+    >>> sync_prefix_to_folder(
+    ...     bucket='myBucket',
+    ...     prefix='models',
+    ...     folder='/opt/models',
+    ...     delete=True,
+    ...     manifest='/opt/models.manifest.json',
+    ... )
+    {"downloaded": 3, "deleted": 1, "unchanged": 199996, "errors": []}
+
+    """
+    prefix = _normalize_prefix(prefix)
+    folder = Path(folder)
+    manifest = None if manifest is None else Path(manifest)
+    entries = _load_manifest(manifest)
+
+    counts = {"downloaded": 0, "deleted": 0, "unchanged": 0}
+    listed: Set[str] = set()
+    changed: Dict[str, Tuple[str, List[Any]]] = {}  # Key: relative path and manifest entry after the download
+    errors: List[Dict[str, str]] = []
+
+    def downloads() -> Iterator[Tuple[str, str, Dict[str, str], Optional[TransferProfile], int]]:
+        for obj in _iter_contents(bucket, prefix, search_str, 1000, aws_auth):
+            relative = obj["Key"][len(prefix):].lstrip("/")
+            modified = obj["LastModified"].timestamp()
+            path = folder.joinpath(relative)
+            listed.add(relative)
+
+            if not _local_unchanged(obj, path, entries.get(relative)):
+                changed[obj["Key"]] = (relative, [obj["ETag"], obj["Size"], modified])
+                yield obj["Key"], path.as_posix(), {}, transfer_config, obj["Size"]
+                continue
+
+            counts["unchanged"] += 1
+            entries[relative] = _unchanged_entry(obj, path, dry_run)
+
+    if dry_run:
+        counts["downloaded"] = sum(1 for _ in downloads())
+    else:
+        for key, filename, result in _download_keys_to_files(
+            bucket, downloads(), threads, show_progress, aws_auth, False, False, progress_callback
+        ):
+            if result is not True:
+                errors.append({"Key": str(key), "Message": str(result)})
+                continue
+            relative, entry = changed[str(key)]
+            os.utime(filename, (entry[2], entry[2]))
+            entries[relative] = entry
+            counts["downloaded"] += 1
+
+    if delete and folder.exists():
+        extras = list(_local_extras(folder, prefix, search_str, listed, manifest))
+        not_deleted = _delete_files(extras, dry_run)
+        counts["deleted"] = len(extras) - len(not_deleted)
+        errors.extend(not_deleted)
+
+    if manifest is not None and not dry_run:
+        _save_manifest(manifest, {  # Entries of other files are kept when filtered by search_str
+            relative: entry for relative, entry in entries.items()
+            if relative in listed or not _matches(_relative_key(prefix, relative), search_str)
+        })
+
+    return {**counts, "errors": errors}
@@ -1,20 +1,22 @@
 """Upload files to S3 bucket."""
+import logging
 from concurrent import futures
+from contextlib import nullcontext
 from pathlib import Path
 from typing import (
     Any,
+    Callable,
     Dict,
     List,
+    Optional,
     Tuple,
     Union,
 )
 
-import boto3
-
-from s3_tools.utils import (
-    _create_progress_bar,
-    _get_future_output,
-)
+from s3_tools.client import AwsAuth, _get_threads, get_client
+from s3_tools.progress import ProgressCallback, TransferProgress, _create_transfer_progress
+from s3_tools.transfer import TransferProfile, TransferScheduler, _get_scheduler, _get_transfer_config
+from s3_tools.utils import _get_future_output
 
 
 def upload_file_to_key(
@@ -23,8 +25,10 @@ def upload_file_to_key(
     local_filename: Union[str, Path],
     progress=None,  # type: ignore # No import if extra not installed
     task_id: int = -1,
-    aws_auth: Dict[str, str] = {},
+    aws_auth: AwsAuth = {},
     extra_args: Dict[str, Any] = {},
+    transfer_config: Optional[TransferProfile] = None,
+    callback: Optional[Callable[[int], None]] = None,
 ) -> str:
     """Upload one file from local disk and store into AWS S3 bucket.
 
@@ -45,14 +49,21 @@ def upload_file_to_key(
     task_id: int
         Task ID on the progress bar to be updated, by default -1.
 
-    aws_auth: Dict[str, str]
-        Contains AWS credentials, by default is empty.
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context, by default is empty.
 
     extra_args: Dict[str, Any]
         Extra arguments to be passed to the boto3 upload_file method, by default is empty.
         Allowed upload arguments:
         https://boto3.amazonaws.com/v1/documentation/api/latest/reference/customizations/s3.html#boto3.s3.transfer.S3Transfer.ALLOWED_UPLOAD_ARGS
 
+    transfer_config: Optional[Union[str, TransferConfig]]
+        Transfer settings, a profile name ("auto", "default", "small" or "large") or a boto3 TransferConfig,
+        by default None (the S3Context or the process default, see set_default_transfer_config).
+
+    callback: Optional[Callable[[int], None]]
+        Function called with the number of bytes uploaded, as they are uploaded, by default None.
+
     Returns
     -------
     str
@@ -68,28 +79,61 @@ def upload_file_to_key(
     http://s3.amazonaws.com/myBucket/myFiles/music.mp3
 
     """
-    session = boto3.session.Session(**aws_auth)
-    s3 = session.client("s3")
+    s3 = get_client(aws_auth)
     s3.upload_file(
         Bucket=bucket,
         Key=Path(key).as_posix(),
         Filename=Path(local_filename).as_posix(),
         ExtraArgs=extra_args,
+        Config=_get_transfer_config(transfer_config, aws_auth, lambda: Path(local_filename).stat().st_size),
+        Callback=callback,
     )
     if progress:
         progress.update(task_id, advance=1)
     return "{}/{}/{}".format(s3.meta.endpoint_url, bucket, key)
 
 
+def _file_size(path: Union[str, Path]) -> Optional[int]:
+    """Get the size of a file, None if it cannot be read (the upload reports the error)."""
+    try:
+        return Path(path).stat().st_size
+    except OSError:
+        return None
+
+
+def _upload_scheduled(
+    scheduler: TransferScheduler,
+    bucket: str,
+    key: Union[str, Path],
+    local_filename: Union[str, Path],
+    progress: Optional[TransferProgress],
+    aws_auth: AwsAuth,
+    extra_args: Dict[str, Any],
+    transfer_config: Optional[TransferProfile],
+) -> str:
+    """Upload a file with the part concurrency granted by the scheduler, see upload_file_to_key."""
+    size = Path(local_filename).stat().st_size
+    config = _get_transfer_config(transfer_config, aws_auth, lambda: size)
+
+    tracked = progress.file(Path(key).as_posix(), size) if progress else nullcontext()
+    with scheduler.transfer(size, config) as scheduled, tracked as callback:
+        return upload_file_to_key(
+            bucket, key, local_filename, aws_auth=aws_auth, extra_args=extra_args,
+            transfer_config=scheduled, callback=callback,
+        )
+
+
 def upload_files_to_keys(
     bucket: str,
     paths_keys: List[Tuple[Union[str, Path], Union[str, Path]]],
-    threads: int = 5,
+    threads: Optional[int] = None,
     show_progress: bool = False,
-    aws_auth: Dict[str, str] = {},
+    aws_auth: AwsAuth = {},
     as_paths: bool = False,
     default_extra_args: Dict[str, str] = {},
     extra_args_per_key: List[Dict[str, str]] = [],
+    transfer_config: Optional[TransferProfile] = None,
+    progress_callback: Optional[Union[ProgressCallback, logging.Logger]] = None,
 ) -> List[Tuple[Union[str, Path], Union[str, Path], Any]]:
     """Upload list of files to specific objects.
 
@@ -102,15 +146,17 @@ def upload_files_to_keys(
         List with a tuple of local path to be uploaded and S3 key destination.
         e.g. [("Local_Path", "S3_Key"), ("Local_Path", "S3_Key")]
 
-    threads : int, optional
-        Number of parallel uploads, by default 5.
+    threads : Optional[int]
+        Number of parallel uploads, by default 5 or the S3Context threads.
+        The requests of all uploads, including their parts, are limited by the TransferScheduler
+        of the S3Context or the process (see set_default_transfer_scheduler), by default to one per thread.
 
     show_progress: bool
-        Show progress bar on console, by default False.
-        (Need to install extra [progress] to be used)
+        Show the progress bars on console, by default False: bytes of all files with the throughput and
+        remaining time, and bytes of the largest files in flight. (Need to install extra [progress] to be used)
 
-    aws_auth: Dict[str, str]
-        Contains AWS credentials, by default is empty.
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context, by default is empty.
 
     as_paths: bool
         If True, the keys are returned as Path objects, otherwise as strings, by default is False.
@@ -123,6 +169,14 @@ def upload_files_to_keys(
         Extra arguments to be passed for each S3 key to the boto3 upload_file method, by default is empty.
         The default extra arguments will be merged with the extra arguments passed for each key.
 
+    transfer_config: Optional[Union[str, TransferConfig]]
+        Transfer settings of each upload, see upload_file_to_key, by default None.
+        The "auto" profile chooses them from the size of each file.
+
+    progress_callback: Optional[Union[Callable[[Dict[str, Any]], None], logging.Logger]]
+        Function called with the progress snapshots (see TransferProgress) at most every 0.5 seconds,
+        or a logger where they are logged at INFO level, by default None.
+
     Returns
     -------
     List[Tuple[Union[str, Path], Union[str, Path], Any]]
@@ -157,37 +211,41 @@ def upload_files_to_keys(
 
     extra_arguments = [{}] * len(paths_keys) if len(extra_args_per_key) == 0 else extra_args_per_key
 
-    if show_progress:
-        progress, task_id = _create_progress_bar("Uploading", len(paths_keys))
-        progress.start()
-        progress.start_task(task_id)
-    else:
-        progress, task_id = None, -1
-
-    with futures.ThreadPoolExecutor(max_workers=threads) as executor:
-        # Create a dictionary to map the future execution with the (S3 key, Local filename)
-        # dict = {future: values}
-        executions = {
-            executor.submit(
-                upload_file_to_key,
-                bucket,
-                s3_key,
-                filename,
-                progress,
-                task_id,
-                aws_auth,
-                {**default_extra_args, **extra_args},
-            ): {"s3": s3_key, "fn": filename}
-            for (filename, s3_key), extra_args in zip(paths_keys, extra_arguments)
-        }
-
-        output = [
-            (executions[future]["fn"], executions[future]["s3"], _get_future_output(future))
-            for future in futures.as_completed(executions)
-        ]
-
-    if show_progress:
-        progress.stop()
+    threads = _get_threads(threads, aws_auth)
+    scheduler = _get_scheduler(aws_auth, threads)
+    get_client(aws_auth, max_pool_connections=max(threads, scheduler.max_requests))  # Pool for all requests
+    progress = _create_transfer_progress("Uploading", show_progress, progress_callback)
+
+    try:
+        if progress:
+            for filename, _ in paths_keys:
+                progress.expect(_file_size(filename))
+
+        with futures.ThreadPoolExecutor(max_workers=threads) as executor:
+            # Create a dictionary to map the future execution with the (S3 key, Local filename)
+            # dict = {future: values}
+            executions = {
+                executor.submit(
+                    _upload_scheduled,
+                    scheduler,
+                    bucket,
+                    s3_key,
+                    filename,
+                    progress,
+                    aws_auth,
+                    {**default_extra_args, **extra_args},
+                    transfer_config,
+                ): {"s3": s3_key, "fn": filename}
+                for (filename, s3_key), extra_args in zip(paths_keys, extra_arguments)
+            }
+
+            output = [
+                (executions[future]["fn"], executions[future]["s3"], _get_future_output(future))
+                for future in futures.as_completed(executions)
+            ]
+    finally:
+        if progress:
+            progress.close()  # Also stops the console display on errors
 
     if as_paths:
         output = [(Path(key), Path(fn), result) for key, fn, result in output]
@@ -200,11 +258,13 @@ def upload_folder_to_prefix(
     prefix: Union[str, Path],
     folder: Union[str, Path],
     search_str: str = "*",
-    threads: int = 5,
+    threads: Optional[int] = None,
     show_progress: bool = False,
-    aws_auth: Dict[str, str] = {},
+    aws_auth: AwsAuth = {},
     as_paths: bool = False,
     default_extra_args: Dict[str, str] = {},
+    transfer_config: Optional[TransferProfile] = None,
+    progress_callback: Optional[Union[ProgressCallback, logging.Logger]] = None,
 ) -> List[Tuple[Union[str, Path], Union[str, Path], Any]]:
     """Upload local folder to a S3 prefix.
 
@@ -228,15 +288,15 @@ def upload_folder_to_prefix(
         A match string to select all the files to upload, by default "*".
         The string follows the rglob function pattern from the pathlib package.
 
-    threads : int, optional
-        Number of parallel uploads, by default 5
+    threads : Optional[int]
+        Number of parallel uploads, by default 5 or the S3Context threads.
 
     show_progress: bool
-        Show progress bar on console, by default False.
-        (Need to install extra [progress] to be used)
+        Show the progress bars on console, by default False: bytes of all files with the throughput and
+        remaining time, and bytes of the largest files in flight. (Need to install extra [progress] to be used)
 
-    aws_auth: Dict[str, str]
-        Contains AWS credentials, by default is empty.
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context, by default is empty.
 
     as_paths: bool
         If True, the keys are returned as Path objects, otherwise as strings, by default is False.
@@ -245,6 +305,14 @@ def upload_folder_to_prefix(
         Extra arguments to be passed to the boto3 upload_file method, by default is empty.
         The extra arguments will be applied to all S3 keys.
 
+    transfer_config: Optional[Union[str, TransferConfig]]
+        Transfer settings of each upload, see upload_file_to_key, by default None.
+        The "auto" profile chooses them from the size of each file.
+
+    progress_callback: Optional[Union[Callable[[Dict[str, Any]], None], logging.Logger]]
+        Function called with the progress snapshots (see TransferProgress) at most every 0.5 seconds,
+        or a logger where they are logged at INFO level, by default None.
+
     Returns
     -------
     List[Tuple[Union[str, Path], Union[str, Path], Any]]
@@ -275,4 +343,7 @@ def upload_folder_to_prefix(
         for p in paths
     ]
 
-    return upload_files_to_keys(bucket, paths_keys, threads, show_progress, aws_auth, as_paths, default_extra_args)
+    return upload_files_to_keys(
+        bucket, paths_keys, threads, show_progress, aws_auth, as_paths, default_extra_args,
+        transfer_config=transfer_config, progress_callback=progress_callback,
+    )
@@ -2,10 +2,10 @@
 import json
 from typing import Dict
 
-import boto3
+from s3_tools.client import AwsAuth, get_client
 
 
-def write_object_from_bytes(bucket: str, key: str, data: bytes, aws_auth: Dict[str, str] = {}) -> str:
+def write_object_from_bytes(bucket: str, key: str, data: bytes, aws_auth: AwsAuth = {}) -> str:
     """Upload a bytes object to an object into AWS S3 bucket.
 
     Parameters
@@ -19,8 +19,8 @@ def write_object_from_bytes(bucket: str, key: str, data: bytes, aws_auth: Dict[s
     data: bytes
         The object data to be uploaded to AWS S3.
 
-    aws_auth: Dict[str, str]
-        Contains AWS credentials, by default is empty.
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context, by default is empty.
 
     Returns
     -------
@@ -46,13 +46,12 @@ def write_object_from_bytes(bucket: str, key: str, data: bytes, aws_auth: Dict[s
     if not isinstance(data, bytes):
         raise TypeError("Object data must be bytes type")
 
-    session = boto3.session.Session(**aws_auth)
-    s3 = session.client("s3")
+    s3 = get_client(aws_auth)
     s3.put_object(Bucket=bucket, Key=key, Body=data)
     return "{}/{}/{}".format(s3.meta.endpoint_url, bucket, key)
 
 
-def write_object_from_text(bucket: str, key: str, data: str, aws_auth: Dict[str, str] = {}) -> str:
+def write_object_from_text(bucket: str, key: str, data: str, aws_auth: AwsAuth = {}) -> str:
     """Upload a string to an object into AWS S3 bucket.
 
     Parameters
@@ -66,8 +65,8 @@ def write_object_from_text(bucket: str, key: str, data: str, aws_auth: Dict[str,
     data: str
         The object data to be uploaded to AWS S3.
 
-    aws_auth: Dict[str, str]
-        Contains AWS credentials, by default is empty.
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context, by default is empty.
 
     Returns
     -------
@@ -96,7 +95,7 @@ def write_object_from_text(bucket: str, key: str, data: str, aws_auth: Dict[str,
     return write_object_from_bytes(bucket, key, data.encode(), aws_auth)
 
 
-def write_object_from_dict(bucket: str, key: str, data: Dict, aws_auth: Dict[str, str] = {}) -> str:
+def write_object_from_dict(bucket: str, key: str, data: Dict, aws_auth: AwsAuth = {}) -> str:
     """Upload a dictionary to an object into AWS S3 bucket.
 
     Parameters
@@ -110,8 +109,8 @@ def write_object_from_dict(bucket: str, key: str, data: Dict, aws_auth: Dict[str
     data: dict
         The object data to be uploaded to AWS S3.
 
-    aws_auth: Dict[str, str]
-        Contains AWS credentials, by default is empty.
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context, by default is empty.
 
     Returns
     -------
@@ -0,0 +1,298 @@
+"""Byte progress of the bulk transfers."""
+import itertools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Union,
+)
+
+PROGRESS_INTERVAL = 0.5
+MAX_FILE_BARS = 8
+
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
+
+def _format_bytes(size: float) -> str:
+    """Format a number of bytes with binary units (e.g. "1.5 GiB")."""
+    for unit in ["B", "KiB", "MiB", "GiB"]:
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TiB"
+
+
+def _format_eta(eta: Optional[float]) -> str:
+    """Format the remaining seconds as hours, minutes and seconds."""
+    if eta is None:
+        return "-:--:--"
+    minutes, seconds = divmod(int(eta), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
+
+
+def format_progress(snapshot: Dict[str, Any]) -> str:
+    """Format a progress snapshot as a line of text, e.g. for a logger.
+
+    Parameters
+    ----------
+    snapshot : Dict[str, Any]
+        Progress snapshot, see TransferProgress.
+
+    Returns
+    -------
+    str
+        Description, files, bytes, throughput and remaining time.
+
+    Examples
+    --------
+    >>> format_progress(snapshot)
+    'Downloading: 12/1000 files, 1.2 GiB/50.0 GiB, 85.3 MiB/s, ETA 0:09:46'
+
+    """
+    return "{}: {}/{} files, {}/{}, {}/s, ETA {}".format(
+        snapshot["description"],
+        snapshot["files"],
+        snapshot["total_files"],
+        _format_bytes(snapshot["bytes"]),
+        _format_bytes(snapshot["total_bytes"]),
+        _format_bytes(snapshot["rate"]),
+        _format_eta(snapshot["eta"]),
+    )
+
+
+class TransferProgress:
+    """Byte progress of a bulk transfer, updated by its worker threads.
+
+    The workers only add to counters under a lock, as the boto3 transfer callbacks report the transferred bytes.
+    At most every interval seconds, and when closed, a snapshot is sent to the callbacks,
+    from the worker that made the update, so rendering does not slow down the transfers at high file rates.
+
+    A snapshot is a dictionary with:
+    "description"; "files" finished and "total_files"; "bytes" transferred and "total_bytes"
+    (of the files with a known size); "rate" in bytes per second since the start; "eta" in seconds
+    (None before any byte is transferred); "elapsed" seconds; "in_flight", a list of dictionaries with the
+    "name", "bytes" and "size" of each file being transferred, largest first; and "finished".
+
+    Parameters
+    ----------
+    description : str
+        Name of the transfer, e.g. "Downloading".
+
+    callbacks : Sequence[Callable[[Dict[str, Any]], None]]
+        Functions called with each snapshot.
+
+    interval : float
+        Minimum seconds between snapshots, by default 0.5.
+
+    Examples
+    --------
+    >>> progress = TransferProgress("Downloading", [lambda snapshot: print(format_progress(snapshot))])
+    >>> progress.expect(size=1024)
+    >>> with progress.file("myData/myFile.data", 1024) as callback:
+    ...     s3.download_file("myBucket", "myData/myFile.data", "myFile.data", Callback=callback)
+    >>> progress.close()
+    Downloading: 1/1 files, 1.0 KiB/1.0 KiB, 10.2 KiB/s, ETA 0:00:00
+
+    """
+
+    def __init__(
+        self,
+        description: str,
+        callbacks: Sequence[ProgressCallback],
+        interval: float = PROGRESS_INTERVAL,
+    ):
+        self.description = description
+        self.callbacks = list(callbacks)
+        self.interval = interval
+
+        self.files = 0
+        self.total_files = 0
+        self.bytes = 0
+        self.total_bytes = 0
+
+        self._lock = threading.Lock()
+        self._tokens = itertools.count()
+        self._in_flight: Dict[int, List[Any]] = {}  # Token: name, bytes and size
+        self._started = time.monotonic()
+        self._emitted = self._started
+
+    def expect(self, size: Optional[int] = None) -> None:
+        """Add a file to the totals, with its size when known."""
+        with self._lock:
+            self.total_files += 1
+            self.total_bytes += size or 0
+
+    @contextmanager
+    def file(self, name: str, size: Optional[int], add_size: bool = False) -> Iterator[Callable[[int], None]]:
+        """Track a file while in the context, yielding the callback of its transfer.
+
+        Parameters
+        ----------
+        name : str
+            Name shown for the file, e.g. its key.
+
+        size : Optional[int]
+            Size of the file in bytes, None if unknown.
+
+        add_size : bool
+            If True, the size is added to the total bytes, for files expected without their size. By default False.
+
+        Yields
+        ------
+        Callable[[int], None]
+            Function called with the bytes transferred (negative when a retry goes back), as boto3 Callback.
+        """
+        token = next(self._tokens)
+        with self._lock:
+            if add_size:
+                self.total_bytes += size or 0
+            self._in_flight[token] = [name, 0, size]
+
+        try:
+            yield lambda amount: self._advance(token, amount)
+        finally:
+            with self._lock:
+                del self._in_flight[token]
+                self.files += 1
+            self._emit(force=False)
+
+    def _advance(self, token: int, amount: int) -> None:
+        """Add the bytes transferred of a file."""
+        with self._lock:
+            self._in_flight[token][1] += amount
+            self.bytes += amount
+        self._emit(force=False)
+
+    def snapshot(self, finished: bool = False) -> Dict[str, Any]:
+        """Get the current progress, see the class description."""
+        with self._lock:
+            elapsed = time.monotonic() - self._started
+            rate = self.bytes / elapsed if elapsed > 0 else 0.0
+            in_flight = sorted(self._in_flight.values(), key=lambda item: -(item[2] or 0))
+            return {
+                "description": self.description,
+                "files": self.files,
+                "total_files": self.total_files,
+                "bytes": self.bytes,
+                "total_bytes": self.total_bytes,
+                "rate": rate,
+                "eta": max(self.total_bytes - self.bytes, 0) / rate if rate > 0 else None,
+                "elapsed": elapsed,
+                "in_flight": [{"name": name, "bytes": done, "size": size} for name, done, size in in_flight],
+                "finished": finished,
+            }
+
+    def _emit(self, force: bool) -> None:
+        """Send a snapshot to the callbacks if the interval has passed since the last one."""
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._emitted < self.interval:
+                return
+            self._emitted = now
+
+        snapshot = self.snapshot(finished=force)
+        for callback in self.callbacks:
+            callback(snapshot)
+
+    def close(self) -> None:
+        """Send the final snapshot, with "finished" set to True."""
+        self._emit(force=True)
+
+
+class _RichProgress:
+    """Console rendering of the progress snapshots with 'rich', refreshed only when a snapshot arrives.
+
+    One bar shows the bytes of all files, with the files count, throughput and remaining time,
+    followed by a bar per file in flight (the largest ones).
+    """
+
+    def __init__(self):
+        try:
+            from rich.progress import BarColumn, DownloadColumn, Progress, TextColumn
+        except ImportError:
+            print("Missing extra dependency to use progress bar."
+                  " Please run 'pip install aws-s3-tools[progress]'.")
+            raise
+
+        self.progress = Progress(
+            TextColumn("[bold blue]{task.description}", justify="right"),
+            BarColumn(bar_width=None),
+            DownloadColumn(binary_units=True),
+            TextColumn("[bold blue]{task.fields[status]}"),
+            auto_refresh=False,
+        )
+        self.task_id = None
+        self.file_tasks: Dict[str, Any] = {}
+        self.progress.start()
+
+    def _update_files(self, in_flight: List[Dict[str, Any]]) -> None:
+        """Keep a bar for each of the largest files in flight."""
+        shown = {item["name"]: item for item in in_flight[:MAX_FILE_BARS]}
+        for name in [name for name in self.file_tasks if name not in shown]:
+            self.progress.remove_task(self.file_tasks.pop(name))
+
+        for name, item in shown.items():
+            if name not in self.file_tasks:
+                self.file_tasks[name] = self.progress.add_task(name, total=item["size"], status="")
+            self.progress.update(self.file_tasks[name], completed=item["bytes"])
+
+    def __call__(self, snapshot: Dict[str, Any]) -> None:
+        status = "{}/{} files {}/s ETA {}".format(
+            snapshot["files"], snapshot["total_files"], _format_bytes(snapshot["rate"]), _format_eta(snapshot["eta"])
+        )
+        if self.task_id is None:
+            self.task_id = self.progress.add_task(snapshot["description"], total=None, status="")
+
+        self.progress.update(
+            self.task_id, total=snapshot["total_bytes"] or None, completed=snapshot["bytes"], status=status
+        )
+        self._update_files([] if snapshot["finished"] else snapshot["in_flight"])
+        self.progress.refresh()
+
+        if snapshot["finished"]:
+            self.progress.stop()
+
+
+def _create_transfer_progress(
+    description: str,
+    show_progress: bool,
+    progress_callback: Optional[Union[ProgressCallback, logging.Logger]],
+) -> Optional[TransferProgress]:
+    """Create the progress of a bulk transfer, None when it is neither shown nor reported.
+
+    Parameters
+    ----------
+    description : str
+        Name of the transfer, e.g. "Downloading".
+
+    show_progress : bool
+        Show the progress bars on console (need to install extra [progress] to be used).
+
+    progress_callback : Optional[Union[Callable[[Dict[str, Any]], None], logging.Logger]]
+        Function called with the progress snapshots, or a logger where they are logged at INFO level.
+
+    Returns
+    -------
+    Optional[TransferProgress]
+        The progress to be updated by the transfers.
+    """
+    callbacks: List[ProgressCallback] = []
+    if show_progress:
+        callbacks.append(_RichProgress())
+
+    if isinstance(progress_callback, logging.Logger):
+        logger = progress_callback
+        callbacks.append(lambda snapshot: logger.info(format_progress(snapshot)))
+    elif progress_callback is not None:
+        callbacks.append(progress_callback)
+
+    return TransferProgress(description, callbacks) if callbacks else None
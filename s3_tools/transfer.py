@@ -0,0 +1,347 @@
+"""Transfer settings and scheduling of the managed uploads, downloads and copies."""
+import copy
+import itertools
+import os
+import threading
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    Optional,
+    Union,
+)
+
+from boto3.s3.transfer import TransferConfig
+
+from s3_tools.client import AwsAuth, S3Context
+
+AUTO_MULTIPART_THRESHOLD = 16 * 1024 ** 2
+AUTO_MIN_CHUNK_SIZE = 8 * 1024 ** 2
+AUTO_TARGET_PARTS = 512  # Larger objects get larger parts, far from the 10,000 parts limit
+AUTO_MAX_CONCURRENCY = 16
+AUTO_CONNECTION_BANDWIDTH = 80 * 1024 ** 2  # Throughput of a single S3 connection, in bytes per second
+MAX_TRANSFER_MEMORY = 1024 ** 3
+BOTO3_DEFAULTS = {"multipart_threshold": 8 * 1024 ** 2, "multipart_chunksize": 8 * 1024 ** 2, "max_concurrency": 10}
+
+TRANSFER_PROFILES: Dict[str, TransferConfig] = {
+    # boto3 defaults: 8 MiB threshold and parts, 10 threads
+    "default": TransferConfig(),
+    # Many small objects: a single request each, without starting a thread pool per transfer
+    "small": TransferConfig(multipart_threshold=64 * 1024 ** 2, use_threads=False),
+    # Large objects: fewer and larger parts, more parallel parts and larger disk writes
+    "large": TransferConfig(
+        multipart_threshold=64 * 1024 ** 2,
+        multipart_chunksize=64 * 1024 ** 2,
+        max_concurrency=AUTO_MAX_CONCURRENCY,
+        io_chunksize=1024 ** 2,
+    ),
+}
+
+TransferProfile = Union[str, TransferConfig]
+
+_default_transfer_config: Optional[TransferProfile] = None
+_default_scheduler: Optional["TransferScheduler"] = None
+
+
+def _check_profile(transfer_config: Optional[TransferProfile]) -> None:
+    """Raise ValueError for unknown profile names."""
+    if isinstance(transfer_config, str) and transfer_config != "auto" and transfer_config not in TRANSFER_PROFILES:
+        raise ValueError(
+            f"Unknown transfer profile '{transfer_config}', use 'auto', {', '.join(map(repr, TRANSFER_PROFILES))}"
+        )
+
+
+def _available_memory() -> Optional[int]:
+    """Get the available physical memory in bytes, None when the platform does not report it."""
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def auto_transfer_config(
+    size: int,
+    max_memory: Optional[int] = None,
+    bandwidth: Optional[float] = None,
+) -> TransferConfig:
+    """Choose the transfer settings for an object from its size, the available memory and the bandwidth.
+
+    Objects under 16 MiB are transferred with a single request and no thread pool.
+    Larger objects are split in about 512 parts of at least 8 MiB (rounded up to MiB),
+    transferred by up to 16 threads, limited so the parts in memory fit in max_memory,
+    and, when the bandwidth is given, to the connections needed to fill it (about 80 MiB/s each).
+
+    The bandwidth is not measured, probing it would cost a transfer per call.
+    The "auto" profile of the transfer functions sizes the parts from the object size and memory only,
+    call this function with the known bandwidth and pass its result as transfer_config to use it.
+
+    Parameters
+    ----------
+    size: int
+        Size of the object in bytes.
+
+    max_memory: Optional[int]
+        Maximum bytes of parts held in memory, by default None
+        (an eighth of the available memory, up to 1 GiB).
+
+    bandwidth: Optional[float]
+        Network bandwidth available for the transfer in bytes per second, by default None (not limited).
+
+    Returns
+    -------
+    TransferConfig
+        boto3 transfer configuration.
+
+    Examples
+    --------
+    >>> config = auto_transfer_config(50 * 1024 ** 3)
+    >>> config.multipart_chunksize, config.max_concurrency
+    (104857600, 10)
+
+    >>> config = auto_transfer_config(50 * 1024 ** 3, bandwidth=1.25 * 1024 ** 3)  # 10 Gbit/s
+    >>> upload_file_to_key("myBucket", "models/model.bin", "model.bin", transfer_config=config)
+
+    """
+    if size < AUTO_MULTIPART_THRESHOLD:
+        return TransferConfig(multipart_threshold=AUTO_MULTIPART_THRESHOLD, use_threads=False)
+
+    if max_memory is None:
+        available = _available_memory()
+        max_memory = MAX_TRANSFER_MEMORY if available is None else min(available // 8, MAX_TRANSFER_MEMORY)
+
+    chunk_size = max(AUTO_MIN_CHUNK_SIZE, -(-size // AUTO_TARGET_PARTS))
+    chunk_size = -(-chunk_size // 1024 ** 2) * 1024 ** 2
+    concurrency = max(1, min(AUTO_MAX_CONCURRENCY, -(-size // chunk_size), max_memory // chunk_size))
+    if bandwidth is not None:
+        concurrency = max(1, min(concurrency, -int(-bandwidth // AUTO_CONNECTION_BANDWIDTH)))
+
+    return TransferConfig(
+        multipart_threshold=AUTO_MULTIPART_THRESHOLD,
+        multipart_chunksize=chunk_size,
+        max_concurrency=concurrency,
+        io_chunksize=1024 ** 2,
+    )
+
+
+def set_default_transfer_config(transfer_config: Optional[TransferProfile]) -> None:
+    """Set the transfer settings used by all calls without their own, in this process.
+
+    The settings are chosen per call from, in order: the transfer_config parameter of the function,
+    the transfer_config of the S3Context passed on aws_auth, and this default.
+    When none is set the boto3 defaults are used.
+
+    Parameters
+    ----------
+    transfer_config: Optional[Union[str, TransferConfig]]
+        A profile name ("auto", "default", "small" or "large"), a boto3 TransferConfig,
+        or None to go back to the boto3 defaults.
+
+    Raises
+    ------
+    ValueError
+        When the profile name is unknown.
+
+    Examples
+    --------
+    >>> set_default_transfer_config("auto")
+
+    >>> set_default_transfer_config(TransferConfig(max_concurrency=4))
+
+    """
+    global _default_transfer_config
+
+    _check_profile(transfer_config)
+    _default_transfer_config = transfer_config
+
+
+def _get_transfer_config(
+    transfer_config: Optional[TransferProfile],
+    aws_auth: AwsAuth,
+    get_size: Callable[[], int],
+) -> Optional[TransferConfig]:
+    """Resolve the transfer settings of a call, see set_default_transfer_config.
+
+    Parameters
+    ----------
+    transfer_config: Optional[TransferProfile]
+        Transfer settings requested by the caller.
+
+    aws_auth: AwsAuth
+        Contains AWS credentials or an S3Context.
+
+    get_size: Callable[[], int]
+        Function returning the object size, only called for the "auto" profile.
+
+    Returns
+    -------
+    Optional[TransferConfig]
+        boto3 transfer configuration, None for the boto3 defaults.
+    """
+    if transfer_config is None and isinstance(aws_auth, S3Context):
+        transfer_config = aws_auth.transfer_config
+
+    if transfer_config is None:
+        transfer_config = _default_transfer_config
+
+    _check_profile(transfer_config)
+    if transfer_config == "auto":
+        return auto_transfer_config(get_size())
+
+    return TRANSFER_PROFILES[transfer_config] if isinstance(transfer_config, str) else transfer_config
+
+
+def _option(config: TransferConfig, name: str) -> Any:
+    """Get a TransferConfig option, boto3 keeps a placeholder for the options left to their default."""
+    value = getattr(config, name)
+    if name == "use_threads":
+        return value if isinstance(value, bool) else True
+
+    return value if isinstance(value, int) else BOTO3_DEFAULTS[name]
+
+
+class TransferScheduler:
+    """Shared limit of in-flight requests and bytes for the transfers of the bulk functions.
+
+    Each managed transfer runs its own pool of part threads, so N parallel files could make
+    N times max_concurrency requests at once. A scheduler gives each transfer its part concurrency
+    from a shared budget instead: objects under the multipart threshold take one request,
+    larger objects and objects of unknown size take one request plus the idle ones,
+    up to one per part and their max_concurrency. Each request also reserves a part of memory (the part size).
+    Transfers wait in arrival order for a single request, so large objects are not starved by a stream
+    of small ones, and small ones do not stall behind a large object waiting for all of its requests.
+
+    Parameters
+    ----------
+    max_requests: int
+        Maximum number of requests in flight at the same time.
+
+    max_bytes: int
+        Maximum bytes of parts held in memory at the same time, by default 1 GiB.
+
+    Examples
+    --------
+    >>> scheduler = TransferScheduler(max_requests=64)
+    >>> context = S3Context(threads=32, scheduler=scheduler)
+    >>> download_prefix_to_folder("myBucket", "models", "models", aws_auth=context)
+    >>> upload_folder_to_prefix("otherBucket", "events", "events", aws_auth=context)
+
+    """
+
+    def __init__(self, max_requests: int, max_bytes: int = MAX_TRANSFER_MEMORY):
+        self.max_requests = max_requests
+        self.max_bytes = max_bytes
+        self.requests = 0
+        self.bytes = 0
+
+        self._condition = threading.Condition()
+        self._tickets = itertools.count()
+        self._serving = 0
+
+    def _grant(self, wanted: int, part_bytes: int) -> int:
+        """Wait for the turn and room for one request, then take up to wanted requests."""
+        with self._condition:
+            ticket = next(self._tickets)
+            self._condition.wait_for(
+                lambda: self._serving == ticket
+                and self.requests < self.max_requests
+                and self.bytes + part_bytes <= self.max_bytes
+            )
+            idle = min(self.max_requests - self.requests, (self.max_bytes - self.bytes) // max(part_bytes, 1))
+            granted = max(1, min(wanted, idle))
+
+            self.requests += granted
+            self.bytes += granted * part_bytes
+            self._serving += 1
+            self._condition.notify_all()
+
+        return granted
+
+    def _release(self, requests: int, size: int) -> None:
+        """Give back the requests and bytes of a finished transfer."""
+        with self._condition:
+            self.requests -= requests
+            self.bytes -= size
+            self._condition.notify_all()
+
+    @contextmanager
+    def transfer(
+        self,
+        size: Optional[int],
+        transfer_config: Optional[TransferConfig] = None,
+        buffered: bool = True,
+    ) -> Iterator[TransferConfig]:
+        """Reserve the requests and memory of a transfer while in the context.
+
+        Parameters
+        ----------
+        size: Optional[int]
+            Size of the object in bytes, None if unknown.
+
+        transfer_config: Optional[TransferConfig]
+            Transfer settings of the object, by default None (boto3 defaults).
+
+        buffered: bool
+            If False, the parts do not pass through the client (e.g. UploadPartCopy) and no memory is reserved.
+
+        Yields
+        ------
+        TransferConfig
+            Copy of the transfer settings with max_concurrency set to the granted requests.
+        """
+        config = copy.copy(transfer_config or TransferConfig())
+        threshold = _option(config, "multipart_threshold")
+        chunk_size = _option(config, "multipart_chunksize")
+        max_concurrency = min(_option(config, "max_concurrency"), self.max_requests)
+
+        if size is None:
+            wanted = max_concurrency
+        elif not _option(config, "use_threads") or size < threshold:
+            wanted = 1
+        else:
+            wanted = min(-(-size // chunk_size), max_concurrency)
+
+        part_bytes = min(chunk_size if size is None else min(size, chunk_size), self.max_bytes) if buffered else 0
+        granted = self._grant(wanted, part_bytes)
+
+        config.max_concurrency = granted
+        config.use_threads = _option(config, "use_threads") and granted > 1
+        config.max_in_memory_upload_chunks = granted  # Memory bounded by the granted parts
+        config.max_in_memory_download_chunks = granted
+        try:
+            yield config
+        finally:
+            self._release(granted, granted * part_bytes)
+
+
+def set_default_transfer_scheduler(scheduler: Optional[TransferScheduler]) -> None:
+    """Set the scheduler shared by the bulk functions of all calls without their own, in this process.
+
+    The scheduler is chosen per call from, in order: the scheduler of the S3Context passed on aws_auth,
+    and this default. When none is set each call creates one allowing one request per thread.
+
+    Parameters
+    ----------
+    scheduler: Optional[TransferScheduler]
+        Scheduler to be shared, or None to go back to one scheduler per call.
+
+    Examples
+    --------
+    >>> set_default_transfer_scheduler(TransferScheduler(max_requests=64, max_bytes=512 * 1024 ** 2))
+
+    """
+    global _default_scheduler
+
+    _default_scheduler = scheduler
+
+
+def _get_scheduler(aws_auth: AwsAuth, threads: int) -> TransferScheduler:
+    """Get the scheduler of a bulk call, see set_default_transfer_scheduler."""
+    if isinstance(aws_auth, S3Context) and aws_auth.scheduler is not None:
+        return aws_auth.scheduler
+
+    if _default_scheduler is not None:
+        return _default_scheduler
+
+    return TransferScheduler(max_requests=threads)
@@ -1,6 +1,20 @@
 """General utilities."""
+import itertools
+import queue
+import threading
 from concurrent import futures
-from typing import Any
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 
 
 def _get_future_output(future: futures.Future) -> Any:
@@ -23,15 +37,180 @@ def _get_future_output(future: futures.Future) -> Any:
         return repr(e)
 
 
-def _create_progress_bar(description: str, length: int):
+def _submit_bounded(
+    executor: futures.Executor,
+    fn: Callable,
+    calls: Iterable[Tuple[Any, Tuple]],
+    max_pending: int,
+) -> Iterator[Tuple[futures.Future, Any]]:
+    """Submit calls to an executor lazily, keeping a bounded number of pending futures.
+
+    The calls iterable is only consumed when there is room for a new future,
+    so a streaming source (e.g. a listing) is processed while it is produced.
+
+    Parameters
+    ----------
+    executor : futures.Executor
+        Executor where the calls are submitted.
+
+    fn : Callable
+        Function to be executed.
+
+    calls : Iterable[Tuple[Any, Tuple]]
+        Pairs formed by an identifier and the positional arguments for each call.
+
+    max_pending : int
+        Maximum number of submitted but not yet yielded futures.
+
+    Yields
+    ------
+    Tuple[futures.Future, Any]
+        The finished future and the identifier of its call, in completion order.
+    """
+    pending: Dict[futures.Future, Any] = {}
+
+    for tag, args in calls:
+        if len(pending) >= max_pending:
+            done, _ = futures.wait(pending, return_when=futures.FIRST_COMPLETED)
+            for future in done:
+                yield future, pending.pop(future)
+
+        pending[executor.submit(fn, *args)] = tag
+
+    for future in futures.as_completed(pending):
+        yield future, pending[future]
+
+
+def _chunked(iterable: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Split an iterable in lists of a given size, the last one may be smaller.
+
+    Parameters
+    ----------
+    iterable : Iterable[Any]
+        Items to be split, it can be a generator.
+
+    size : int
+        Number of items of each chunk.
+
+    Yields
+    ------
+    List[Any]
+        Chunks of consecutive items.
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+_PREFETCH_DONE = object()
+
+
+def _put_until_stopped(buffer: queue.Queue, item: Any, stop: threading.Event) -> bool:
+    """Put an item on a bounded queue, giving up when the stop event is set."""
+    while not stop.is_set():
+        try:
+            buffer.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _produce(iterable: Iterable[Any], buffer: queue.Queue, stop: threading.Event) -> None:
+    """Put the items of an iterable on a queue, followed by the end marker and the error raised if any."""
+    try:
+        for item in iterable:
+            if not _put_until_stopped(buffer, (item, None), stop):
+                return
+    except BaseException as error:
+        _put_until_stopped(buffer, (_PREFETCH_DONE, error), stop)
+        return
+
+    _put_until_stopped(buffer, (_PREFETCH_DONE, None), stop)
+
+
+def _prefetch(iterable: Iterable[Any], max_items: int) -> Generator[Any, None, None]:
+    """Consume an iterable on a background thread, buffering up to max_items ahead of the caller.
+
+    It lets a slow producer (e.g. a paginated listing) keep running while the caller is busy,
+    with bounded memory. Errors of the producer are raised on the caller.
+    The producer stops when the caller stops iterating.
+
+    Parameters
+    ----------
+    iterable : Iterable[Any]
+        Items to be produced, it can be a generator.
+
+    max_items : int
+        Maximum number of items produced but not yet consumed.
+
+    Yields
+    ------
+    Any
+        The items of the iterable, in order.
+    """
+    buffer: queue.Queue = queue.Queue(maxsize=max_items)
+    stop = threading.Event()
+
+    thread = threading.Thread(target=_produce, args=(iterable, buffer, stop), daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, error = buffer.get()
+            if error is not None:
+                raise error
+            if item is _PREFETCH_DONE:
+                return
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+class _MemoryBudget:
+    """Limit the bytes held in memory by concurrent workers.
+
+    Parameters
+    ----------
+    limit : int
+        Maximum number of bytes reserved at the same time.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.used = 0
+        self._condition = threading.Condition()
+
+    @contextmanager
+    def reserve(self, size: int) -> Iterator[None]:
+        """Wait until there is room for size bytes and hold them while in the context.
+
+        A reservation larger than the limit takes the whole budget.
+        """
+        size = min(size, self.limit)
+        with self._condition:
+            self._condition.wait_for(lambda: self.used + size <= self.limit)
+            self.used += size
+        try:
+            yield
+        finally:
+            with self._condition:
+                self.used -= size
+                self._condition.notify_all()
+
+
+def _create_progress_bar(description: str, length: Optional[int]):
     """Create a console progress bar using 'rich' package.
 
     Parameters
     ----------
     description : str
         Progress bar description.
-    length : int
-        Progress bar length.
+    length : Optional[int]
+        Progress bar length, None when unknown (it can be updated later).
 
     Returns
     -------
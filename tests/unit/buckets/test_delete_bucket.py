@@ -1,10 +1,13 @@
 """Unit tests for create bucket."""
 import pytest
-from botocore.exceptions import ParamValidationError
+from botocore.exceptions import ClientError, ParamValidationError
 from s3_tools import (
+    bucket_exists,
     create_bucket,
     delete_bucket,
+    get_client,
 )
+from s3_tools.objects import delete
 from tests.unit.conftest import BUCKET_NAME
 
 
@@ -26,3 +29,58 @@ class TestDelete:
         response = delete_bucket(BUCKET_NAME)
 
         assert response is False
+
+    def test_delete_non_empty_bucket(self, s3_client):
+        s3_client.create_bucket(Bucket=BUCKET_NAME)
+        s3_client.put_object(Bucket=BUCKET_NAME, Key="prefix/object", Body=b"data")
+
+        with pytest.raises(ClientError):
+            delete_bucket(BUCKET_NAME)
+
+        response = delete_bucket(BUCKET_NAME, force=True)
+
+        assert response is True
+        assert not bucket_exists(BUCKET_NAME)
+
+    @pytest.mark.parametrize("show_progress", [False, True])
+    def test_force_delete_bucket(self, s3_client, monkeypatch, show_progress):
+        monkeypatch.setattr(delete, "DELETE_BATCH_SIZE", 3)
+        s3_client.create_bucket(Bucket=BUCKET_NAME)
+        s3_client.put_bucket_versioning(Bucket=BUCKET_NAME, VersioningConfiguration={"Status": "Enabled"})
+        for i in range(5):
+            s3_client.put_object(Bucket=BUCKET_NAME, Key=f"prefix/object_{i}", Body=b"a")
+            s3_client.put_object(Bucket=BUCKET_NAME, Key=f"prefix/object_{i}", Body=b"b")
+        s3_client.delete_object(Bucket=BUCKET_NAME, Key="prefix/object_0")
+        s3_client.create_multipart_upload(Bucket=BUCKET_NAME, Key="prefix/multipart")
+
+        response = delete_bucket(BUCKET_NAME, force=True, threads=2, show_progress=show_progress)
+
+        assert response is True
+        assert not bucket_exists(BUCKET_NAME)
+
+    def test_force_delete_reports_objects_not_deleted(self, s3_client):
+        def deny(params, **kwargs):
+            raise ClientError({"Error": {"Code": "AccessDenied", "Message": "Denied"}}, "DeleteObjects")
+
+        s3_client.create_bucket(Bucket=BUCKET_NAME)
+        for i in range(2):
+            s3_client.put_object(Bucket=BUCKET_NAME, Key=f"prefix/object_{i}", Body=b"data")
+
+        get_client().meta.events.register("provide-client-params.s3.DeleteObjects", deny, unique_id="test-deny")
+        try:
+            with pytest.raises(ClientError) as error:
+                delete_bucket(BUCKET_NAME, force=True)
+        finally:
+            get_client().meta.events.unregister("provide-client-params.s3.DeleteObjects", unique_id="test-deny")
+
+        exists = bucket_exists(BUCKET_NAME)
+        delete_bucket(BUCKET_NAME, force=True)
+
+        assert error.value.response["Error"]["Code"] == "AccessDenied"
+        assert sorted(e["Key"] for e in error.value.response["Errors"]) == ["prefix/object_0", "prefix/object_1"]
+        assert exists is True
+
+    def test_force_delete_nonexisting_bucket(self, s3_client):
+        response = delete_bucket(BUCKET_NAME, force=True)
+
+        assert response is False
@@ -65,6 +65,22 @@ def create_bucket(s3_client, bucket, key=None, data=None, keys_paths=[]):
     s3_client.delete_bucket(Bucket=bucket)
 
 
+@contextmanager
+def create_many_keys(s3_client, bucket, keys):
+    s3_client.create_bucket(Bucket=bucket)
+    for key in keys:
+        s3_client.put_object(Bucket=bucket, Key=key, Body=b"")
+
+    yield
+
+    for page in s3_client.get_paginator("list_objects_v2").paginate(Bucket=bucket):
+        if "Contents" in page:
+            objects = [{"Key": obj["Key"]} for obj in page["Contents"]]
+            s3_client.delete_objects(Bucket=bucket, Delete={"Objects": objects})
+
+    s3_client.delete_bucket(Bucket=bucket)
+
+
 def create_files(as_path: bool = False) -> List[Union[str, Path]]:
     """Create folder structure.
 
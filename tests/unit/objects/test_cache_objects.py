@@ -0,0 +1,207 @@
+"""Unit tests for cache module."""
+import sqlite3
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    List,
+)
+
+from s3_tools import (
+    ListingCache,
+    get_client,
+    iter_objects,
+    list_objects,
+    list_objects_columnar,
+)
+from s3_tools.objects import cache as cache_module
+from tests.unit.conftest import BUCKET_NAME, FILENAME, create_bucket
+
+
+class TestListingCache:
+
+    def test_miss_then_hit(self, s3_client, tmp_path):
+        lst = [(f"prefix/mock_{i}.csv", FILENAME) for i in range(5)]
+        cache = ListingCache(tmp_path.joinpath("cache.sqlite"))
+
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=lst):
+            first = list_objects(BUCKET_NAME, "prefix", cache=cache)
+            s3_client.delete_object(Bucket=BUCKET_NAME, Key="prefix/mock_0.csv")
+            second = list_objects(BUCKET_NAME, "prefix", cache=cache)
+
+        assert first == second == [key for key, _ in lst]
+        assert (cache.hits, cache.misses, cache.refreshes) == (1, 1, 0)
+
+    def test_pagination(self, s3_client, tmp_path):
+        lst = [(f"prefix/mock_{i:02}.csv", FILENAME) for i in range(12)]
+        cache = ListingCache(tmp_path.joinpath("cache.sqlite"))
+
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=lst):
+            first = list_objects(BUCKET_NAME, "prefix", max_keys=5, cache=cache)
+            second = list_objects(BUCKET_NAME, "prefix", max_keys=5, cache=cache)
+
+        assert first == second == [key for key, _ in lst]
+
+    def test_expired_listing(self, s3_client, tmp_path):
+        lst = [(f"prefix/mock_{i}.csv", FILENAME) for i in range(3)]
+        cache = ListingCache(tmp_path.joinpath("cache.sqlite"), ttl=0)
+
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=lst):
+            list_objects(BUCKET_NAME, "prefix", cache=cache)
+            s3_client.delete_object(Bucket=BUCKET_NAME, Key="prefix/mock_0.csv")
+            keys = list_objects(BUCKET_NAME, "prefix", cache=cache)
+
+        assert keys == ["prefix/mock_1.csv", "prefix/mock_2.csv"]
+        assert cache.misses == 2
+
+    def test_append_only_refresh(self, s3_client, tmp_path):
+        lst = [(f"prefix/mock_{i}.csv", FILENAME) for i in range(3)]
+        cache = ListingCache(tmp_path.joinpath("cache.sqlite"), ttl=0, append_only=True)
+        requests: List[Dict[str, Any]] = []
+
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=lst):
+            list_objects(BUCKET_NAME, "prefix", cache=cache)
+            s3_client.upload_file(Bucket=BUCKET_NAME, Key="prefix/mock_3.csv", Filename=FILENAME)
+
+            get_client().meta.events.register(
+                "provide-client-params.s3.ListObjectsV2",
+                lambda params, **kwargs: requests.append(dict(params)),
+                unique_id="test-append-only-refresh",
+            )
+            try:
+                keys = list_objects(BUCKET_NAME, "prefix", cache=cache)
+            finally:
+                get_client().meta.events.unregister(
+                    "provide-client-params.s3.ListObjectsV2", unique_id="test-append-only-refresh"
+                )
+
+        assert keys == [f"prefix/mock_{i}.csv" for i in range(4)]
+        assert (cache.misses, cache.refreshes) == (1, 1)
+        assert [r.get("StartAfter") for r in requests] == ["prefix/mock_2.csv"]
+
+    def test_read_while_other_process_lists(self, s3_client, tmp_path, monkeypatch):
+        lst = [(f"prefix/mock_{i}.csv", FILENAME) for i in range(3)]
+        path = tmp_path.joinpath("cache.sqlite")
+        cache, other = ListingCache(path), ListingCache(path, ttl=0)
+        read = cache._read
+
+        def read_after_switch(*args):
+            list_objects(BUCKET_NAME, "prefix", cache=other)  # Switches the generation, dropping the one read
+            return read(*args)
+
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=lst):
+            list_objects(BUCKET_NAME, "prefix", cache=cache)
+            s3_client.delete_object(Bucket=BUCKET_NAME, Key="prefix/mock_0.csv")
+            monkeypatch.setattr(cache, "_read", read_after_switch)
+            keys = list_objects(BUCKET_NAME, "prefix", cache=cache)
+
+        assert keys == [key for key, _ in lst]
+        assert (cache.hits, other.misses) == (1, 1)
+
+    def test_refresh_while_other_process_lists(self, s3_client, tmp_path, monkeypatch):
+        lst = [(f"prefix/mock_{i}.csv", FILENAME) for i in range(3)]
+        path = tmp_path.joinpath("cache.sqlite")
+        cache, other = ListingCache(path, ttl=0, append_only=True), ListingCache(path, ttl=0)
+        iter_contents = cache_module._iter_contents
+
+        def iter_contents_after_switch(*args, **kwargs):
+            if kwargs.get("start_after") is not None:
+                list_objects(BUCKET_NAME, "prefix", cache=other)  # Switches the generation being refreshed
+            return iter_contents(*args, **kwargs)
+
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=lst):
+            list_objects(BUCKET_NAME, "prefix", cache=cache)
+            s3_client.upload_file(Bucket=BUCKET_NAME, Key="prefix/mock_3.csv", Filename=FILENAME)
+            monkeypatch.setattr(cache_module, "_iter_contents", iter_contents_after_switch)
+            keys = list_objects(BUCKET_NAME, "prefix", cache=cache)
+
+        conn = sqlite3.connect(path)
+        try:
+            orphans = conn.execute(
+                "SELECT COUNT(*) FROM objects WHERE generation NOT IN (SELECT generation FROM listings)"
+            ).fetchone()[0]
+        finally:
+            conn.close()
+
+        assert keys == [f"prefix/mock_{i}.csv" for i in range(4)]
+        assert orphans == 0
+
+    def test_search_str_on_cached_listing(self, s3_client, tmp_path):
+        lst = [(f"prefix/{name}", FILENAME) for name in ["a.csv", "b.json", "c.csv"]]
+        cache = ListingCache(tmp_path.joinpath("cache.sqlite"))
+
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=lst):
+            all_keys = list_objects(BUCKET_NAME, "prefix", cache=cache)
+            csv_keys = list_objects(BUCKET_NAME, "prefix", search_str="*.csv", cache=cache)
+
+        assert all_keys == [key for key, _ in lst]
+        assert csv_keys == ["prefix/a.csv", "prefix/c.csv"]
+        assert cache.hits == 1
+
+    def test_metadata_from_cache(self, s3_client, tmp_path):
+        lst = [("prefix/mock.csv", FILENAME)]
+        cache = ListingCache(tmp_path.joinpath("cache.sqlite"))
+
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=lst):
+            expected = next(iter_objects(BUCKET_NAME, "prefix", with_metadata=True))
+            list_objects(BUCKET_NAME, "prefix", cache=cache)
+            cached = next(iter_objects(BUCKET_NAME, "prefix", with_metadata=True, cache=cache))
+            listing = list_objects_columnar(BUCKET_NAME, "prefix", cache=cache)
+
+        for field in ["Key", "Size", "ETag", "LastModified"]:
+            assert cached[field] == expected[field]
+        assert listing.total_size == Path(FILENAME).stat().st_size
+
+    def test_stats_shared(self, s3_client, tmp_path):
+        lst = [("prefix/mock.csv", FILENAME)]
+        path = tmp_path.joinpath("cache.sqlite")
+
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=lst):
+            list_objects(BUCKET_NAME, "prefix", cache=ListingCache(path))
+            list_objects(BUCKET_NAME, "prefix", cache=ListingCache(path))
+
+        assert ListingCache(path).stats() == {"hits": 1, "misses": 1, "refreshes": 0}
+
+    def test_invalidate(self, s3_client, tmp_path):
+        lst = [("prefix/mock.csv", FILENAME), ("other/mock.csv", FILENAME)]
+        cache = ListingCache(tmp_path.joinpath("cache.sqlite"))
+
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=lst):
+            list_objects(BUCKET_NAME, "prefix", cache=cache)
+            list_objects(BUCKET_NAME, "other", cache=cache)
+            cache.invalidate(BUCKET_NAME, "prefix")
+            list_objects(BUCKET_NAME, "prefix", cache=cache)
+            list_objects(BUCKET_NAME, "other", cache=cache)
+            cache.invalidate()
+            list_objects(BUCKET_NAME, "other", cache=cache)
+
+        assert (cache.hits, cache.misses) == (1, 4)
+
+    def test_stopped_listing_not_stored(self, s3_client, tmp_path):
+        lst = [(f"prefix/mock_{i:02}.csv", FILENAME) for i in range(12)]
+        cache = ListingCache(tmp_path.joinpath("cache.sqlite"))
+
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=lst):
+            objects = iter_objects(BUCKET_NAME, "prefix", max_keys=5, cache=cache)
+            first = [next(objects) for _ in range(7)]
+            del objects  # Closes the listing generator
+
+            conn = sqlite3.connect(cache.path)
+            try:
+                stored = conn.execute("SELECT COUNT(*) FROM objects").fetchone()[0]
+            finally:
+                conn.close()
+
+            keys = list_objects(BUCKET_NAME, "prefix", cache=cache)
+
+        assert len(first) == 7 and stored == 0
+        assert keys == [key for key, _ in lst]
+        assert (cache.hits, cache.misses) == (0, 2)
+
+    def test_default_path(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+        cache = ListingCache()
+
+        assert cache.path == tmp_path.joinpath("s3_tools", "listings.sqlite")
+        assert cache.path.exists()
@@ -0,0 +1,143 @@
+"""Unit tests for concat module."""
+from typing import (
+    Dict,
+    List,
+    Tuple,
+)
+
+import pytest
+from s3_tools import (
+    compact_prefix,
+    concat_objects,
+    list_objects,
+    list_objects_columnar,
+)
+from s3_tools.objects.concat import _plan_parts
+from s3_tools.objects.copy import MIN_PART_SIZE
+from tests.unit.conftest import BUCKET_NAME, create_bucket
+from tests.unit.objects.test_copy_objects import count_requests
+
+MiB = 1024 ** 2
+
+
+def put_objects(s3_client, objects):
+    for key, body in objects:
+        s3_client.put_object(Bucket=BUCKET_NAME, Key=key, Body=body)
+    return b"".join(body for _, body in objects)
+
+
+class TestPlanParts:
+
+    @pytest.mark.parametrize("sizes", [
+        [10, 20, 30],
+        [6 * MiB, 10, 6 * MiB],
+        [10, 6 * MiB, 10],
+        [10, 7 * MiB, 10 * MiB, 3 * MiB],
+        [4 * MiB, 4 * MiB, 12 * MiB],
+        [0, 5 * MiB, 0],
+    ])
+    def test_plan_parts(self, sizes):
+        objects = [(f"object_{i}", size) for i, size in enumerate(sizes)]
+
+        parts = _plan_parts(objects, MIN_PART_SIZE)
+
+        segments = [segment for _, part in parts for segment in part]
+        part_sizes = [sum(end - start + 1 for _, start, end in part) for _, part in parts]
+        copied: Dict[str, List[Tuple[int, int]]] = {key: [] for key, _ in objects}
+        for key, start, end in segments:
+            copied[key].append((start, end))
+
+        assert all(size >= MIN_PART_SIZE for size in part_sizes[:-1])
+        assert [key for key, _, _ in segments] == sorted(key for key, _, _ in segments)
+        for key, size in objects:
+            ranges = copied[key]
+            assert sum(end - start + 1 for start, end in ranges) == size
+            assert all(low[1] + 1 == high[0] for low, high in zip(ranges, ranges[1:]))
+
+    def test_plan_parts_copies_large_objects(self):
+        parts = _plan_parts([("small", 10), ("large", 20 * MiB), ("other", 10)], MIN_PART_SIZE)
+
+        assert [kind for kind, _ in parts] == ["upload", "copy", "copy", "copy", "upload"]
+        assert parts[0][1] == [("small", 0, 9), ("large", 0, MIN_PART_SIZE - 11)]
+
+    def test_plan_parts_too_many(self):
+        with pytest.raises(ValueError):
+            _plan_parts([(f"object_{i}", MIN_PART_SIZE) for i in range(10_001)], MIN_PART_SIZE)
+
+
+class TestConcat:
+
+    def test_concat_small_objects(self, s3_client):
+        objects = [(f"prefix/object_{i}.json", f'{{"id": {i}}}\n'.encode()) for i in range(10)]
+        with create_bucket(s3_client, BUCKET_NAME):
+            expected = put_objects(s3_client, objects)
+
+            with count_requests(["PutObject", "CreateMultipartUpload"]) as counts:
+                concat_objects(BUCKET_NAME, [key for key, _ in objects], "all.json")
+
+            result = s3_client.get_object(Bucket=BUCKET_NAME, Key="all.json")["Body"].read()
+
+        assert counts == {"PutObject": 1, "CreateMultipartUpload": 0}
+        assert result == expected
+
+    def test_concat_mixed_objects(self, s3_client):
+        objects = [
+            ("prefix/a", b"a" * 100),
+            ("prefix/b", bytes(range(256)) * (7 * MiB // 256)),
+            ("prefix/c", b"c" * 100),
+            ("prefix/d", b"d" * 6 * MiB),
+            ("prefix/e", b"e" * 10),
+        ]
+        with create_bucket(s3_client, BUCKET_NAME), create_bucket(s3_client, "another-bucket"):
+            expected = put_objects(s3_client, objects)
+            listing = list_objects_columnar(BUCKET_NAME, "prefix")
+
+            with count_requests(["HeadObject", "UploadPartCopy", "AbortMultipartUpload"]) as counts:
+                concat_objects(BUCKET_NAME, listing, "all", destination_bucket="another-bucket", threads=2)
+
+            result = s3_client.get_object(Bucket="another-bucket", Key="all")["Body"].read()
+
+        assert counts == {"HeadObject": 0, "UploadPartCopy": 1, "AbortMultipartUpload": 0}
+        assert result == expected
+
+    def test_concat_without_sizes(self, s3_client):
+        objects = [("prefix/a", b"a" * 10), ("prefix/b", b"b" * 20)]
+        with create_bucket(s3_client, BUCKET_NAME):
+            expected = put_objects(s3_client, objects)
+
+            with count_requests(["HeadObject"]) as counts:
+                concat_objects(BUCKET_NAME, ["prefix/a", "prefix/b"], "all")
+
+            result = s3_client.get_object(Bucket=BUCKET_NAME, Key="all")["Body"].read()
+
+        assert counts == {"HeadObject": 2}
+        assert result == expected
+
+    def test_concat_empty_keys(self):
+        with pytest.raises(ValueError):
+            concat_objects(BUCKET_NAME, [], "all")
+
+
+class TestCompact:
+
+    def test_compact_prefix(self, s3_client):
+        objects = [(f"prefix/object_{i}.json", b"x" * 40) for i in range(5)]
+        with create_bucket(s3_client, BUCKET_NAME):
+            put_objects(s3_client, objects)
+
+            result = compact_prefix(BUCKET_NAME, "prefix", "compacted", target_size=80, suffix=".json")
+
+            keys = list_objects(BUCKET_NAME, "compacted")
+            last = s3_client.get_object(Bucket=BUCKET_NAME, Key="compacted/part-00002.json")["Body"].read()
+
+        assert result == {
+            "compacted/part-00000.json": ["prefix/object_0.json", "prefix/object_1.json"],
+            "compacted/part-00001.json": ["prefix/object_2.json", "prefix/object_3.json"],
+            "compacted/part-00002.json": ["prefix/object_4.json"],
+        }
+        assert keys == list(result)
+        assert last == b"x" * 40
+
+    def test_compact_empty_prefix(self, s3_client):
+        with create_bucket(s3_client, BUCKET_NAME):
+            assert compact_prefix(BUCKET_NAME, "prefix", "compacted") == {}
@@ -1,4 +1,5 @@
 """Unit tests for copy module."""
+from contextlib import contextmanager
 from pathlib import Path
 
 import pytest
@@ -7,10 +8,29 @@ from s3_tools import (
     copy_keys,
     copy_object,
     copy_prefix,
+    get_client,
+    iter_copy_prefix,
     list_objects,
+    list_objects_columnar,
     object_exists,
 )
-from tests.unit.conftest import BUCKET_NAME, FILENAME, create_bucket
+from s3_tools.objects import copy
+from tests.unit.conftest import BUCKET_NAME, FILENAME, create_bucket, create_many_keys
+
+
+@contextmanager
+def count_requests(operations):
+    counts = {operation: 0 for operation in operations}
+
+    def count(model, **kwargs):
+        if model.name in counts:
+            counts[model.name] += 1
+
+    get_client().meta.events.register("before-call.s3", count, unique_id="test-count-requests")
+    try:
+        yield counts
+    finally:
+        get_client().meta.events.unregister("before-call.s3", unique_id="test-count-requests")
 
 
 class TestCopy:
@@ -171,3 +191,131 @@ class TestCopy:
 
             assert all(source_before) is True and all(source_after) is True
             assert len(dest_before) == 0 and len(dest_after_old_prefix) == 0 and len(dest_after_new_prefix) == 4
+
+    def test_iter_copy_prefix(self, s3_client):
+        keys_paths = [(f"prefix/object_{i:03}", FILENAME) for i in range(25)]
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=keys_paths), \
+                create_bucket(s3_client, self.destination_bucket):
+
+            results = list(iter_copy_prefix(
+                BUCKET_NAME, "prefix", self.destination_bucket, ("prefix", "files"), threads=3
+            ))
+            dest_after = list_objects(self.destination_bucket, prefix="files")
+
+        assert sorted(results) == [
+            (key, key.replace("prefix", "files"), True) for key, _ in keys_paths
+        ]
+        assert dest_after == [key.replace("prefix", "files") for key, _ in keys_paths]
+
+    def test_iter_copy_prefix_reports_errors(self, s3_client):
+        keys_paths = [(key, FILENAME) for key in self.source_keys]
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=keys_paths):
+            results = list(iter_copy_prefix(BUCKET_NAME, "prefix", self.destination_bucket))
+
+        assert sorted(source for source, _, _ in results) == self.source_keys
+        assert all("NoSuchBucket" in result for _, _, result in results)
+
+    def test_iter_copy_prefix_empty(self, s3_client):
+        with create_bucket(s3_client, BUCKET_NAME):
+            results = list(iter_copy_prefix(BUCKET_NAME, "prefix", BUCKET_NAME))
+
+        assert results == []
+
+    @pytest.mark.parametrize("copy_function", [copy_prefix, iter_copy_prefix])
+    def test_copy_prefix_to_sibling_prefix(self, s3_client, copy_function):
+        keys = [f"data/object_{i:04}" for i in range(2500)]
+        with create_many_keys(s3_client, BUCKET_NAME, keys):
+            result = copy_function(BUCKET_NAME, "data", BUCKET_NAME, ("data", "data_bak"), threads=10)
+            if result is not None:
+                assert all(copied is True for _, _, copied in result)
+
+            copies = list_objects(BUCKET_NAME, "data_bak")
+
+        assert copies == [key.replace("data", "data_bak") for key in keys]
+
+
+class TestSizedCopy:
+
+    destination_bucket = "another-bucket"
+
+    def test_copy_object_limit(self, s3_client, monkeypatch):
+        copied_in_parts = []
+        monkeypatch.setattr(copy, "_copy_object_parts", lambda *args: copied_in_parts.append(args[3]))
+
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=[("prefix/object", FILENAME)]), \
+                count_requests(["CopyObject"]) as counts:
+            copy._copy_object_sized(
+                BUCKET_NAME, "prefix/object", BUCKET_NAME, "copy/object", 6 * 1024 ** 3,
+                multipart_threshold=10 * 1024 ** 3, part_size=1024 ** 3, threads=2, aws_auth={},
+            )
+
+        assert copied_in_parts == ["copy/object"]
+        assert counts == {"CopyObject": 0}
+
+    def test_copy_prefix_without_head_requests(self, s3_client):
+        keys_paths = [(f"prefix/object_{i}", FILENAME) for i in range(5)]
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=keys_paths), \
+                create_bucket(s3_client, self.destination_bucket):
+
+            with count_requests(["HeadObject", "CopyObject"]) as counts:
+                copy_prefix(BUCKET_NAME, "prefix", self.destination_bucket)
+
+            dest_after = list_objects(self.destination_bucket)
+
+        assert counts == {"HeadObject": 0, "CopyObject": 5}
+        assert dest_after == [key for key, _ in keys_paths]
+
+    def test_copy_keys_with_listing_sizes(self, s3_client):
+        keys_paths = [(f"prefix/object_{i}", FILENAME) for i in range(3)]
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=keys_paths):
+            listing = list_objects_columnar(BUCKET_NAME, "prefix")
+
+            with count_requests(["HeadObject", "CopyObject"]) as counts:
+                copy_keys(BUCKET_NAME, listing, BUCKET_NAME, [key.replace("prefix", "copy") for key in listing])
+
+            dest_after = list_objects(BUCKET_NAME, "copy")
+
+        assert counts == {"HeadObject": 0, "CopyObject": 3}
+        assert dest_after == [f"copy/object_{i}" for i in range(3)]
+
+    @pytest.mark.parametrize("copy_function", [copy_prefix, iter_copy_prefix])
+    def test_copy_in_parts(self, s3_client, copy_function):
+        data = bytes(range(256)) * (11 * 1024 ** 2 // 256 + 1)
+        with create_bucket(s3_client, BUCKET_NAME), create_bucket(s3_client, self.destination_bucket):
+            s3_client.put_object(
+                Bucket=BUCKET_NAME, Key="prefix/large", Body=data, ContentType="text/csv", Metadata={"owner": "me"}
+            )
+
+            with count_requests(["HeadObject", "CopyObject", "UploadPartCopy"]) as counts:
+                result = copy_function(
+                    BUCKET_NAME, "prefix", self.destination_bucket,
+                    multipart_threshold=5 * 1024 ** 2, part_size=5 * 1024 ** 2,
+                )
+                if result is not None:
+                    assert list(result) == [("prefix/large", "prefix/large", True)]
+
+            response = s3_client.get_object(Bucket=self.destination_bucket, Key="prefix/large")
+            copied = response["Body"].read()
+
+        assert counts == {"HeadObject": 1, "CopyObject": 0, "UploadPartCopy": 3}
+        assert copied == data
+        assert (response["ContentType"], response["Metadata"]) == ("text/csv", {"owner": "me"})
+
+    def test_copy_in_parts_pinned_to_version(self, s3_client):
+        with create_bucket(s3_client, BUCKET_NAME, key="prefix/large", data=b"x" * 11 * 1024 ** 2):
+            etag = s3_client.head_object(Bucket=BUCKET_NAME, Key="prefix/large")["ETag"]
+            if_match = []
+            get_client().meta.events.register(
+                "provide-client-params.s3.UploadPartCopy",
+                lambda params, **kwargs: if_match.append(params.get("CopySourceIfMatch")),
+                unique_id="test-if",
+            )
+            try:
+                copy_prefix(
+                    BUCKET_NAME, "prefix", BUCKET_NAME, ("prefix", "copy"),
+                    multipart_threshold=5 * 1024 ** 2, part_size=5 * 1024 ** 2,
+                )
+            finally:
+                get_client().meta.events.unregister("provide-client-params.s3.UploadPartCopy", unique_id="test-if")
+
+        assert if_match == [etag] * 3
@@ -1,9 +1,19 @@
 """Unit tests for delete module."""
+from contextlib import contextmanager
 from pathlib import Path
 
 import pytest
 from botocore.exceptions import ClientError
-from s3_tools import delete_keys, delete_object, delete_prefix, object_exists
+from s3_tools import (
+    delete_keys,
+    delete_object,
+    delete_prefix,
+    get_client,
+    list_objects,
+    object_exists,
+    purge_prefix,
+)
+from s3_tools.objects import delete
 from tests.unit.conftest import BUCKET_NAME, FILENAME, create_bucket
 
 
@@ -45,21 +55,23 @@ class TestDelete:
     def test_delete_keys(self, s3_client, keys):
         with create_bucket(s3_client, BUCKET_NAME, keys_paths=self.files):
             before = [object_exists(BUCKET_NAME, key) for key in keys]
-            delete_keys(BUCKET_NAME, keys, False)
+            errors = delete_keys(BUCKET_NAME, keys, False)
             after = [object_exists(BUCKET_NAME, key) for key in keys]
 
         assert all(before) is True
         assert all(after) is False
+        assert errors == []
 
     @pytest.mark.parametrize("keys", [keys, keys_path])
     def test_delete_prefix(self, s3_client, keys):
         with create_bucket(s3_client, BUCKET_NAME, keys_paths=self.files):
             before = [object_exists(BUCKET_NAME, key) for key in keys]
-            delete_prefix(BUCKET_NAME, "prefix", False)
+            errors = delete_prefix(BUCKET_NAME, "prefix", False)
             after = [object_exists(BUCKET_NAME, key) for key in keys]
 
         assert all(before) is True
         assert all(after) is False
+        assert errors == []
 
     @pytest.mark.parametrize("keys", [keys, keys_path])
     def test_delete_prefix_dry_run(self, s3_client, keys):
@@ -80,3 +92,74 @@ class TestDelete:
 
         assert all(before) is True
         assert all(after) is True
+
+    @pytest.mark.parametrize("threads", [1, 3])
+    def test_delete_prefix_in_batches(self, s3_client, monkeypatch, threads):
+        monkeypatch.setattr(delete, "DELETE_BATCH_SIZE", 3)
+        files = [(f"prefix/mock_{i}.csv", FILENAME) for i in range(10)]
+        batches = []
+
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=files + [("other/mock.csv", FILENAME)]):
+            get_client().meta.events.register(
+                "provide-client-params.s3.DeleteObjects",
+                lambda params, **kwargs: batches.append(len(params["Delete"]["Objects"])),
+                unique_id="test-delete-batches",
+            )
+            try:
+                errors = delete_prefix(BUCKET_NAME, "prefix", False, threads=threads)
+            finally:
+                get_client().meta.events.unregister(
+                    "provide-client-params.s3.DeleteObjects", unique_id="test-delete-batches"
+                )
+            remaining = list_objects(BUCKET_NAME)
+
+        assert errors == []
+        assert sorted(batches) == [1, 3, 3, 3]
+        assert remaining == ["other/mock.csv"]
+
+    def test_delete_keys_error_report(self, s3_client):
+        errors = delete_keys(BUCKET_NAME, self.keys, False)
+
+        assert [error["Key"] for error in errors] == self.keys
+        assert {error["Code"] for error in errors} == {"NoSuchBucket"}
+
+
+class TestPurgePrefix:
+
+    @contextmanager
+    def versioned_bucket(self, s3_client):
+        s3_client.create_bucket(Bucket=BUCKET_NAME)
+        s3_client.put_bucket_versioning(Bucket=BUCKET_NAME, VersioningConfiguration={"Status": "Enabled"})
+        for i in range(3):
+            s3_client.put_object(Bucket=BUCKET_NAME, Key=f"prefix/mock_{i}.csv", Body=b"a" * 10)
+            s3_client.put_object(Bucket=BUCKET_NAME, Key=f"prefix/mock_{i}.csv", Body=b"b" * 20)
+        s3_client.delete_object(Bucket=BUCKET_NAME, Key="prefix/mock_0.csv")
+        s3_client.put_object(Bucket=BUCKET_NAME, Key="other/mock.csv", Body=b"c")
+
+        yield
+
+        response = s3_client.list_object_versions(Bucket=BUCKET_NAME)
+        for version in response.get("Versions", []) + response.get("DeleteMarkers", []):
+            s3_client.delete_object(Bucket=BUCKET_NAME, Key=version["Key"], VersionId=version["VersionId"])
+        s3_client.delete_bucket(Bucket=BUCKET_NAME)
+
+    def test_purge_prefix_dry_run(self, s3_client):
+        with self.versioned_bucket(s3_client):
+            counts = purge_prefix(BUCKET_NAME, "prefix")
+            versions = s3_client.list_object_versions(Bucket=BUCKET_NAME, Prefix="prefix")
+
+        assert counts == {"versions": 6, "delete_markers": 1, "bytes": 90}
+        assert len(versions["Versions"]) == 6
+
+    @pytest.mark.parametrize("batch_size", [2, 1000])
+    def test_purge_prefix(self, s3_client, monkeypatch, batch_size):
+        monkeypatch.setattr(delete, "DELETE_BATCH_SIZE", batch_size)
+
+        with self.versioned_bucket(s3_client):
+            errors = purge_prefix(BUCKET_NAME, Path("prefix"), dry_run=False, threads=2)
+            prefix_versions = s3_client.list_object_versions(Bucket=BUCKET_NAME, Prefix="prefix")
+            other_versions = s3_client.list_object_versions(Bucket=BUCKET_NAME, Prefix="other")
+
+        assert errors == []
+        assert "Versions" not in prefix_versions and "DeleteMarkers" not in prefix_versions
+        assert len(other_versions["Versions"]) == 1
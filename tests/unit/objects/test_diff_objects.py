@@ -0,0 +1,78 @@
+"""Unit tests for diff module."""
+import pytest
+from s3_tools import (
+    S3Context,
+    diff_prefixes,
+)
+from s3_tools.objects.diff import _merge_join, _same_object
+from tests.unit.conftest import BUCKET_NAME, create_bucket
+
+
+class TestMergeJoin:
+
+    def test_merge_join(self):
+        source = iter([("a", {"Key": "src/a"}), ("c", {"Key": "src/c"}), ("d", {"Key": "src/d"})])
+        destination = iter([("b", {"Key": "dst/b"}), ("c", {"Key": "dst/c"}), ("e", {"Key": "dst/e"})])
+
+        joined = [
+            (key, src and src["Key"], dst and dst["Key"])
+            for key, src, dst in _merge_join(source, destination)
+        ]
+
+        assert joined == [
+            ("a", "src/a", None),
+            ("b", None, "dst/b"),
+            ("c", "src/c", "dst/c"),
+            ("d", "src/d", None),
+            ("e", None, "dst/e"),
+        ]
+
+    @pytest.mark.parametrize("source,destination,compare_last_modified,expected", [
+        ((1, '"a"', 1), (1, '"a"', 2), False, True),
+        ((1, '"a"', 1), (2, '"a"', 2), False, False),
+        ((1, '"a"', 1), (1, '"b"', 2), False, False),
+        ((1, '"a-2"', 1), (1, '"b"', 2), False, True),
+        ((1, '"a-2"', 1), (2, '"b-3"', 2), False, False),
+        ((1, '"a"', 3), (1, '"a"', 2), False, True),
+        ((1, '"a"', 3), (1, '"a"', 2), True, False),
+        ((1, '"a"', 1), (1, '"a"', 2), True, True),
+    ])
+    def test_same_object(self, source, destination, compare_last_modified, expected):
+        source, destination = (dict(zip(["Size", "ETag", "LastModified"], obj)) for obj in (source, destination))
+
+        assert _same_object(source, destination, compare_last_modified) is expected
+
+
+class TestDiff:
+
+    destination_bucket = "another-bucket"
+
+    def test_diff_prefixes(self, s3_client):
+        with create_bucket(s3_client, BUCKET_NAME), create_bucket(s3_client, self.destination_bucket):
+            for key, body in [("a", b"1"), ("b", b"2"), ("c", b"3"), ("e", b"5")]:
+                s3_client.put_object(Bucket=BUCKET_NAME, Key=f"data/{key}", Body=body)
+            for key, body in [("b", b"2"), ("c", b"changed"), ("d", b"4"), ("e", b"6")]:
+                s3_client.put_object(Bucket=self.destination_bucket, Key=f"replica/{key}", Body=body)
+
+            differences = [
+                (status, key, src and src["Key"], dst and dst["Key"])
+                for status, key, src, dst in diff_prefixes(
+                    BUCKET_NAME, "data", self.destination_bucket, "replica",
+                    destination_aws_auth=S3Context(),
+                )
+            ]
+            unchanged = [
+                key
+                for status, key, _, _ in diff_prefixes(
+                    BUCKET_NAME, "data", self.destination_bucket, "replica", include_unchanged=True
+                )
+                if status == "unchanged"
+            ]
+
+        assert differences == [
+            ("removed", "/a", "data/a", None),
+            ("changed", "/c", "data/c", "replica/c"),
+            ("added", "/d", None, "replica/d"),
+            ("changed", "/e", "data/e", "replica/e"),
+        ]
+        assert unchanged == ["/b"]
@@ -1,15 +1,18 @@
 """Unit tests for download module."""
+import json
 import shutil
 from filecmp import dircmp
 from pathlib import Path
 
 import pytest
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
 from s3_tools import (
     download_key_to_file,
     download_keys_to_files,
     download_prefix_to_folder,
 )
+from s3_tools.objects import download
 from tests.unit.conftest import (
     BUCKET_NAME,
     EMPTY_FILE,
@@ -17,6 +20,7 @@ from tests.unit.conftest import (
     create_bucket,
     create_files,
 )
+from tests.unit.objects.test_copy_objects import count_requests
 
 
 class TestDownload:
@@ -160,7 +164,112 @@ class TestDownload:
         assert test_1_Root and test_2_Root and test_1_FolderA and test_1_FolderD
         assert len(response) == 4
 
+    @pytest.mark.parametrize("prefix,expected", [
+        ("", ["data/f0.csv", "data/v1.2/f1.csv"]),
+        ("data", ["f0.csv", "v1.2/f1.csv"]),
+        ("data/", ["f0.csv", "v1.2/f1.csv"]),
+    ])
+    def test_download_prefix_to_folder_relative_paths(self, s3_client, tmp_path, prefix, expected):
+        keys = ["data/f0.csv", "data/v1.2/f1.csv"]
+        with create_bucket(s3_client, BUCKET_NAME):
+            for key in keys:
+                s3_client.put_object(Bucket=BUCKET_NAME, Key=key, Body=b"data")
+
+            response = download_prefix_to_folder(BUCKET_NAME, prefix, tmp_path)
+
+        files = sorted(p.relative_to(tmp_path).as_posix() for p in tmp_path.rglob("*") if p.is_file())
+
+        assert files == expected
+        assert all(result is True for _, _, result in response)
+
     def test_download_not_enough_arguments(self):
 
         with pytest.raises(ValueError):
             download_keys_to_files(BUCKET_NAME, self.download, extra_args_per_key=[{'arg': 'value'}])  # type: ignore
+
+
+class TestResumableDownload:
+    key = "prefix/large"
+    data = bytes(range(256)) * 20  # 5 parts of 1 KiB
+    config = TransferConfig(multipart_chunksize=1024, use_threads=False)
+
+    def download(self, path):
+        with count_requests(["GetObject"]) as counts:
+            result = download_key_to_file(BUCKET_NAME, self.key, path, transfer_config=self.config, resumable=True)
+        return result, counts["GetObject"]
+
+    def fail_third_part(self, monkeypatch):
+        download_part = download._download_part
+
+        def fail(s3, bucket, key, etag, partial_path, start, *args):
+            if start == 2048:
+                raise ConnectionError("Connection lost")
+            download_part(s3, bucket, key, etag, partial_path, start, *args)
+
+        monkeypatch.setattr(download, "_download_part", fail)
+
+    def test_resumable_download(self, s3_client, tmp_path):
+        path = tmp_path.joinpath("large.data")
+        with create_bucket(s3_client, BUCKET_NAME, key=self.key, data=self.data):
+            first = self.download(path)
+            again = self.download(path)
+            modified = s3_client.head_object(Bucket=BUCKET_NAME, Key=self.key)["LastModified"].timestamp()
+
+        assert (first, again) == ((True, 5), (True, 0))
+        assert path.read_bytes() == self.data
+        assert path.stat().st_mtime == modified
+        assert [p.name for p in tmp_path.iterdir()] == ["large.data"]
+
+    def test_resume_after_failure(self, s3_client, tmp_path, monkeypatch):
+        path = tmp_path.joinpath("large.data")
+        self.fail_third_part(monkeypatch)
+        with create_bucket(s3_client, BUCKET_NAME, key=self.key, data=self.data):
+            with pytest.raises(ConnectionError):
+                self.download(path)
+            state = json.loads(tmp_path.joinpath("large.data.s3tools-state").read_text())
+            partial = tmp_path.joinpath("large.data.s3tools-partial").stat().st_size
+
+            monkeypatch.undo()
+            resumed = self.download(path)
+
+        assert (state["completed"], state["part_size"], partial) == ([[0, 1], [3, 4]], 1024, len(self.data))
+        assert resumed == (True, 1)
+        assert path.read_bytes() == self.data
+        assert [p.name for p in tmp_path.iterdir()] == ["large.data"]
+
+    def test_restart_when_object_changed(self, s3_client, tmp_path, monkeypatch):
+        path = tmp_path.joinpath("large.data")
+        changed = bytes(reversed(self.data))
+        self.fail_third_part(monkeypatch)
+        with create_bucket(s3_client, BUCKET_NAME, key=self.key, data=self.data):
+            with pytest.raises(ConnectionError):
+                self.download(path)
+
+            monkeypatch.undo()
+            s3_client.put_object(Bucket=BUCKET_NAME, Key=self.key, Body=changed)
+            restarted = self.download(path)
+
+        assert restarted == (True, 5)
+        assert path.read_bytes() == changed
+
+    def test_resume_batch(self, s3_client, tmp_path, monkeypatch):
+        keys = [f"prefix/large_{i}" for i in range(3)]
+        self.fail_third_part(monkeypatch)
+        with create_bucket(s3_client, BUCKET_NAME):
+            for key in keys:
+                s3_client.put_object(Bucket=BUCKET_NAME, Key=key, Body=self.data)
+            s3_client.put_object(Bucket=BUCKET_NAME, Key="prefix/small", Body=b"small")
+
+            failed = download_prefix_to_folder(
+                BUCKET_NAME, "prefix", tmp_path, transfer_config=self.config, resumable=True
+            )
+            monkeypatch.undo()
+            with count_requests(["GetObject"]) as counts:
+                resumed = download_prefix_to_folder(
+                    BUCKET_NAME, "prefix", tmp_path, transfer_config=self.config, resumable=True
+                )
+
+        assert sorted(result is True for _, _, result in failed) == [False, False, False, True]
+        assert all(result is True for _, _, result in resumed)
+        assert counts["GetObject"] == 3  # Only the failed part of each large object
+        assert all(tmp_path.joinpath(key.split("/")[1]).read_bytes() == self.data for key in keys)
@@ -0,0 +1,74 @@
+"""Unit tests for fanout module."""
+import pytest
+from s3_tools import (
+    S3Context,
+    fanout_copy_keys,
+    list_objects,
+    list_objects_columnar,
+)
+from tests.unit.conftest import BUCKET_NAME, FILENAME, create_bucket
+from tests.unit.objects.test_copy_objects import count_requests
+
+
+class TestFanout:
+
+    keys_paths = [(f"prefix/object_{i}", FILENAME) for i in range(3)]
+    destination_buckets = ["replica-1", "replica-2", "replica-3"]
+
+    def test_fanout_copy_keys(self, s3_client):
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=self.keys_paths), \
+                create_bucket(s3_client, self.destination_buckets[0]), \
+                create_bucket(s3_client, self.destination_buckets[1]), \
+                create_bucket(s3_client, self.destination_buckets[2]):
+            listing = list_objects_columnar(BUCKET_NAME, "prefix")
+
+            with count_requests(["HeadObject", "CopyObject", "GetObject"]) as counts:
+                fanout_copy_keys(
+                    BUCKET_NAME,
+                    listing,
+                    ["replica-1", ("replica-2", {}), ("replica-3", S3Context())],
+                    destination_keys=[key.replace("prefix", "copy") for key in listing],
+                )
+
+            replicas = [list_objects(bucket) for bucket in self.destination_buckets]
+
+        assert counts == {"HeadObject": 0, "CopyObject": 6, "GetObject": 3}
+        assert replicas == [[f"copy/object_{i}" for i in range(3)]] * 3
+
+    def test_fanout_copy_keys_tee(self, s3_client):
+        body = bytes(range(256)) * (11 * 1024 ** 2 // 256)
+        with create_bucket(s3_client, BUCKET_NAME), \
+                create_bucket(s3_client, self.destination_buckets[0]), \
+                create_bucket(s3_client, self.destination_buckets[1]):
+            s3_client.put_object(Bucket=BUCKET_NAME, Key="big", Body=body)
+
+            with count_requests(["GetObject"]) as counts:
+                fanout_copy_keys(
+                    BUCKET_NAME,
+                    ["big"],
+                    [("replica-1", S3Context()), ("replica-2", S3Context(threads=2))],
+                    stream_part_size=5 * 1024 ** 2,
+                )
+
+            buckets = self.destination_buckets[:2]
+            copies = [s3_client.get_object(Bucket=bucket, Key="big")["Body"].read() for bucket in buckets]
+            uploads = [s3_client.list_multipart_uploads(Bucket=bucket).get("Uploads") for bucket in buckets]
+
+        assert counts == {"GetObject": 3}
+        assert copies == [body, body]
+        assert uploads == [None, None]
+
+    def test_fanout_copy_keys_error(self, s3_client):
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=self.keys_paths), \
+                create_bucket(s3_client, self.destination_buckets[0]):
+            with pytest.raises(Exception):
+                fanout_copy_keys(BUCKET_NAME, ["prefix/object_0"], [("replica-1", S3Context()), "missing-bucket"])
+
+    @pytest.mark.parametrize("source_keys,destinations,destination_keys,error", [
+        (["a", "b"], ["replica-1"], ["a"], IndexError),
+        ([], ["replica-1"], None, ValueError),
+        (["a"], [], None, ValueError),
+    ])
+    def test_fanout_copy_keys_invalid(self, source_keys, destinations, destination_keys, error):
+        with pytest.raises(error):
+            fanout_copy_keys(BUCKET_NAME, source_keys, destinations, destination_keys)
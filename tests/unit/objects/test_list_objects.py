@@ -1,9 +1,23 @@
 """Unit tests for list module."""
+import fnmatch
+import json
+import threading
+from datetime import datetime, timezone
 from pathlib import Path
 
 import pytest
-from botocore.exceptions import ClientError
-from s3_tools import list_objects
+from botocore.exceptions import ClientError, EndpointConnectionError
+from s3_tools import (
+    ObjectListing,
+    copy_keys,
+    get_client,
+    iter_objects,
+    iter_objects_resumable,
+    list_objects,
+    list_objects_columnar,
+    list_objects_parallel,
+)
+from s3_tools.objects.list import _glob_prefixes, _list_keys
 from tests.unit.conftest import BUCKET_NAME, FILENAME, create_bucket
 
 
@@ -41,6 +55,14 @@ class TestList:
 
         assert len(keys) == 10
 
+    def test_list_bucket_without_prefix(self, s3_client):
+        lst = [("prefix/mock_0.csv", FILENAME), ("root.csv", FILENAME)]
+
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=lst):
+            keys = list_objects(BUCKET_NAME)
+
+        assert keys == ["prefix/mock_0.csv", "root.csv"]
+
     @pytest.mark.parametrize("prefix", ["prefix", Path("prefix")])
     def test_list_bucket_return_as_path(self, s3_client, prefix):
         lst = [(f"prefix/mock_{i}.csv", FILENAME) for i in range(1)]
@@ -50,3 +72,265 @@ class TestList:
 
         assert len(keys) == 1
         assert keys[0] == Path(lst[0][0])
+
+
+class TestIterObjects:
+
+    def test_iter_is_lazy(self, s3_client):
+        lst = [(f"prefix/mock_{i}.csv", FILENAME) for i in range(10)]
+
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=lst):
+            keys = iter_objects(BUCKET_NAME, "prefix", max_keys=3)
+            first = next(keys)
+            remaining = list(keys)
+
+        assert first == "prefix/mock_0.csv"
+        assert len(remaining) == 9
+
+    def test_iter_with_search_str(self, s3_client):
+        lst = [(f"prefix/mock_{i}.csv", FILENAME) for i in range(10)]
+
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=lst):
+            keys = list(iter_objects(BUCKET_NAME, "prefix", search_str="*_[12].csv", max_keys=3))
+
+        assert keys == ["prefix/mock_1.csv", "prefix/mock_2.csv"]
+
+    @pytest.mark.parametrize("as_paths", [False, True])
+    def test_iter_with_metadata(self, s3_client, as_paths):
+        lst = [("prefix/mock_0.csv", FILENAME)]
+
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=lst):
+            objs = list(iter_objects(BUCKET_NAME, "prefix", with_metadata=True, as_paths=as_paths))
+
+        assert len(objs) == 1
+        assert objs[0]["Key"] == (Path(lst[0][0]) if as_paths else lst[0][0])
+        assert objs[0]["Size"] == Path(FILENAME).stat().st_size
+        assert "ETag" in objs[0] and "LastModified" in objs[0]
+
+
+class TestIterObjectsResumable:
+
+    lst = [(f"prefix/mock_{i:02}.csv", FILENAME) for i in range(10)]
+
+    def test_complete_listing_removes_checkpoint(self, s3_client, tmp_path):
+        checkpoint = tmp_path.joinpath("listing.checkpoint")
+
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=self.lst):
+            keys = list(iter_objects_resumable(BUCKET_NAME, checkpoint, "prefix", max_keys=3))
+
+        assert keys == [key for key, _ in self.lst]
+        assert not checkpoint.exists()
+
+    def test_resume_after_interruption(self, s3_client, tmp_path):
+        checkpoint = tmp_path.joinpath("listing.checkpoint")
+
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=self.lst):
+            first = []
+            for key in iter_objects_resumable(BUCKET_NAME, checkpoint, "prefix", max_keys=3):
+                first.append(key)
+                if len(first) == 5:
+                    break
+
+            saved = json.loads(checkpoint.read_text())
+            second = list(iter_objects_resumable(BUCKET_NAME, checkpoint, "prefix", max_keys=3))
+
+        assert saved["start_after"] == "prefix/mock_02.csv"
+        assert second == [key for key, _ in self.lst[3:]]
+
+    def test_checkpoint_of_another_listing(self, s3_client, tmp_path):
+        checkpoint = tmp_path.joinpath("listing.checkpoint")
+        checkpoint.write_text(json.dumps(
+            {"bucket": BUCKET_NAME, "prefix": "other", "search_str": None, "start_after": "other/a"}
+        ))
+
+        with pytest.raises(ValueError):
+            next(iter_objects_resumable(BUCKET_NAME, checkpoint, "prefix"))
+
+    def test_retry_transient_error(self, s3_client, tmp_path):
+        checkpoint = tmp_path.joinpath("listing.checkpoint")
+        calls = []
+
+        def flaky(params, **kwargs):
+            calls.append(params.get("StartAfter"))
+            if len(calls) == 2:
+                raise EndpointConnectionError(endpoint_url="https://s3.amazonaws.com")
+
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=self.lst):
+            get_client().meta.events.register(
+                "provide-client-params.s3.ListObjectsV2", flaky, unique_id="test-retry-transient-error"
+            )
+            try:
+                keys = list(iter_objects_resumable(BUCKET_NAME, checkpoint, "prefix", max_keys=3, backoff=0))
+            finally:
+                get_client().meta.events.unregister(
+                    "provide-client-params.s3.ListObjectsV2", unique_id="test-retry-transient-error"
+                )
+
+        assert keys == [key for key, _ in self.lst]
+        assert calls[:3] == [None, None, "prefix/mock_02.csv"]
+
+    def test_non_transient_error_is_raised(self, s3_client, tmp_path):
+        with pytest.raises(ClientError):
+            list(iter_objects_resumable(BUCKET_NAME, tmp_path.joinpath("listing.checkpoint"), backoff=0))
+
+
+class TestListParallel:
+
+    lst = [
+        (key, FILENAME) for key in [
+            "logs/2024-05-01/part-0.gz",
+            "logs/2024-05-01/part-1.gz",
+            "logs/2024-05-02/a/part-0.gz",
+            "logs/2024-05-02/part-0.gz",
+            "logs/2024-05-02.csv",
+            "logs/readme.txt",
+            "other/file.txt",
+        ]
+    ]
+
+    @pytest.mark.parametrize("depth", [1, 2, 3])
+    @pytest.mark.parametrize("prefix", ["", "logs", Path("logs"), "logs/2024"])
+    def test_same_as_list_objects(self, s3_client, prefix, depth):
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=self.lst):
+            expected = list_objects(BUCKET_NAME, prefix)
+            keys = list_objects_parallel(BUCKET_NAME, prefix, depth=depth, threads=3, max_keys=2)
+
+        assert len(expected) > 0
+        assert keys == expected
+
+    @pytest.mark.parametrize("prefix", ["logs", "logs/"])
+    def test_sub_prefixes_listed_concurrently(self, s3_client, monkeypatch, prefix):
+        barrier = threading.Barrier(2, timeout=5)
+        listed = []
+
+        def list_keys(bucket, sub_prefix, *args):
+            listed.append(sub_prefix)
+            barrier.wait()  # Broken unless both sub-prefixes are listed at the same time
+            return _list_keys(bucket, sub_prefix, *args)
+
+        monkeypatch.setattr("s3_tools.objects.list._list_keys", list_keys)
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=self.lst):
+            keys = list_objects_parallel(BUCKET_NAME, prefix, threads=2)
+
+        assert sorted(listed) == ["logs/2024-05-01/", "logs/2024-05-02/"]
+        assert keys == sorted(key for key, _ in self.lst if key.startswith("logs/"))
+
+    def test_unsorted(self, s3_client):
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=self.lst):
+            keys = list_objects_parallel(BUCKET_NAME, "logs", sort=False)
+
+        assert sorted(keys) == sorted(key for key, _ in self.lst if key.startswith("logs"))
+
+    def test_search_str_and_as_paths(self, s3_client):
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=self.lst):
+            keys = list_objects_parallel(BUCKET_NAME, "logs", search_str="*part-0*", as_paths=True)
+
+        assert keys == [
+            Path("logs/2024-05-01/part-0.gz"),
+            Path("logs/2024-05-02/a/part-0.gz"),
+            Path("logs/2024-05-02/part-0.gz"),
+        ]
+
+    def test_empty_prefix(self, s3_client):
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=self.lst):
+            keys = list_objects_parallel(BUCKET_NAME, "nothing")
+
+        assert keys == []
+
+
+class TestGlobPrefixes:
+
+    @pytest.mark.parametrize("prefix,search_str,expected", [
+        ("logs", None, ["logs"]),
+        ("", "logs/2024-05-*/part-*.gz", ["logs/2024-05-"]),
+        ("logs", "logs/2024-05-?/*", ["logs/2024-05-"]),
+        ("logs/2024-05-01", "logs/*", ["logs/2024-05-01"]),
+        ("logs", "*paper*", ["logs"]),
+        ("other", "logs/*", []),
+        ("logs", "logs/2024-0[45]-*", ["logs/2024-04-", "logs/2024-05-"]),
+        ("", "logs/[0-2]/*", ["logs/0/", "logs/1/", "logs/2/"]),
+        ("", "logs/[!0]/*", ["logs/"]),
+        ("", "logs/[ab", ["logs/[ab"]),
+        ("", "logs/[]a]x*", ["logs/]x", "logs/ax"]),
+        ("", "logs/[a-z][a-z]*", [f"logs/{chr(c)}" for c in range(ord("a"), ord("z") + 1)]),
+        ("", "logs/[b-a]*", []),
+    ])
+    def test_glob_prefixes(self, prefix, search_str, expected):
+        assert _glob_prefixes(prefix, search_str) == expected
+
+    @pytest.mark.parametrize("search_str", [
+        "logs/2024-05-*/part-*.gz",
+        "logs/2024-05-0[12]/*",
+        "logs/2024-0[45]-*",
+        "*part-0*",
+        "other/*",
+        "missing*",
+    ])
+    def test_list_with_glob_prefix(self, s3_client, search_str):
+        lst = [
+            (f"logs/2024-{month}-{day}/part-{i}.gz", FILENAME)
+            for month in ["04", "05"] for day in ["01", "02", "03"] for i in range(2)
+        ] + [("other/file.txt", FILENAME)]
+
+        prefixes = []
+        get_client().meta.events.register(
+            "provide-client-params.s3.ListObjectsV2",
+            lambda params, **kwargs: prefixes.append(params["Prefix"]),
+            unique_id="test-glob-prefixes",
+        )
+
+        try:
+            with create_bucket(s3_client, BUCKET_NAME, keys_paths=lst):
+                keys = list_objects(BUCKET_NAME, search_str=search_str)
+        finally:
+            get_client().meta.events.unregister(
+                "provide-client-params.s3.ListObjectsV2", unique_id="test-glob-prefixes"
+            )
+
+        assert keys == sorted(key for key, _ in lst if fnmatch.fnmatch(key, search_str))
+        assert prefixes == _glob_prefixes("", search_str)
+
+
+class TestObjectListing:
+
+    def test_append_and_access(self):
+        listing = ObjectListing()
+        listing.append("prefix/á.csv", 10, '"abc"', datetime(2024, 5, 1, tzinfo=timezone.utc))
+        listing.append("prefix/b.csv", 20, '"def-2"', 1714521600.0)
+
+        assert len(listing) == 2
+        assert listing[0] == "prefix/á.csv" and listing[-1] == "prefix/b.csv"
+        assert listing[0:2] == list(listing) == ["prefix/á.csv", "prefix/b.csv"]
+        assert "prefix/b.csv" in listing
+        assert listing.etag(1) == '"def-2"'
+        assert list(listing.sizes) == [10, 20]
+        assert listing.total_size == 30
+        assert list(listing.last_modified) == [1714521600.0, 1714521600.0]
+        assert list(listing.items())[1] == ("prefix/b.csv", 20, '"def-2"', 1714521600.0)
+        assert listing.nbytes > 0
+
+    def test_index_error(self):
+        with pytest.raises(IndexError):
+            ObjectListing()[0]
+
+    def test_list_objects_columnar(self, s3_client):
+        lst = [(f"prefix/mock_{i}.csv", FILENAME) for i in range(5)]
+
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=lst):
+            listing = list_objects_columnar(BUCKET_NAME, "prefix", search_str="*_[1-3].csv", max_keys=2)
+            metadata = list(iter_objects(BUCKET_NAME, "prefix", search_str="*_[1-3].csv", with_metadata=True))
+
+        assert list(listing) == [obj["Key"] for obj in metadata]
+        assert list(listing.sizes) == [obj["Size"] for obj in metadata]
+        assert [listing.etag(i) for i in range(len(listing))] == [obj["ETag"] for obj in metadata]
+        assert list(listing.last_modified) == [obj["LastModified"].timestamp() for obj in metadata]
+
+    def test_listing_as_keys(self, s3_client):
+        lst = [(f"prefix/mock_{i}.csv", FILENAME) for i in range(3)]
+
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=lst):
+            listing = list_objects_columnar(BUCKET_NAME, "prefix")
+            copy_keys(BUCKET_NAME, listing, BUCKET_NAME, [f"copy/{key}" for key in listing])
+            copied = list_objects(BUCKET_NAME, "copy")
+
+        assert copied == [f"copy/{key}" for key, _ in lst]
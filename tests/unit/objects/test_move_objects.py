@@ -4,14 +4,19 @@ from pathlib import Path
 import pytest
 from botocore.exceptions import ClientError
 from s3_tools import (
+    get_client,
+    list_objects,
+    list_objects_columnar,
     move_keys,
     move_object,
+    move_prefix,
     object_exists,
 )
 from tests.unit.conftest import (
     BUCKET_NAME,
     FILENAME,
     create_bucket,
+    create_many_keys,
 )
 
 
@@ -113,10 +118,105 @@ class TestMove:
             source_before = [object_exists(BUCKET_NAME, key) for key in source]
             dest_before = [object_exists(BUCKET_NAME, key) for key in destination]
 
-            move_keys(BUCKET_NAME, source, BUCKET_NAME, destination)
+            errors = move_keys(BUCKET_NAME, source, BUCKET_NAME, destination)
 
             source_after = [object_exists(BUCKET_NAME, key) for key in source]
             dest_after = [object_exists(BUCKET_NAME, key) for key in destination]
 
             assert all(source_before) is True and all(dest_before) is False
             assert all(source_after) is False and all(dest_after) is True
+            assert errors == []
+
+
+class TestMovePrefix:
+
+    destination_bucket = "another-bucket"
+    keys_paths = [(f"prefix/object_{i}", FILENAME) for i in range(5)]
+
+    def test_move_prefix(self, s3_client):
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=self.keys_paths + [("other/object", FILENAME)]), \
+                create_bucket(s3_client, self.destination_bucket):
+
+            requests = []
+            get_client().meta.events.register(
+                "before-call.s3", lambda model, **kwargs: requests.append(model.name), unique_id="test-move-prefix"
+            )
+            try:
+                errors = move_prefix(BUCKET_NAME, "prefix", self.destination_bucket, ("prefix", "archive"))
+            finally:
+                get_client().meta.events.unregister("before-call.s3", unique_id="test-move-prefix")
+
+            source_after = list_objects(BUCKET_NAME)
+            dest_after = list_objects(self.destination_bucket)
+
+        assert errors == []
+        assert source_after == ["other/object"]
+        assert dest_after == [f"archive/object_{i}" for i in range(5)]
+        assert requests.count("CopyObject") == 5
+        assert requests.count("DeleteObjects") == 1
+        assert "HeadObject" not in requests and "DeleteObject" not in requests
+
+    def test_move_keys_from_listing(self, s3_client):
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=self.keys_paths):
+            listing = list_objects_columnar(BUCKET_NAME, "prefix")
+            errors = move_keys(BUCKET_NAME, listing, BUCKET_NAME, [key.replace("prefix", "new") for key in listing])
+            keys_after = list_objects(BUCKET_NAME)
+
+        assert errors == []
+        assert keys_after == [f"new/object_{i}" for i in range(5)]
+
+    def test_move_prefix_reports_sources_not_deleted(self, s3_client):
+        def deny(params, **kwargs):
+            raise ClientError({"Error": {"Code": "AccessDenied", "Message": "Denied"}}, "DeleteObjects")
+
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=self.keys_paths):
+            get_client().meta.events.register(
+                "provide-client-params.s3.DeleteObjects", deny, unique_id="test-move-deny"
+            )
+            try:
+                errors = move_prefix(BUCKET_NAME, "prefix", BUCKET_NAME, ("prefix", "new"))
+            finally:
+                get_client().meta.events.unregister(
+                    "provide-client-params.s3.DeleteObjects", unique_id="test-move-deny"
+                )
+
+            keys_after = list_objects(BUCKET_NAME)
+
+        assert sorted(error["Key"] for error in errors) == [key for key, _ in self.keys_paths]
+        assert {error["Code"] for error in errors} == {"AccessDenied"}
+        assert keys_after == [f"new/object_{i}" for i in range(5)] + [key for key, _ in self.keys_paths]
+
+    def test_move_prefix_to_sibling_prefix(self, s3_client):
+        keys = [f"data/object_{i:04}" for i in range(2500)]
+        with create_many_keys(s3_client, BUCKET_NAME, keys):
+            errors = move_prefix(BUCKET_NAME, "data", BUCKET_NAME, ("data", "data_old"), threads=10)
+            keys_after = list_objects(BUCKET_NAME)
+
+        assert errors == []
+        assert keys_after == [key.replace("data", "data_old") for key in keys]
+
+    def test_move_prefix_copy_error(self, s3_client):
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=self.keys_paths):
+            errors = move_prefix(BUCKET_NAME, "prefix", self.destination_bucket)
+            keys_after = list_objects(BUCKET_NAME)
+
+        assert sorted(error["Key"] for error in errors) == [key for key, _ in self.keys_paths]
+        assert {(error["Operation"], error["Code"]) for error in errors} == {("Copy", "NoSuchBucket")}
+        assert keys_after == [key for key, _ in self.keys_paths]
+
+    def test_move_prefix_deletes_copied_sources_on_copy_error(self, s3_client):
+        def deny(params, **kwargs):
+            if params["CopySource"]["Key"] == "prefix/object_2":
+                raise ClientError({"Error": {"Code": "AccessDenied", "Message": "Denied"}}, "CopyObject")
+
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=self.keys_paths):
+            get_client().meta.events.register("provide-client-params.s3.CopyObject", deny, unique_id="test-move-deny")
+            try:
+                errors = move_prefix(BUCKET_NAME, "prefix", BUCKET_NAME, ("prefix", "new"), threads=2)
+            finally:
+                get_client().meta.events.unregister("provide-client-params.s3.CopyObject", unique_id="test-move-deny")
+
+            keys_after = list_objects(BUCKET_NAME)
+
+        assert [(e["Key"], e["Operation"], e["Code"]) for e in errors] == [("prefix/object_2", "Copy", "AccessDenied")]
+        assert keys_after == [f"new/object_{i}" for i in [0, 1, 3, 4]] + ["prefix/object_2"]
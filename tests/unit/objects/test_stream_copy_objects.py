@@ -0,0 +1,135 @@
+"""Unit tests for stream copy module."""
+import pytest
+from s3_tools import (
+    S3Context,
+    list_objects,
+    list_objects_columnar,
+    stream_copy_keys,
+    stream_copy_object,
+    stream_copy_prefix,
+)
+from tests.unit.conftest import BUCKET_NAME, FILENAME, create_bucket, create_many_keys
+from tests.unit.objects.test_copy_objects import count_requests
+
+
+class TestStreamCopy:
+
+    destination_bucket = "another-bucket"
+
+    def test_stream_copy_object(self, s3_client):
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=[("prefix/object", FILENAME)]), \
+                create_bucket(s3_client, self.destination_bucket):
+
+            with count_requests(["CopyObject", "UploadPartCopy", "GetObject", "PutObject"]) as counts:
+                stream_copy_object(BUCKET_NAME, "prefix/object", self.destination_bucket, "new-prefix/object")
+
+            source = s3_client.get_object(Bucket=BUCKET_NAME, Key="prefix/object")["Body"].read()
+            copied = s3_client.get_object(Bucket=self.destination_bucket, Key="new-prefix/object")["Body"].read()
+
+        assert counts == {"CopyObject": 0, "UploadPartCopy": 0, "GetObject": 1, "PutObject": 1}
+        assert copied == source
+
+    def test_stream_copy_object_multipart(self, s3_client):
+        body = bytes(range(256)) * (11 * 1024 ** 2 // 256)
+        with create_bucket(s3_client, BUCKET_NAME), create_bucket(s3_client, self.destination_bucket):
+            s3_client.put_object(
+                Bucket=BUCKET_NAME, Key="big", Body=body, ContentType="text/csv", Metadata={"owner": "me"}
+            )
+
+            with count_requests(["UploadPart", "UploadPartCopy", "AbortMultipartUpload"]) as counts:
+                stream_copy_object(BUCKET_NAME, "big", self.destination_bucket, "big", part_size=5 * 1024 ** 2)
+
+            response = s3_client.get_object(Bucket=self.destination_bucket, Key="big")
+
+        assert counts == {"UploadPart": 3, "UploadPartCopy": 0, "AbortMultipartUpload": 0}
+        assert response["Body"].read() == body
+        assert response["ContentType"] == "text/csv"
+        assert response["Metadata"] == {"owner": "me"}
+
+    def test_stream_copy_object_other_context(self, s3_client):
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=[("prefix/object", FILENAME)]), \
+                create_bucket(s3_client, self.destination_bucket):
+
+            stream_copy_object(
+                BUCKET_NAME, "prefix/object", self.destination_bucket, "prefix/object",
+                aws_auth=S3Context(threads=2), destination_aws_auth=S3Context(max_pool_connections=4),
+            )
+
+            keys = list_objects(self.destination_bucket)
+
+        assert keys == ["prefix/object"]
+
+    def test_stream_copy_object_missing(self, s3_client):
+        with create_bucket(s3_client, BUCKET_NAME), create_bucket(s3_client, self.destination_bucket):
+            with pytest.raises(Exception):
+                stream_copy_object(BUCKET_NAME, "missing", self.destination_bucket, "missing")
+
+            multipart = s3_client.list_multipart_uploads(Bucket=self.destination_bucket)
+
+        assert "Uploads" not in multipart
+
+    def test_stream_copy_keys(self, s3_client):
+        keys_paths = [(f"prefix/object_{i}", FILENAME) for i in range(4)]
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=keys_paths), \
+                create_bucket(s3_client, self.destination_bucket):
+            listing = list_objects_columnar(BUCKET_NAME, "prefix")
+
+            with count_requests(["HeadObject"]) as counts:
+                stream_copy_keys(
+                    BUCKET_NAME, listing, self.destination_bucket, [key.replace("prefix", "copy") for key in listing]
+                )
+
+            keys = list_objects(self.destination_bucket)
+
+        assert counts == {"HeadObject": 0}
+        assert keys == [f"copy/object_{i}" for i in range(4)]
+
+    @pytest.mark.parametrize("new_size", [17 * 1024 ** 2, 3 * 1024 ** 2])
+    def test_stream_copy_keys_object_changed_after_listing(self, s3_client, new_size):
+        body = bytes(range(256)) * (new_size // 256)
+        with create_bucket(s3_client, BUCKET_NAME, key="big", data=b"x" * 11 * 1024 ** 2), \
+                create_bucket(s3_client, self.destination_bucket):
+            listing = list_objects_columnar(BUCKET_NAME, "big")
+            s3_client.put_object(Bucket=BUCKET_NAME, Key="big", Body=body)
+
+            stream_copy_keys(BUCKET_NAME, listing, self.destination_bucket, ["big"], part_size=5 * 1024 ** 2)
+
+            copied = s3_client.get_object(Bucket=self.destination_bucket, Key="big")["Body"].read()
+
+        assert listing.sizes[0] == 11 * 1024 ** 2
+        assert copied == body
+
+    @pytest.mark.parametrize("source_keys,destination_keys,error", [
+        (["a", "b"], ["a"], IndexError),
+        ([], [], ValueError),
+    ])
+    def test_stream_copy_keys_invalid(self, source_keys, destination_keys, error):
+        with pytest.raises(error):
+            stream_copy_keys(BUCKET_NAME, source_keys, self.destination_bucket, destination_keys)
+
+    def test_stream_copy_prefix(self, s3_client):
+        keys_paths = [(f"prefix/object_{i}", FILENAME) for i in range(6)]
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=keys_paths), \
+                create_bucket(s3_client, self.destination_bucket):
+
+            stream_copy_prefix(
+                BUCKET_NAME, "prefix", self.destination_bucket,
+                change_prefix=("prefix", "copy"), filter_keys="*_[0-2]", threads=2, max_memory=1,
+            )
+
+            keys = list_objects(self.destination_bucket)
+
+        assert keys == [f"copy/object_{i}" for i in range(3)]
+
+    def test_stream_copy_prefix_to_sibling_prefix(self, s3_client):
+        keys = [f"data/object_{i:04}" for i in range(1500)]
+        with create_many_keys(s3_client, BUCKET_NAME, keys):
+            stream_copy_prefix(BUCKET_NAME, "data", BUCKET_NAME, ("data", "data_bak"), threads=10)
+            copies = list_objects(BUCKET_NAME, "data_bak")
+
+        assert copies == [key.replace("data", "data_bak") for key in keys]
+
+    def test_stream_copy_prefix_empty(self, s3_client):
+        with create_bucket(s3_client, BUCKET_NAME), create_bucket(s3_client, self.destination_bucket):
+            with pytest.raises(ValueError):
+                stream_copy_prefix(BUCKET_NAME, "prefix", self.destination_bucket)
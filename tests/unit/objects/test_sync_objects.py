@@ -0,0 +1,156 @@
+"""Unit tests for sync module."""
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+
+import pytest
+from s3_tools import (
+    list_objects,
+    sync_prefix,
+    sync_prefix_to_folder,
+)
+from s3_tools.objects.sync import _local_unchanged
+from tests.unit.conftest import BUCKET_NAME, FILENAME, create_bucket
+from tests.unit.objects.test_copy_objects import count_requests
+
+
+class TestSync:
+
+    destination_bucket = "another-bucket"
+    keys_paths = [(f"prefix/object_{i}", FILENAME) for i in range(4)]
+
+    def test_sync_prefix(self, s3_client):
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=self.keys_paths), \
+                create_bucket(s3_client, self.destination_bucket):
+
+            first = sync_prefix(BUCKET_NAME, "prefix", self.destination_bucket, "replica")
+            second = sync_prefix(BUCKET_NAME, "prefix", self.destination_bucket, "replica")
+
+            s3_client.put_object(Bucket=BUCKET_NAME, Key="prefix/object_1", Body=b"changed")
+            s3_client.put_object(Bucket=BUCKET_NAME, Key="prefix/object_5", Body=b"new")
+            third = sync_prefix(BUCKET_NAME, "prefix", self.destination_bucket, "replica")
+
+            replica = list_objects(self.destination_bucket)
+            changed = s3_client.get_object(Bucket=self.destination_bucket, Key="replica/object_1")["Body"].read()
+
+        assert first == {"copied": 4, "deleted": 0, "unchanged": 0, "errors": []}
+        assert second == {"copied": 0, "deleted": 0, "unchanged": 4, "errors": []}
+        assert third == {"copied": 2, "deleted": 0, "unchanged": 3, "errors": []}
+        assert replica == [f"replica/object_{i}" for i in [0, 1, 2, 3, 5]]
+        assert changed == b"changed"
+
+    @pytest.mark.parametrize("dry_run", [True, False])
+    def test_sync_prefix_delete(self, s3_client, dry_run):
+        extra = [("replica/object_9", FILENAME), ("replica/object_0", FILENAME)]
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=self.keys_paths + extra):
+            result = sync_prefix(BUCKET_NAME, "prefix", BUCKET_NAME, "replica", delete=True, dry_run=dry_run)
+            replica = list_objects(BUCKET_NAME, "replica")
+
+        assert result == {"copied": 3, "deleted": 1, "unchanged": 1, "errors": []}
+        if dry_run:
+            assert replica == ["replica/object_0", "replica/object_9"]
+        else:
+            assert replica == [f"replica/object_{i}" for i in range(4)]
+
+    def test_sync_prefix_keeps_extras(self, s3_client):
+        extra = [("replica/object_9", FILENAME)]
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=self.keys_paths + extra):
+            result = sync_prefix(BUCKET_NAME, "prefix", BUCKET_NAME, "replica")
+            replica = list_objects(BUCKET_NAME, "replica")
+
+        assert result == {"copied": 4, "deleted": 0, "unchanged": 0, "errors": []}
+        assert replica == [f"replica/object_{i}" for i in [0, 1, 2, 3, 9]]
+
+
+    @pytest.mark.parametrize("source_prefix,destination_prefix", [("data", "data_bak"), ("data_bak", "data")])
+    def test_sync_prefix_nested_prefixes(self, s3_client, source_prefix, destination_prefix):
+        keys_paths = [(f"{source_prefix}/f{i}.csv", FILENAME) for i in range(5)]
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=keys_paths):
+            first = sync_prefix(BUCKET_NAME, source_prefix, BUCKET_NAME, destination_prefix, delete=True)
+            second = sync_prefix(BUCKET_NAME, source_prefix, BUCKET_NAME, destination_prefix, delete=True)
+            keys = list_objects(BUCKET_NAME)
+
+        assert first == {"copied": 5, "deleted": 0, "unchanged": 0, "errors": []}
+        assert second == {"copied": 0, "deleted": 0, "unchanged": 5, "errors": []}
+        assert keys == sorted(
+            [key for key, _ in keys_paths] + [key.replace(source_prefix, destination_prefix) for key, _ in keys_paths]
+        )
+
+
+class TestSyncToFolder:
+
+    keys_paths = [(f"prefix/object_{i}", FILENAME) for i in range(4)]
+
+    def test_sync_prefix_to_folder(self, s3_client, tmp_path):
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=self.keys_paths):
+            first = sync_prefix_to_folder(BUCKET_NAME, "prefix", tmp_path)
+            with count_requests(["GetObject", "HeadObject"]) as counts:
+                second = sync_prefix_to_folder(BUCKET_NAME, "prefix", tmp_path)
+
+            s3_client.put_object(Bucket=BUCKET_NAME, Key="prefix/object_1", Body=b"changed")
+            s3_client.put_object(Bucket=BUCKET_NAME, Key="prefix/sub/object_5", Body=b"new")
+            third = sync_prefix_to_folder(BUCKET_NAME, "prefix", tmp_path)
+
+        assert first == {"downloaded": 4, "deleted": 0, "unchanged": 0, "errors": []}
+        assert second == {"downloaded": 0, "deleted": 0, "unchanged": 4, "errors": []}
+        assert counts == {"GetObject": 0, "HeadObject": 0}
+        assert third == {"downloaded": 2, "deleted": 0, "unchanged": 3, "errors": []}
+        assert tmp_path.joinpath("object_1").read_bytes() == b"changed"
+        assert tmp_path.joinpath("sub", "object_5").read_bytes() == b"new"
+
+    @pytest.mark.parametrize("dry_run", [True, False])
+    def test_sync_prefix_to_folder_delete(self, s3_client, tmp_path, dry_run):
+        tmp_path.joinpath("old").mkdir()
+        tmp_path.joinpath("old", "object_9").write_bytes(b"old")
+        tmp_path.joinpath("object_0.json").write_bytes(b"not searched")
+
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=self.keys_paths):
+            result = sync_prefix_to_folder(
+                BUCKET_NAME, "prefix", tmp_path, search_str="*/object_?", delete=True, dry_run=dry_run
+            )
+
+        local = sorted(p.relative_to(tmp_path).as_posix() for p in tmp_path.rglob("*") if p.is_file())
+        assert result == {"downloaded": 4, "deleted": 1, "unchanged": 0, "errors": []}
+        if dry_run:
+            assert local == ["object_0.json", "old/object_9"]
+        else:
+            assert local == sorted(["object_0.json"] + [f"object_{i}" for i in range(4)])
+
+    def test_sync_prefix_to_folder_manifest(self, s3_client, tmp_path):
+        manifest = tmp_path.joinpath("manifest.json")
+        folder = tmp_path.joinpath("folder")
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=self.keys_paths):
+            first = sync_prefix_to_folder(BUCKET_NAME, "prefix", folder, manifest=manifest, delete=True)
+            s3_client.delete_object(Bucket=BUCKET_NAME, Key="prefix/object_3")
+            second = sync_prefix_to_folder(BUCKET_NAME, "prefix", folder, manifest=manifest, delete=True)
+            etag = s3_client.head_object(Bucket=BUCKET_NAME, Key="prefix/object_0")["ETag"]
+
+        entries = json.loads(manifest.read_text())
+        assert first["downloaded"] == 4
+        assert second == {"downloaded": 0, "deleted": 1, "unchanged": 3, "errors": []}
+        assert sorted(entries) == [f"object_{i}" for i in range(3)]
+        assert entries["object_0"][0] == etag
+
+    @pytest.mark.parametrize("size,etag,modified,entry,expected", [
+        (4, "md5", 1000, None, True),  # MD5 equal to the ETag
+        (4, '"other"', 1000, None, False),
+        (4, '"abc-2"', 2000, None, True),  # Same last modified time
+        (4, '"abc-2"', 1000, None, False),  # Multipart ETag without manifest, downloaded again
+        (4, '"abc-2"', 1000, ['"abc-2"', 4, 2000], True),  # Manifest ETag of the unmodified file
+        (4, '"abc-3"', 2000, ['"abc-2"', 4, 2000], False),  # Object changed since the manifest
+        (5, "md5", 2000, None, False),
+    ])
+    def test_local_unchanged(self, tmp_path, size, etag, modified, entry, expected):
+        path = tmp_path.joinpath("file")
+        path.write_bytes(b"data")
+        os.utime(path, (2000, 2000))
+        md5 = f'"{hashlib.md5(b"data").hexdigest()}"'
+        obj = {
+            "Size": size,
+            "ETag": md5 if etag == "md5" else etag,
+            "LastModified": datetime.fromtimestamp(modified, timezone.utc),
+        }
+
+        assert _local_unchanged(obj, path, entry) is expected
+        assert _local_unchanged(obj, tmp_path.joinpath("missing"), entry) is False
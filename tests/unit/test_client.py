@@ -0,0 +1,128 @@
+"""Unit tests for client module."""
+from concurrent import futures
+from pathlib import Path
+from typing import List, Union
+
+import pytest
+from botocore.config import Config
+from s3_tools import (
+    S3Context,
+    clear_client_cache,
+    copy_keys,
+    get_client,
+    read_object_to_text,
+    write_object_from_text,
+)
+from s3_tools import client as client_module
+from s3_tools.client import _get_threads
+from tests.unit.conftest import BUCKET_NAME, FILENAME, create_bucket
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_client_cache()
+    yield
+    clear_client_cache()
+
+
+class TestClient:
+
+    def test_same_auth_returns_same_client(self, s3_client):
+        assert get_client() is get_client({})
+
+    def test_different_auth_returns_different_client(self, s3_client):
+        default = get_client()
+        other = get_client({"region_name": "eu-west-1"})
+
+        assert default is not other
+        assert other.meta.region_name == "eu-west-1"
+
+    def test_endpoint_and_config_are_part_of_key(self, s3_client):
+        default = get_client()
+        endpoint = get_client(endpoint_url="http://localhost:9000")
+        config = get_client(config=Config(max_pool_connections=50))
+
+        assert len({id(default), id(endpoint), id(config)}) == 3
+        assert config is get_client(config=Config(max_pool_connections=50))
+
+    def test_cache_is_bounded(self, s3_client, monkeypatch):
+        monkeypatch.setattr(client_module, "CLIENT_CACHE_SIZE", 2)
+
+        first = get_client({"region_name": "eu-west-1"})
+        get_client({"region_name": "eu-west-2"})
+        get_client({"region_name": "eu-west-3"})
+
+        assert len(client_module._clients) == 2
+        assert first is not get_client({"region_name": "eu-west-1"})
+
+    def test_clear_cache_by_auth(self, s3_client):
+        default = get_client()
+        other = get_client({"region_name": "eu-west-1"})
+
+        clear_client_cache({"region_name": "eu-west-1"})
+
+        assert default is get_client()
+        assert other is not get_client({"region_name": "eu-west-1"})
+
+    def test_thread_safe(self, s3_client):
+        with futures.ThreadPoolExecutor(max_workers=8) as executor:
+            clients = list(executor.map(lambda _: get_client(), range(32)))
+
+        assert all(c is clients[0] for c in clients)
+
+    def test_pool_grows_with_requested_connections(self, s3_client):
+        default = get_client()
+        larger = get_client(max_pool_connections=50)
+
+        assert default is not larger
+        assert larger.meta.config.max_pool_connections == 50
+        assert get_client() is larger
+        assert get_client(max_pool_connections=20) is larger
+
+    def test_bulk_function_sizes_pool(self, s3_client):
+        keys: List[Union[str, Path]] = [f"prefix/mock_{i}.csv" for i in range(2)]
+
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=[(key, FILENAME) for key in keys]):
+            copy_keys(BUCKET_NAME, keys, BUCKET_NAME, [f"copy/{key}" for key in keys], threads=40)
+
+        assert get_client().meta.config.max_pool_connections == 40
+
+
+class TestS3Context:
+
+    def test_context_client(self, s3_client):
+        context = S3Context(max_pool_connections=20, retries={"mode": "adaptive"}, tcp_keepalive=True)
+
+        assert context.client is context.client
+        assert context.client is not get_client()
+        assert context.client.meta.config.max_pool_connections == 20
+        assert context.client.meta.config.retries["mode"] == "adaptive"
+        assert context.client.meta.config.tcp_keepalive is True
+
+    def test_context_as_aws_auth(self, s3_client):
+        context = S3Context()
+
+        with create_bucket(s3_client, BUCKET_NAME):
+            write_object_from_text(BUCKET_NAME, "prefix/file.txt", "data", aws_auth=context)
+            data = read_object_to_text(BUCKET_NAME, "prefix/file.txt", aws_auth=context)
+
+        assert data == "data"
+        assert get_client(context) is context.client
+
+    def test_context_sizes_pool_to_threads(self, s3_client):
+        context = S3Context(threads=30)
+        keys: List[Union[str, Path]] = [f"prefix/mock_{i}.csv" for i in range(2)]
+
+        with create_bucket(s3_client, BUCKET_NAME, keys_paths=[(key, FILENAME) for key in keys]):
+            copy_keys(BUCKET_NAME, keys, BUCKET_NAME, [f"copy/{key}" for key in keys], aws_auth=context)
+
+        assert context.client.meta.config.max_pool_connections == 30
+
+    @pytest.mark.parametrize("threads,aws_auth,expected", [
+        (None, {}, 5),
+        (8, {}, 8),
+        (None, S3Context(threads=12), 12),
+        (3, S3Context(threads=12), 3),
+    ])
+    def test_get_threads(self, threads, aws_auth, expected):
+        assert _get_threads(threads, aws_auth) == expected
@@ -0,0 +1,59 @@
+"""Unit tests for package lazy imports."""
+import subprocess
+import sys
+
+import pytest
+import s3_tools
+
+HEAVY_MODULES = ["boto3", "botocore", "ujson"]
+
+
+def _import_in_subprocess(code: str) -> str:
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+
+
+class TestLazyImports:
+
+    def test_import_does_not_load_heavy_modules(self):
+        output = _import_in_subprocess("import s3_tools")
+        modules = {line.split("|")[-1].strip() for line in output.splitlines()}
+
+        assert "s3_tools" in modules
+        assert not [m for m in modules if m.split(".")[0] in HEAVY_MODULES]
+
+    def test_import_time_budget(self):
+        output = _import_in_subprocess("import s3_tools")
+        cumulative = {
+            line.split("|")[-1].strip(): int(line.split("|")[1])
+            for line in output.splitlines()
+            if line.startswith("import time:") and line.split("|")[1].strip().isdigit()
+        }
+
+        assert cumulative["s3_tools"] < 50_000  # microseconds
+
+    def test_function_loads_only_its_module(self):
+        output = subprocess.run(
+            [sys.executable, "-c", "import sys, s3_tools; s3_tools.get_presigned_download_url; print(*sys.modules)"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        modules = set(output.split())
+
+        assert "s3_tools.objects.presigned_url" in modules
+        assert "s3_tools.objects.download" not in modules
+        assert "ujson" not in modules
+
+    @pytest.mark.parametrize("name", s3_tools.__all__)
+    def test_public_api(self, name):
+        assert callable(getattr(s3_tools, name))
+        assert name in dir(s3_tools)
+
+    def test_unknown_attribute(self):
+        with pytest.raises(AttributeError):
+            s3_tools.not_a_function
@@ -0,0 +1,165 @@
+"""Unit tests for progress module."""
+import logging
+import threading
+from concurrent import futures
+from typing import (
+    Any,
+    Dict,
+    List,
+)
+
+import pytest
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import ClientError
+from s3_tools import (
+    TransferProgress,
+    download_keys_to_files,
+    download_prefix_to_folder,
+    format_progress,
+    upload_files_to_keys,
+)
+from s3_tools.progress import _RichProgress
+from tests.unit.conftest import BUCKET_NAME, create_bucket
+
+MiB = 1024 ** 2
+
+
+class TestTransferProgress:
+
+    def test_counters(self):
+        snapshots: List[Dict[str, Any]] = []
+        progress = TransferProgress("Downloading", [snapshots.append], interval=0)
+        progress.expect(100)
+        progress.expect(None)
+
+        with progress.file("large", 100) as large:
+            large(60)
+            with progress.file("unknown", 40, add_size=True) as unknown:
+                unknown(10)
+                unknown(-10)  # Retry from the start
+                in_flight = progress.snapshot()["in_flight"]
+                unknown(40)
+            large(40)
+        progress.close()
+
+        final = snapshots[-1]
+        assert in_flight == [{"name": "large", "bytes": 60, "size": 100}, {"name": "unknown", "bytes": 0, "size": 40}]
+        assert (final["files"], final["total_files"], final["bytes"], final["total_bytes"]) == (2, 2, 140, 140)
+        assert (final["in_flight"], final["eta"], final["finished"]) == ([], 0, True)
+        assert [s["finished"] for s in snapshots].count(True) == 1
+
+    def test_eta(self):
+        progress = TransferProgress("Uploading", [])
+        progress.expect(100)
+        before = progress.snapshot()
+
+        with progress.file("file", 100) as callback:
+            callback(25)
+            snapshot = progress.snapshot()
+
+        assert before["eta"] is None
+        assert snapshot["rate"] > 0
+        assert snapshot["eta"] == pytest.approx(75 / snapshot["rate"])
+
+    def test_rate_limited(self):
+        snapshots: List[Dict[str, Any]] = []
+        progress = TransferProgress("Uploading", [snapshots.append], interval=60)
+
+        def transfer(i):
+            progress.expect(1000)
+            with progress.file(f"file_{i}", 1000) as callback:
+                for _ in range(10):
+                    callback(100)
+
+        with futures.ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(transfer, range(100)))
+        progress.close()
+
+        assert len(snapshots) == 1
+        assert (snapshots[0]["files"], snapshots[0]["bytes"]) == (100, 100_000)
+
+    def test_format_progress(self):
+        snapshot = {
+            "description": "Downloading",
+            "files": 12,
+            "total_files": 1000,
+            "bytes": 1.2 * 1024 ** 3,
+            "total_bytes": 50 * 1024 ** 3,
+            "rate": 85.3 * MiB,
+            "eta": 586,
+        }
+
+        assert format_progress(snapshot) == "Downloading: 12/1000 files, 1.2 GiB/50.0 GiB, 85.3 MiB/s, ETA 0:09:46"
+        assert format_progress({**snapshot, "eta": None}).endswith("ETA -:--:--")
+
+    def test_rich_progress(self):
+        pytest.importorskip("rich")
+        progress = TransferProgress("Downloading", [], interval=0)
+        rich_progress = _RichProgress()
+        progress.expect(100)
+        progress.expect(10)
+
+        with progress.file("large", 100) as large, progress.file("small", 10):
+            large(50)
+            rich_progress(progress.snapshot())
+            tasks = [(task.description, task.total, task.completed) for task in rich_progress.progress.tasks]
+        rich_progress(progress.snapshot(finished=True))
+
+        assert tasks == [("Downloading", 110, 50), ("large", 100, 50), ("small", 10, 0)]
+        assert len(rich_progress.progress.tasks) == 1
+        assert rich_progress.progress.live.is_started is False
+
+
+class TestBulkProgress:
+
+    config = TransferConfig(multipart_threshold=5 * MiB, multipart_chunksize=5 * MiB)
+
+    def test_upload_download_callbacks(self, s3_client, tmp_path):
+        sizes = [6 * MiB, 10, 0]
+        paths = [tmp_path.joinpath(f"file_{i}") for i in range(len(sizes))]
+        for path, size in zip(paths, sizes):
+            path.write_bytes(b"x" * size)
+        uploads: List[Dict[str, Any]] = []
+        downloads: List[Dict[str, Any]] = []
+        lock = threading.Lock()
+
+        def collect(snapshots):
+            def callback(snapshot):
+                with lock:  # Called from the worker threads
+                    snapshots.append(snapshot)
+            return callback
+
+        with create_bucket(s3_client, BUCKET_NAME):
+            upload_files_to_keys(
+                BUCKET_NAME, [(p, p.name) for p in paths],
+                transfer_config=self.config, progress_callback=collect(uploads),
+            )
+            download_keys_to_files(
+                BUCKET_NAME, [(p.name, tmp_path.joinpath("copy", p.name)) for p in paths],
+                transfer_config=self.config, progress_callback=collect(downloads),
+            )
+
+        for snapshots in [uploads, downloads]:
+            final = snapshots[-1]
+            assert final["finished"] is True
+            assert (final["files"], final["total_files"]) == (3, 3)
+            assert final["bytes"] == final["total_bytes"] == sum(sizes)
+            assert all(s["bytes"] <= s["total_bytes"] for s in snapshots)
+
+    def test_closed_on_error(self, s3_client, tmp_path):
+        snapshots: List[Dict[str, Any]] = []
+
+        with pytest.raises(ClientError):
+            download_prefix_to_folder("missing-bucket", "prefix", tmp_path, progress_callback=snapshots.append)
+
+        assert snapshots[-1]["finished"] is True
+
+    def test_logger(self, s3_client, tmp_path, caplog):
+        path = tmp_path.joinpath("file")
+        path.write_bytes(b"data")
+        logger = logging.getLogger("test_progress")
+
+        with create_bucket(s3_client, BUCKET_NAME), caplog.at_level(logging.INFO, logger="test_progress"):
+            upload_files_to_keys(BUCKET_NAME, [(path, "file")], progress_callback=logger)
+
+        assert caplog.messages[-1].startswith("Uploading: 1/1 files, 4.0 B/4.0 B")
@@ -0,0 +1,229 @@
+"""Unit tests for transfer module."""
+import threading
+import time
+from concurrent import futures
+
+import pytest
+from boto3.s3.transfer import TransferConfig
+from s3_tools import (
+    S3Context,
+    TransferScheduler,
+    auto_transfer_config,
+    copy_keys,
+    copy_object,
+    download_key_to_file,
+    download_keys_to_files,
+    set_default_transfer_config,
+    set_default_transfer_scheduler,
+    upload_file_to_key,
+    upload_files_to_keys,
+)
+from s3_tools.transfer import TRANSFER_PROFILES, _get_scheduler, _get_transfer_config
+from tests.unit.conftest import BUCKET_NAME, create_bucket
+from tests.unit.objects.test_copy_objects import count_requests
+
+MiB = 1024 ** 2
+MULTIPART = TransferConfig(multipart_threshold=5 * MiB, multipart_chunksize=5 * MiB)
+
+
+@pytest.fixture(autouse=True)
+def reset_default():
+    yield
+    set_default_transfer_config(None)
+    set_default_transfer_scheduler(None)
+
+
+class TestAutoTransferConfig:
+
+    def test_small_object(self):
+        config = auto_transfer_config(2 * 1024)
+
+        assert config.use_threads is False
+
+    @pytest.mark.parametrize("size,max_memory,chunk_size,concurrency", [
+        (100 * MiB, 1024 * MiB, 8 * MiB, 13),
+        (50 * 1024 * MiB, 1024 * MiB, 100 * MiB, 10),
+        (50 * 1024 * MiB, 64 * MiB, 100 * MiB, 1),
+        (1024 * 1024 * MiB, 4096 * MiB, 2048 * MiB, 2),
+    ])
+    def test_large_object(self, size, max_memory, chunk_size, concurrency):
+        config = auto_transfer_config(size, max_memory)
+
+        assert (config.multipart_chunksize, config.max_concurrency) == (chunk_size, concurrency)
+        assert config.multipart_chunksize * 10_000 >= size
+
+
+    @pytest.mark.parametrize("bandwidth,concurrency", [
+        (None, 10),
+        (1024 * MiB, 10),
+        (200 * MiB, 3),
+        (10 * MiB, 1),
+    ])
+    def test_bandwidth(self, bandwidth, concurrency):
+        config = auto_transfer_config(50 * 1024 * MiB, 1024 * MiB, bandwidth)
+
+        assert config.max_concurrency == concurrency
+
+
+class TestGetTransferConfig:
+
+    def test_boto3_defaults(self):
+        assert _get_transfer_config(None, {}, lambda: 0) is None
+
+    def test_precedence(self):
+        context = S3Context(transfer_config="large")
+        set_default_transfer_config("small")
+
+        assert _get_transfer_config(MULTIPART, context, lambda: 0) is MULTIPART
+        assert _get_transfer_config(None, context, lambda: 0) is TRANSFER_PROFILES["large"]
+        assert _get_transfer_config(None, {}, lambda: 0) is TRANSFER_PROFILES["small"]
+
+    def test_auto_size_only_when_needed(self):
+        def size():
+            raise AssertionError("size requested")
+
+        assert _get_transfer_config("default", {}, size) is TRANSFER_PROFILES["default"]
+        assert _get_transfer_config("auto", {}, lambda: 100).use_threads is False
+
+    def test_unknown_profile(self):
+        with pytest.raises(ValueError):
+            set_default_transfer_config("huge")
+        with pytest.raises(ValueError):
+            _get_transfer_config("huge", {}, lambda: 0)
+
+
+class TestTransfers:
+
+    def test_upload_download_copy_with_config(self, s3_client, tmp_path):
+        body = b"x" * 6 * MiB
+        source = tmp_path.joinpath("source")
+        source.write_bytes(body)
+
+        with create_bucket(s3_client, BUCKET_NAME):
+            with count_requests(["PutObject", "CreateMultipartUpload", "UploadPartCopy"]) as counts:
+                upload_file_to_key(BUCKET_NAME, "default", source)
+                upload_file_to_key(BUCKET_NAME, "multipart", source, transfer_config=MULTIPART)
+                copy_object(BUCKET_NAME, "multipart", BUCKET_NAME, "copy", transfer_config=MULTIPART)
+
+            set_default_transfer_config(MULTIPART)
+            with count_requests(["GetObject"]) as downloads:
+                download_key_to_file(BUCKET_NAME, "copy", tmp_path.joinpath("copy"))
+
+            copied = tmp_path.joinpath("copy").read_bytes()
+
+        assert counts == {"PutObject": 1, "CreateMultipartUpload": 2, "UploadPartCopy": 2}
+        assert downloads == {"GetObject": 2}
+        assert copied == body
+
+
+class TestTransferScheduler:
+
+    @pytest.mark.parametrize("size,config,expected", [
+        (1024, None, 1),
+        (100 * MiB, None, 10),
+        (12 * MiB, MULTIPART, 3),
+        (100 * MiB, TransferConfig(use_threads=False), 1),
+        (None, None, 10),
+    ])
+    def test_granted_concurrency(self, size, config, expected):
+        scheduler = TransferScheduler(max_requests=64)
+
+        with scheduler.transfer(size, config) as scheduled:
+            assert scheduled.max_concurrency == expected
+            assert scheduled.use_threads is (expected > 1)
+            assert scheduler.requests == expected
+
+        assert (scheduler.requests, scheduler.bytes) == (0, 0)
+
+    def test_limits(self):
+        scheduler = TransferScheduler(max_requests=4, max_bytes=20 * MiB)
+
+        with scheduler.transfer(100 * MiB) as large:
+            assert large.max_concurrency == 2  # Two 8 MiB parts fit in memory
+            with scheduler.transfer(1024) as small:
+                assert small.max_concurrency == 1
+                assert (scheduler.requests, scheduler.bytes) == (3, 16 * MiB + 1024)
+
+        with scheduler.transfer(100 * MiB, buffered=False) as copy:
+            assert copy.max_concurrency == 4
+
+    def test_large_object_takes_idle_requests(self):
+        scheduler = TransferScheduler(max_requests=4)
+
+        with scheduler.transfer(1024):
+            with scheduler.transfer(100 * MiB) as large:  # Starts without waiting for all its parts requests
+                assert large.max_concurrency == 3
+            with scheduler.transfer(100 * MiB, TransferConfig(max_concurrency=2)) as capped:
+                assert capped.max_concurrency == 2
+                with scheduler.transfer(1024) as small:  # Not stalled behind the large object
+                    assert small.max_concurrency == 1
+
+    def test_cap_shared_by_threads(self):
+        scheduler = TransferScheduler(max_requests=6)
+        peak = []
+
+        def transfer(size):
+            with scheduler.transfer(size):
+                peak.append(scheduler.requests)
+                time.sleep(0.01)
+
+        with futures.ThreadPoolExecutor(max_workers=16) as executor:
+            list(executor.map(transfer, [1024, 50 * MiB, 1024, None] * 8))
+
+        assert max(peak) <= 6
+        assert scheduler.requests == 0
+
+    def test_arrival_order(self):
+        scheduler = TransferScheduler(max_requests=4)
+        order = []
+        release = threading.Event()
+
+        def transfer(name, size):
+            with scheduler.transfer(size):
+                order.append(name)
+                release.wait(5)
+
+        with futures.ThreadPoolExecutor(max_workers=2) as executor:
+            with scheduler.transfer(None, buffered=False):  # Takes all the requests
+                large = executor.submit(transfer, "large", 100 * MiB)
+                time.sleep(0.05)
+                small = executor.submit(transfer, "small", 1024)
+                time.sleep(0.05)
+
+                assert order == []
+            release.set()
+
+        large.result()
+        small.result()
+        assert order == ["large", "small"]
+
+    def test_get_scheduler(self):
+        shared = TransferScheduler(max_requests=32)
+        context = S3Context(scheduler=TransferScheduler(max_requests=8))
+
+        assert _get_scheduler({}, 5).max_requests == 5
+        assert _get_scheduler(context, 5) is context.scheduler
+
+        set_default_transfer_scheduler(shared)
+        assert _get_scheduler({}, 5) is shared
+
+    def test_bulk_functions(self, s3_client, tmp_path):
+        scheduler = TransferScheduler(max_requests=3)
+        context = S3Context(scheduler=scheduler, transfer_config=MULTIPART)
+        paths = [tmp_path.joinpath(f"file_{i}") for i in range(4)]
+        for i, path in enumerate(paths):
+            path.write_bytes(bytes([i]) * (6 * MiB if i == 0 else 10))
+
+        with create_bucket(s3_client, BUCKET_NAME):
+            uploaded = upload_files_to_keys(BUCKET_NAME, [(p, p.name) for p in paths], aws_auth=context)
+            copy_keys(BUCKET_NAME, [p.name for p in paths], BUCKET_NAME, [f"copy/{p.name}" for p in paths])
+            downloaded = download_keys_to_files(
+                BUCKET_NAME, [(f"copy/{p.name}", tmp_path.joinpath("copy", p.name)) for p in paths], aws_auth=context
+            )
+
+            copies = [tmp_path.joinpath("copy", p.name).read_bytes() for p in paths]
+
+        assert sorted(result.rsplit("/", 1)[-1] for _, _, result in uploaded) == [p.name for p in paths]
+        assert all(result is True for _, _, result in downloaded)
+        assert copies == [p.read_bytes() for p in paths]
+        assert (scheduler.requests, scheduler.bytes) == (0, 0)
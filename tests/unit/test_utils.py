@@ -1,9 +1,10 @@
 """Unit tests for utils module."""
 import builtins
+import time
 from concurrent import futures
 
 import pytest
-from s3_tools.utils import _create_progress_bar, _get_future_output
+from s3_tools.utils import _chunked, _create_progress_bar, _get_future_output, _MemoryBudget, _prefetch
 
 
 @pytest.fixture
@@ -40,6 +41,82 @@ class TestFuture:
         assert sorted(responses)[0][1] == "ZeroDivisionError('division by zero')"
 
 
+class TestChunked:
+
+    @pytest.mark.parametrize("items,size,expected", [
+        (range(7), 3, [[0, 1, 2], [3, 4, 5], [6]]),
+        (range(6), 3, [[0, 1, 2], [3, 4, 5]]),
+        (range(0), 3, []),
+    ])
+    def test_chunked(self, items, size, expected):
+        assert list(_chunked(iter(items), size)) == expected
+
+
+class TestPrefetch:
+
+    def test_prefetch(self):
+        assert list(_prefetch(range(100), 3)) == list(range(100))
+
+    def test_prefetch_bounded(self):
+        produced = []
+
+        def items():
+            for i in range(100):
+                produced.append(i)
+                yield i
+
+        iterator = _prefetch(items(), 3)
+        first = next(iterator)
+        time.sleep(0.2)
+        iterator.close()
+
+        assert first == 0
+        assert len(produced) <= 5
+
+    def test_prefetch_error(self):
+        def items():
+            yield 1
+            raise ValueError("listing failed")
+
+        iterator = _prefetch(items(), 3)
+
+        assert next(iterator) == 1
+        with pytest.raises(ValueError):
+            next(iterator)
+
+
+class TestMemoryBudget:
+
+    def test_reserve(self):
+        budget = _MemoryBudget(10)
+
+        with budget.reserve(4), budget.reserve(6):
+            assert budget.used == 10
+
+        assert budget.used == 0
+
+    def test_reserve_over_limit(self):
+        budget = _MemoryBudget(10)
+
+        with budget.reserve(100):
+            assert budget.used == 10
+
+    def test_reserve_waits(self):
+        budget = _MemoryBudget(10)
+        peak = []
+
+        def hold(_):
+            with budget.reserve(4):
+                peak.append(budget.used)
+                time.sleep(0.01)
+
+        with futures.ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(hold, range(16)))
+
+        assert max(peak) <= 8
+        assert budget.used == 0
+
+
 class TestProgressBar:
 
     @pytest.mark.usefixtures("hide_available_pkg")